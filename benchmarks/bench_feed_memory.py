@@ -0,0 +1,59 @@
+"""Peak memory of streaming feed iteration over large synthetic feeds.
+
+Bodies are served through a mocked shared Http, so the download guards apply
+(MAX_FEED_ENTRIES / MAX_FEED_BYTES cut large feeds).
+
+Run: python -m benchmarks.bench_feed_memory
+"""
+import asyncio
+import time
+import tracemalloc
+from unittest.mock import patch
+
+import httpx
+
+from bot import feeds, net
+
+_SOURCES = 9
+
+
+def _synthetic_feed(n: int) -> bytes:
+    items = "".join(
+        f"<item><title>Hír {i}: {'hosszú cím ' * 8}</title>"
+        f"<link>https://example.hu/cikk/{i}</link>"
+        f"<description>{'szöveg ' * 50}</description></item>"
+        for i in range(n)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>x</title>{items}</channel></rss>'.encode()
+
+
+async def _consume() -> int:
+    count = 0
+    async for _ in feeds.fetch_all():
+        count += 1
+    return count
+
+
+def bench(entries_per_feed: int):
+    body = _synthetic_feed(entries_per_feed)
+    http = net.Http(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=body)))
+    sources = [{"name": f"S{i}", "url": f"https://s{i}.example/rss"} for i in range(_SOURCES)]
+    with patch.object(feeds, "SOURCES", sources), \
+         patch.object(feeds, "_FEED_TIMEOUT", 3600), \
+         patch.object(feeds, "_stats", {}), \
+         patch.object(feeds.net, "shared", lambda: http):
+        tracemalloc.start()
+        start = time.perf_counter()
+        count = asyncio.run(_consume())
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    print(
+        f"{_SOURCES} feeds x {entries_per_feed:>5} entries ({len(body) / 2**20:.1f}MiB each): "
+        f"{count} articles in {elapsed:.1f}s, peak={peak / 2**20:.1f}MiB"
+    )
+
+
+if __name__ == "__main__":
+    for n in (100, 500, 2000):
+        bench(n)
@@ -0,0 +1,67 @@
+"""Latency and token use per headline for each GemmaTranslator prompt strategy.
+
+Needs a running Ollama with the model pulled (OLLAMA_URL as for the bot).
+
+Run: python -m benchmarks.bench_gemma_prompts [model]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+
+from bot import net
+from bot.translator.gemma import OLLAMA_URLS, PROMPT_STRATEGIES, GemmaTranslator, TokenUsage
+
+_TITLES = [
+    "Emelkednek az adók jövőre, jelentette be a pénzügyminiszter",
+    "Esős hétvége jön Budapesten, lehűlést hoz a hidegfront",
+    "Újabb uniós forrásokat fagyasztott be az Európai Bizottság",
+    "Megnyílt az új M0-s szakasz, enyhülhet a dugó a fővárosban",
+    "Rekordot döntött a forint árfolyama az euróval szemben",
+    "Sztrájkot hirdettek a pedagógusok szakszervezetei",
+    "A MÁV szerint ősztől sűrűbben járnak az elővárosi vonatok",
+    "Magyarország is csatlakozik az európai drónvédelmi programhoz",
+    "Áremelkedés a boltokban: drágult a kenyér és a tej",
+    "Lemondott a budapesti közlekedési központ vezérigazgatója",
+    "Vizsgálat indult a kórházi várólisták miatt",
+    "Új lakástámogatási programot jelentett be a kormány",
+]
+
+
+async def bench(strategy: str, model: str) -> dict:
+    translator = GemmaTranslator(model=model, strategy=strategy)
+    latencies = []
+    try:
+        await translator.translate(_TITLES[0])  # load the model, prime the context
+        translator.usage = TokenUsage()
+        for title in _TITLES:
+            start = time.perf_counter()
+            await translator.translate(title)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        await translator.close()
+    return {"p50": statistics.median(latencies), "max": max(latencies), **translator.usage.as_dict()}
+
+
+async def main(model: str):
+    try:
+        (await net.shared().get(OLLAMA_URLS[0].rsplit("/", 2)[0], timeout=5, retries=0)).raise_for_status()
+    except httpx.HTTPError as e:
+        print(f"Ollama not reachable at {OLLAMA_URLS[0]}: {e}")
+        await net.close_shared()
+        return
+    for strategy in PROMPT_STRATEGIES:
+        r = await bench(strategy, model)
+        print(
+            f"{strategy:<8} p50={r['p50'] * 1000:6.0f}ms max={r['max'] * 1000:6.0f}ms  "
+            f"prompt tokens/title={r['prompt_tokens_per_call']:6.1f}  "
+            f"prompt eval/title={r['prompt_seconds_per_call'] * 1000:5.0f}ms  "
+            f"completion tokens/title={r['completion_tokens_per_call']:5.1f}"
+        )
+    await net.close_shared()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else "translategemma:latest"))
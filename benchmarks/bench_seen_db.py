@@ -0,0 +1,142 @@
+"""seen.db size, page-cache hit rate and is_seen latency: legacy seen_urls vs compact schema.
+
+Builds a legacy (text URL primary key) database, migrates a copy with
+Database.init, then probes both with random lookups.
+
+Run: python -m benchmarks.bench_seen_db [rows]   (default 1_000_000)
+"""
+import asyncio
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+from bot.db import Database, hash64, url_key
+
+_LOOKUPS = 20_000
+_CACHE_KIB = 2000  # SQLite default cache_size=-2000
+_SLUGS = ["belfold", "kulfold", "gazdasag", "kultura", "sport", "velemeny", "tudomany"]
+_HOSTS = ["telex.hu", "hvg.hu", "24.hu", "444.hu", "index.hu", "magyarnemzet.hu", "direkt36.hu"]
+
+_LEGACY_QUERY = "SELECT 1 FROM seen_urls WHERE url = ? OR guid_hash = ? LIMIT 1"
+_COMPACT_QUERY = "SELECT 1 FROM seen WHERE url_hash = ? OR guid_hash = ? LIMIT 1"
+
+
+def _url(i: int) -> str:
+    rnd = random.Random(i)
+    slug = "-".join(rnd.choice(["kormany", "adok", "orban", "budapest", "valasztas", "inflacio"]) for _ in range(6))
+    return f"https://{_HOSTS[i % len(_HOSTS)]}/{_SLUGS[i % len(_SLUGS)]}/2026/03/{i % 28 + 1:02d}/{slug}-{i}"
+
+
+def _build_legacy(path: str, rows: int):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE seen_urls (url TEXT PRIMARY KEY, title TEXT DEFAULT '', posted_at TIMESTAMP DEFAULT NULL, "
+        "source_title TEXT DEFAULT '', guid_hash INTEGER DEFAULT NULL, published_at REAL DEFAULT NULL)"
+    )
+    conn.execute("CREATE INDEX idx_posted_at ON seen_urls(posted_at)")
+    conn.execute("CREATE INDEX idx_guid_hash ON seen_urls(guid_hash)")
+    now = time.time()
+    batch = []
+    for i in range(rows):
+        # about one in ten items shares its translated title with another source
+        title = f"Венгрия: новость номер {i // 10 if i % 10 == 0 else i} о налогах и правительстве"
+        batch.append((
+            _url(i), title, f"Magyarország: hír {i} az adókról és a kormányról",
+            time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(now - (rows - i) * 2)),
+            hash64(f"guid-{i}"), now - (rows - i) * 2,
+        ))
+        if len(batch) == 50_000:
+            conn.executemany("INSERT OR IGNORE INTO seen_urls VALUES (?, ?, ?, ?, ?, ?)", batch)
+            batch.clear()
+    conn.executemany("INSERT OR IGNORE INTO seen_urls VALUES (?, ?, ?, ?, ?, ?)", batch)
+    conn.commit()
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+
+
+async def _migrate(path: str) -> float:
+    start = time.perf_counter()
+    db = Database(path)
+    await db.init()
+    await db.close()
+    return time.perf_counter() - start
+
+
+def _estimated_hit_rate(conn: sqlite3.Connection, name: str) -> float:
+    """Expected page-cache hit rate of uniform random point lookups on one b-tree.
+
+    Interior pages are hot and stay cached; a leaf is a hit with the probability that
+    it is among the leaves the rest of the cache can hold.
+    """
+    pages = dict(conn.execute(
+        "SELECT pagetype, COUNT(*) FROM dbstat WHERE name = ? GROUP BY pagetype", (name,)
+    ).fetchall())
+    interior, leaves = pages.get("internal", 0), pages.get("leaf", 0)
+    # dbstat paths look like '/', '/00a/', '/00a/01f/': one 4-char segment per level
+    (path_len,) = conn.execute("SELECT MAX(length(path)) FROM dbstat WHERE name = ?", (name,)).fetchone()
+    depth = (path_len - 1) // 4 + 1
+    cache_pages = _CACHE_KIB * 1024 // conn.execute("PRAGMA page_size").fetchone()[0]
+    leaf_hit = min(1.0, max(0, cache_pages - interior) / leaves) if leaves else 1.0
+    return ((depth - 1) + leaf_hit) / depth
+
+
+def _probe(path: str, query: str, keys: list, label: str, lookup_name: str):
+    conn = sqlite3.connect(path)
+    sizes = conn.execute(
+        "SELECT name, SUM(pgsize) FROM dbstat GROUP BY name HAVING SUM(pgsize) > 65536 ORDER BY 2 DESC"
+    ).fetchall()
+    for key, guid in keys[:1000]:  # warm the interior pages
+        conn.execute(query, (key, guid)).fetchone()
+    latencies = []
+    for key, guid in keys:
+        start = time.perf_counter()
+        conn.execute(query, (key, guid)).fetchone()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    hit_rate = _estimated_hit_rate(conn, lookup_name)
+    conn.close()
+
+    print(f"{label}: file={os.path.getsize(path) / 2**20:.1f}MiB")
+    for name, size in sizes:
+        print(f"    {name:<32} {size / 2**20:8.1f}MiB")
+    print(
+        f"    is_seen p50={statistics.median(latencies) * 1e6:.1f}us "
+        f"p99={latencies[int(len(latencies) * 0.99)] * 1e6:.1f}us, "
+        f"est. URL b-tree cache hit rate ({_CACHE_KIB}KiB cache)={hit_rate:.1%}"
+    )
+
+
+def bench(rows: int):
+    tmp = tempfile.mkdtemp()
+    try:
+        legacy = os.path.join(tmp, "legacy.db")
+        compact = os.path.join(tmp, "compact.db")
+        start = time.perf_counter()
+        _build_legacy(legacy, rows)
+        print(f"{rows} rows built in {time.perf_counter() - start:.1f}s")
+        shutil.copy(legacy, compact)
+        print(f"migration: {asyncio.run(_migrate(compact)):.1f}s")
+
+        rnd = random.Random(0)
+        # half hits, half misses
+        ids = [rnd.randrange(rows) if n % 2 else rows + n for n in range(_LOOKUPS)]
+        _probe(
+            legacy, _LEGACY_QUERY, [(_url(i), hash64(f"guid-{i}")) for i in ids],
+            "legacy seen_urls", "sqlite_autoindex_seen_urls_1",
+        )
+        _probe(
+            compact, _COMPACT_QUERY, [(url_key(_url(i)), hash64(f"guid-{i}")) for i in ids],
+            "compact seen", "seen",
+        )
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,45 @@
+"""Latency and memory of the semantic dedup index.
+
+Run: python -m benchmarks.bench_semantic_index
+"""
+import time
+import tracemalloc
+
+import numpy as np
+
+from bot.semantic import VectorIndex
+
+_DIM = 768  # nomic-embed-text
+_QUERIES = 100
+
+
+def bench(n: int):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(n, _DIM)).astype(np.float32)
+    tracemalloc.start()
+    index = VectorIndex()
+    start = time.perf_counter()
+    for i, v in enumerate(vectors):
+        index.add(str(i), v)
+    build = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    queries = rng.normal(size=(_QUERIES, _DIM)).astype(np.float32)
+    start = time.perf_counter()
+    for q in queries:
+        index.find_similar(q)
+    single = (time.perf_counter() - start) / _QUERIES
+    start = time.perf_counter()
+    index.search(queries)
+    batched = (time.perf_counter() - start) / _QUERIES
+
+    print(
+        f"n={n:>7}  build={build:.2f}s  peak_mem={peak / 2**20:.0f}MiB  "
+        f"query={single * 1000:.2f}ms  batched={batched * 1000:.3f}ms/query"
+    )
+
+
+if __name__ == "__main__":
+    for n in (10_000, 100_000):
+        bench(n)
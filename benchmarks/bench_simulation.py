@@ -0,0 +1,444 @@
+"""Deterministic simulation of the polling pipeline under load, on a virtual clock.
+
+    python -m benchmarks.bench_simulation [steady|burst|outage] [--hours 6] [--seed 0] [-v]
+
+run_once and the APScheduler interval job run unchanged on an event loop whose
+clock jumps to the next timer instead of sleeping, so hours of simulated time
+take seconds. Feeds, Ollama, Telegram and the database are scripted in-memory
+stand-ins: articles arrive at a configured rate (plus bursts), every backend
+call costs simulated time drawn from a seeded latency distribution, Ollama can
+be down for a window and Telegram can answer 429. The real Poster handles the
+429s and the scheduler's CYCLE_BUDGET, admission limits and digests apply as
+configured through the environment.
+
+The report gives the time-to-post distribution, the backlog over time and
+backend/scheduler usage. With the same scenario and seed it is identical on
+every run; only the "host" section (real time, CPU, memory) varies. The
+stand-ins never block on threads, which a virtual clock could not wait for;
+the database keeps no title history, so DB/semantic dedup is not simulated.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import math
+import random
+import re
+import resource
+import time
+from collections import deque
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import apscheduler.executors.base
+import apscheduler.executors.base_py3
+import apscheduler.schedulers.base
+import apscheduler.triggers.interval
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from telegram.error import RetryAfter
+
+from bot import health, poster, scheduler
+from bot.feeds import _MAX_FEED_ENTRIES, Article
+from bot.poster import Poster
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = 1_767_225_600.0  # virtual wall clock starts at 2026-01-01 00:00 UTC
+_SAMPLE_INTERVAL = 60.0
+_SYLLABLES = [
+    "ma", "gya", "ror", "szag", "kor", "many", "bu", "da", "pest", "va", "lasz", "tas", "ado",
+    "in", "fla", "cio", "eu", "ro", "pai", "mi", "nisz", "ter", "hid", "vo", "nat", "sztraj", "ko",
+]
+_HREF_RE = re.compile(r'href="([^"]+)"')
+
+
+@dataclass
+class Scenario:
+    hours: float = 6.0
+    poll_minutes: float = 5.0
+    sources: int = 9
+    rate_per_hour: float = 120.0  # steady Poisson arrivals over all sources
+    bursts: list[tuple[float, int]] = field(default_factory=list)  # (at second, articles)
+    feed_window: int = _MAX_FEED_ENTRIES  # newest entries a feed lists per source
+    fetch_seconds: float = 2.0
+    translate_median: float = 2.0  # Ollama latency: lognormal with this median (seconds)
+    translate_sigma: float = 0.4
+    ollama_down: list[tuple[float, float]] = field(default_factory=list)  # (from, to) seconds
+    telegram_seconds: float = 0.3
+    flood_probability: float = 0.0  # chance a Telegram call answers 429
+    flood_retry_after: int = 30
+    seed: int = 0
+
+
+SCENARIOS = {
+    "steady": Scenario(),
+    # 2,000 articles at once, Ollama at ~5s per call, one Telegram call in ten answers 429
+    "burst": Scenario(
+        bursts=[(60.0, 2000)], translate_median=5.0, flood_probability=0.1, feed_window=2000,
+    ),
+    "outage": Scenario(ollama_down=[(3600.0, 7200.0)]),
+}
+
+
+class _FastForwardSelector:
+    """Selector wrapper: instead of blocking until the next timer, advance the loop's clock to it."""
+
+    def __init__(self, selector, loop: VirtualLoop):
+        self._selector = selector
+        self._loop = loop
+
+    def select(self, timeout=None):
+        events = self._selector.select(0)
+        if events or timeout == 0:
+            return events
+        if timeout is None:  # nothing scheduled: only another thread can wake the loop
+            return self._selector.select(None)
+        self._loop.now += timeout
+        return []
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+
+class VirtualLoop(asyncio.SelectorEventLoop):
+    """Event loop on a virtual clock: idle time costs nothing."""
+
+    def __init__(self):
+        super().__init__()
+        self.now = 0.0
+        self._selector = _FastForwardSelector(self._selector, self)
+
+    def time(self) -> float:
+        return self.now
+
+
+class _VirtualTime:
+    """Stand-in for the ``time`` module in patched modules: time() follows the loop."""
+
+    def __init__(self, loop: VirtualLoop):
+        self._loop = loop
+
+    def time(self) -> float:
+        return _EPOCH + self._loop.now
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+def _virtual_datetime(clock: _VirtualTime) -> type[datetime]:
+    class VirtualDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls.fromtimestamp(clock.time(), tz)
+
+    return VirtualDatetime
+
+
+def _title(rng: random.Random) -> str:
+    words = ("".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(7))
+    return " ".join(words).capitalize()
+
+
+class SimFeeds:
+    """Scripted arrivals; each fetch lists the newest ``feed_window`` arrived entries per source."""
+
+    def __init__(self, scenario: Scenario, clock: _VirtualTime, rng: random.Random):
+        self._scenario = scenario
+        self._clock = clock
+        duration = scenario.hours * 3600
+        arrivals = []
+        t = rng.expovariate(scenario.rate_per_hour / 3600) if scenario.rate_per_hour else duration
+        while t < duration:
+            arrivals.append(t)
+            t += rng.expovariate(scenario.rate_per_hour / 3600)
+        for at, count in scenario.bursts:
+            arrivals.extend([at] * count)
+        arrivals.sort()
+        self.articles = []
+        for i, at in enumerate(arrivals):
+            source = f"S{rng.randrange(scenario.sources)}"
+            self.articles.append(Article(
+                title=_title(rng), url=f"https://{source.lower()}.example/{i}", source=source,
+                published_at=_EPOCH + at, guid=f"{source}-{i}",
+            ))
+        self.arrived_at = {a.url: a.published_at - _EPOCH for a in self.articles}
+        self._next = 0
+        self._visible = {f"S{s}": deque(maxlen=scenario.feed_window) for s in range(scenario.sources)}
+
+    def arrived(self) -> int:
+        return self._next
+
+    def _advance(self):
+        now = self._clock.time()
+        while self._next < len(self.articles) and self.articles[self._next].published_at <= now:
+            article = self.articles[self._next]
+            self._visible[article.source].append(article)
+            self._next += 1
+
+    async def fetch(self):
+        await asyncio.sleep(self._scenario.fetch_seconds)
+        self._advance()
+        for entries in self._visible.values():
+            for article in reversed(entries):
+                yield article
+
+
+class SimDb:
+    """In-memory stand-in for the Database methods run_once uses."""
+
+    def __init__(self):
+        self.seen: set[str] = set()
+        self.claimed: set[str] = set()
+        self.dropped: set[str] = set()  # marked seen without a claim: shed or deduplicated
+        self._queues: dict[str, list] = {"pending": [], "backlog": []}
+
+    async def prune(self):
+        pass
+
+    async def is_seen(self, url: str, guid: str = "", source: str = "") -> bool:
+        return url in self.seen
+
+    async def mark_seen(self, url: str, **kwargs):
+        if url not in self.seen:
+            self.dropped.add(url)
+        self.seen.add(url)
+
+    async def claim(self, url: str, **kwargs) -> bool:
+        if url in self.seen:
+            return False
+        self.seen.add(url)
+        self.claimed.add(url)
+        return True
+
+    async def find_similar(self, title: str, **kwargs):
+        return None
+
+    async def recent_source_titles(self, hours: int = 24) -> list[str]:
+        return []
+
+    async def pending_articles(self, sources=None) -> list:
+        return sorted(self._queues["pending"], key=lambda r: r[3], reverse=True)
+
+    async def replace_pending(self, rows: list, sources=None):
+        self._queues["pending"] = list(rows)
+
+    async def backlog_articles(self, sources=None) -> list:
+        return sorted(self._queues["backlog"], key=lambda r: r[3], reverse=True)
+
+    async def replace_backlog(self, rows: list, sources=None):
+        self._queues["backlog"] = list(rows)
+
+    def queued(self) -> int:
+        return len(self._queues["pending"]) + len(self._queues["backlog"])
+
+
+class SimTranslator:
+    def __init__(self, scenario: Scenario, loop: VirtualLoop, rng: random.Random):
+        self._scenario = scenario
+        self._loop = loop
+        self._rng = rng
+        self.calls = 0
+        self.failures = 0
+        self.busy = 0.0
+
+    async def translate(self, text: str, source_lang: str = "HU", target_lang: str = "RU") -> str:
+        self.calls += 1
+        if any(start <= self._loop.now < end for start, end in self._scenario.ollama_down):
+            await asyncio.sleep(1.0)  # connection refused after the connect attempt
+            self.busy += 1.0
+            self.failures += 1
+            raise ConnectionError("Ollama unreachable (simulated outage)")
+        seconds = self._rng.lognormvariate(math.log(self._scenario.translate_median), self._scenario.translate_sigma)
+        await asyncio.sleep(seconds)
+        self.busy += seconds
+        return f"{text} ({target_lang.lower()})"
+
+    async def close(self):
+        pass
+
+
+class SimBot:
+    """Telegram Bot stand-in: latency, random 429s, and the post time of every linked article."""
+
+    def __init__(self, scenario: Scenario, loop: VirtualLoop, rng: random.Random):
+        self._scenario = scenario
+        self._loop = loop
+        self._rng = rng
+        self.calls = 0
+        self.floods = 0
+        self.busy = 0.0
+        self.posted_at: dict[str, float] = {}
+
+    async def send_message(self, chat_id, text: str, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self._scenario.telegram_seconds)
+        self.busy += self._scenario.telegram_seconds
+        if self._rng.random() < self._scenario.flood_probability:
+            self.floods += 1
+            raise RetryAfter(self._scenario.flood_retry_after)
+        for url in _HREF_RE.findall(text):
+            self.posted_at.setdefault(url, self._loop.now)
+        return SimpleNamespace(message_id=self.calls)
+
+
+def _percentiles(values: list[float]) -> dict:
+    if not values:
+        return {"count": 0}
+    values = sorted(values)
+    pick = lambda q: round(values[min(len(values) - 1, int(len(values) * q))], 1)  # noqa: E731
+    return {"count": len(values), "p50": pick(0.5), "p90": pick(0.9), "p99": pick(0.99), "max": round(values[-1], 1)}
+
+
+async def _simulate(scenario: Scenario, loop: VirtualLoop, pipeline: health.PipelineStatus) -> dict:
+    rng = random.Random(scenario.seed)
+    clock = _VirtualTime(loop)
+    feeds = SimFeeds(scenario, clock, rng)
+    db = SimDb()
+    translator = SimTranslator(scenario, loop, rng)
+    bot = SimBot(scenario, loop, rng)
+    poster_ru = Poster(bot=bot, channel_id="@sim")
+
+    cycles: list[float] = []
+    skipped = {"max_instances": 0, "missed": 0}
+    idle = asyncio.Event()
+    idle.set()
+
+    async def cycle():
+        start = loop.now
+        idle.clear()
+        try:
+            await scheduler.run_once(db, translator, poster_ru, fetch=feeds.fetch)
+        finally:
+            cycles.append(loop.now - start)
+            idle.set()
+
+    def on_skip(event):
+        skipped["max_instances" if event.code == EVENT_JOB_MAX_INSTANCES else "missed"] += 1
+
+    interval = scenario.poll_minutes * 60
+    jobs = AsyncIOScheduler(timezone=UTC)
+    jobs.add_listener(on_skip, EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED)
+    # the job main.py schedules, starting right away as with FAST_START
+    jobs.add_job(
+        cycle, "interval", seconds=interval, max_instances=1, misfire_grace_time=int(interval // 2),
+        coalesce=True, next_run_time=datetime.fromtimestamp(clock.time(), UTC),
+    )
+    jobs.start()
+
+    backlog: list[tuple[float, int, int]] = []
+    duration = scenario.hours * 3600
+    while loop.now < duration:
+        await asyncio.sleep(_SAMPLE_INTERVAL)
+        waiting = feeds.arrived() - len(db.seen)
+        backlog.append((round(loop.now / 60, 1), waiting, db.queued()))
+    jobs.shutdown(wait=False)
+    await idle.wait()  # let the last cycle finish rather than cancel it
+
+    delays = [
+        (bot.posted_at[a.url] - feeds.arrived_at[a.url]) / 60
+        for a in feeds.articles if a.url in bot.posted_at
+    ]
+    return {
+        "scenario": scenario.__dict__,
+        "articles": {
+            "arrived": feeds.arrived(),
+            "posted": len(bot.posted_at),
+            "shed_or_duplicate": len(db.dropped),
+            "claimed_not_posted": len(db.claimed - bot.posted_at.keys()),
+            "waiting_at_end": feeds.arrived() - len(db.seen),
+            "totals": dict(pipeline.totals),
+        },
+        "time_to_post_minutes": _percentiles(delays),
+        "backlog": backlog,  # (minute, arrived but not yet posted/dropped, rows in pending+backlog queues)
+        "resources": {
+            "cycles": len(cycles),
+            "cycle_seconds": _percentiles(cycles),
+            "cycles_skipped": skipped,
+            "ollama_calls": translator.calls,
+            "ollama_failures": translator.failures,
+            "ollama_utilization": round(translator.busy / duration, 3),
+            "telegram_calls": bot.calls,
+            "telegram_429s": bot.floods,
+            "telegram_utilization": round(bot.busy / duration, 3),
+        },
+    }
+
+
+def simulate(scenario: Scenario) -> dict:
+    """Run a scenario to completion on a virtual clock and return its report."""
+    start, cpu = time.perf_counter(), time.process_time()
+    pipeline = health.PipelineStatus()
+    with asyncio.Runner(loop_factory=VirtualLoop) as runner, ExitStack() as stack:
+        loop = runner.get_loop()
+        clock = _VirtualTime(loop)
+        VirtualDatetime = _virtual_datetime(clock)
+        for module in (
+            apscheduler.schedulers.base, apscheduler.executors.base,
+            apscheduler.executors.base_py3, apscheduler.triggers.interval,
+        ):
+            stack.enter_context(patch.object(module, "datetime", VirtualDatetime))
+        for module in (scheduler, poster, health):
+            stack.enter_context(patch.object(module, "time", clock))
+        stack.enter_context(patch.object(scheduler, "status", pipeline))
+        report = runner.run(_simulate(scenario, loop, pipeline))
+    report["host"] = {
+        "wall_seconds": round(time.perf_counter() - start, 2),
+        "cpu_seconds": round(time.process_time() - cpu, 2),
+        "max_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+    return report
+
+
+def format_report(report: dict, rows: int = 24) -> str:
+    articles, resources = report["articles"], report["resources"]
+    delays = report["time_to_post_minutes"]
+    lines = [
+        f"articles: {articles['arrived']} arrived, {articles['posted']} posted, "
+        f"{articles['shed_or_duplicate']} shed/duplicate, {articles['claimed_not_posted']} failed to post, "
+        f"{articles['waiting_at_end']} still waiting",
+        "time to post (min): " + ", ".join(f"{k}={v}" for k, v in delays.items()),
+        f"cycles: {resources['cycles']} ({resources['cycles_skipped']['max_instances']} skipped while "
+        f"one was running), duration (s): "
+        + ", ".join(f"{k}={v}" for k, v in resources["cycle_seconds"].items()),
+        f"ollama: {resources['ollama_calls']} calls, {resources['ollama_failures']} failed, "
+        f"{resources['ollama_utilization']:.0%} busy",
+        f"telegram: {resources['telegram_calls']} calls, {resources['telegram_429s']} 429s, "
+        f"{resources['telegram_utilization']:.0%} busy",
+        f"host: {report['host']['wall_seconds']}s wall, {report['host']['cpu_seconds']}s CPU, "
+        f"max RSS {report['host']['max_rss_mib']}MiB",
+        "backlog (minute: waiting / queued):",
+    ]
+    samples = report["backlog"]
+    step = max(1, len(samples) // rows)
+    peak = max((w for _, w, _ in samples), default=0) or 1
+    for minute, waiting, queued in samples[::step]:
+        lines.append(f"  {minute:7.0f}: {waiting:5d} / {queued:5d} {'#' * round(40 * waiting / peak)}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenario", nargs="?", default="steady", choices=sorted(SCENARIOS))
+    parser.add_argument("--hours", type=float, help="simulated duration")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("-v", "--verbose", action="store_true", help="log the pipeline")
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.CRITICAL,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    scenario = SCENARIOS[args.scenario]
+    if args.hours is not None:
+        scenario.hours = args.hours
+    if args.seed is not None:
+        scenario.seed = args.seed
+    print(format_report(simulate(scenario)))
+
+
+if __name__ == "__main__":
+    main()
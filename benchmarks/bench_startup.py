@@ -0,0 +1,40 @@
+"""Import time of the entry point and its slowest dependencies.
+
+Run: python -m benchmarks.bench_startup
+"""
+import subprocess
+import sys
+import time
+
+_RUNS = 5
+
+
+def _import_profile(module: str) -> list[tuple[int, str]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative, name = line.removeprefix("import time:").split("|")
+        rows.append((int(cumulative), name.strip()))
+    return rows
+
+
+def bench(module: str):
+    wall = []
+    for _ in range(_RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+        wall.append(time.perf_counter() - start)
+    top = sorted(_import_profile(module), reverse=True)[:8]
+    print(f"{module}: best of {_RUNS} = {min(wall) * 1000:.0f}ms (interpreter included)")
+    for cumulative, name in top:
+        print(f"  {cumulative / 1000:8.1f}ms  {name}")
+
+
+if __name__ == "__main__":
+    for module in ("bot.main", "bot.translator.gemma", "bot.translator.deepl"):
+        bench(module)
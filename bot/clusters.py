@@ -0,0 +1,93 @@
+"""Incremental story clustering (STORY_CLUSTERS=1).
+
+Each posted story opens a cluster; later articles about the same event join it
+instead of being dropped, and the existing Telegram message is edited to list
+every source. Clusters in the window are mirrored in memory with an inverted
+token index, so a new title is only compared against clusters sharing a word.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from collections import defaultdict
+
+from rapidfuzz.fuzz import token_sort_ratio
+
+from bot.db import Database, normalize_title
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w{4,}")
+
+
+def _tokens(title: str) -> set[str]:
+    return set(_TOKEN_RE.findall(title.lower()))
+
+
+class StoryClusterer:
+    def __init__(self, db: Database, threshold: int = 80, hours: int = 24):
+        self._db = db
+        self._threshold = threshold
+        self._hours = hours
+        self._titles: dict[int, str] = {}
+        self._index: dict[str, set[int]] = defaultdict(set)
+        self._source_titles: dict[str, int] = {}  # untranslated headline -> cluster
+
+    async def load(self):
+        """Rebuild the in-memory index from clusters still inside the window."""
+        self._titles.clear()
+        self._index.clear()
+        self._source_titles.clear()
+        for cluster_id, title in await self._db.recent_clusters(self._hours):
+            self._add(cluster_id, title)
+        for cluster_id, source_title in await self._db.recent_cluster_source_titles(self._hours):
+            self._source_titles.setdefault(source_title, cluster_id)
+        logger.info(f"Loaded {len(self._titles)} story clusters.")
+
+    def _add(self, cluster_id: int, title: str):
+        self._titles[cluster_id] = title
+        for token in _tokens(title):
+            self._index[token].add(cluster_id)
+
+    def match(self, title: str) -> int | None:
+        """Return the best-matching cluster id, comparing only clusters sharing a token."""
+        candidates: set[int] = set()
+        for token in _tokens(title):
+            candidates |= self._index.get(token, set())
+        best_id, best_score = None, self._threshold
+        for cluster_id in candidates:
+            score = token_sort_ratio(title, self._titles[cluster_id])
+            if score >= best_score:
+                best_id, best_score = cluster_id, score
+        return best_id
+
+    def match_source(self, source_title: str) -> int | None:
+        """Cluster of a source whose untranslated headline is exactly this one."""
+        return self._source_titles.get(normalize_title(source_title))
+
+    async def create(self, title: str, url: str, source: str, source_title: str = "") -> int:
+        cluster_id = await self._db.create_cluster(title)
+        await self._db.add_cluster_source(cluster_id, url, source, source_title)
+        self._add(cluster_id, title)
+        self._add_source_title(cluster_id, source_title)
+        return cluster_id
+
+    async def attach(
+        self, cluster_id: int, url: str, source: str, source_title: str = ""
+    ) -> list[tuple[str, str]]:
+        """Add a source to a cluster and return all of its (url, source) links."""
+        await self._db.add_cluster_source(cluster_id, url, source, source_title)
+        self._add_source_title(cluster_id, source_title)
+        return await self._db.cluster_sources(cluster_id)
+
+    def _add_source_title(self, cluster_id: int, source_title: str):
+        if source_title:
+            self._source_titles.setdefault(normalize_title(source_title), cluster_id)
+
+    async def set_message(
+        self, cluster_id: int, channel_id: str, message_id: int, summary: str, tags: list[str] | None = None
+    ):
+        await self._db.set_cluster_message(cluster_id, channel_id, message_id, summary, tags)
+
+    async def messages(self, cluster_id: int) -> list[tuple[str, int, str, list[str]]]:
+        return await self._db.cluster_messages(cluster_id)
@@ -0,0 +1,49 @@
+"""Work partitioning between bot replicas sharing one seen.db (MULTI_INSTANCE=1).
+
+Each replica heartbeats and leases a fair share of SOURCES. A replica that
+stops heartbeating loses its leases after LEASE_TTL and the sources move to
+live replicas on their next cycle. Double posts are prevented separately by
+Database.claim, which marks an article seen in one atomic statement.
+"""
+import logging
+import os
+import socket
+from collections.abc import AsyncIterator
+
+from bot.db import Database
+from bot.feeds import SOURCES, Article, fetch_all
+
+logger = logging.getLogger(__name__)
+
+WORKER_ID = os.environ.get("WORKER_ID") or f"{socket.gethostname()}-{os.getpid()}"
+LEASE_TTL = float(os.environ.get("LEASE_TTL", "900"))
+
+
+class Coordinator:
+    def __init__(self, db: Database, worker_id: str = WORKER_ID, ttl: float = LEASE_TTL):
+        self._db = db
+        self.worker_id = worker_id
+        self.ttl = ttl
+        self.sources: list[str] = []
+
+    async def heartbeat(self):
+        """Mark this worker alive and extend the leases it holds."""
+        await self._db.heartbeat(self.worker_id)
+        self.sources = await self._db.acquire_leases(self.worker_id, [s["name"] for s in SOURCES], self.ttl)
+
+    async def fetch(self) -> AsyncIterator[Article]:
+        """fetch_all restricted to the sources this worker currently leases."""
+        await self.heartbeat()
+        logger.info(f"Worker {self.worker_id} owns {len(self.sources)} sources: {', '.join(self.sources)}")
+        owned = [s for s in SOURCES if s["name"] in self.sources]
+        if not owned:
+            return
+        async for article in fetch_all(owned):
+            yield article
+
+    def leased(self) -> list[str]:
+        """Sources leased at the last heartbeat; run_once scopes the shared queues to them."""
+        return list(self.sources)
+
+    async def release(self):
+        await self._db.release_leases(self.worker_id)
@@ -1,78 +1,506 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import os
+import time
+from collections.abc import Callable
+from contextlib import asynccontextmanager
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import aiosqlite
 from rapidfuzz.fuzz import token_sort_ratio
 
+_TRACKING_PARAMS = frozenset(["fbclid", "gclid", "yclid", "mc_cid", "mc_eid", "ref", "cmpid"])
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL for seen-tracking: lowercase host without www, no tracking params,
+    no fragment, no trailing slash."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode([
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    ])
+    path = parts.path.rstrip("/")
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme, host, path, query, ""))
+
+
+def hash64(text: str) -> int:
+    """Stable signed 64-bit hash, fits an SQLite INTEGER."""
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+def url_key(url: str) -> int:
+    """Primary key of a URL in the seen table: hash of its canonical form."""
+    return hash64(canonicalize_url(url))
+
+
+def guid_key(source: str, guid: str) -> int | None:
+    """Key of a feed entry GUID, scoped to its source: opaque GUIDs like "123" repeat across feeds."""
+    return hash64(f"{source}\x00{guid}") if guid else None
+
+
+def normalize_title(title: str | None) -> str:
+    return " ".join((title or "").split())
+
+
+def title_key(title: str | None) -> int | None:
+    """Key of a title in the titles table; None for an empty title."""
+    title = normalize_title(title)
+    return hash64(title) if title else None
+
 
 class Database:
     def __init__(self, path: str = "data/seen.db"):
         self.path = str(path)
         self._conn: aiosqlite.Connection | None = None
         self._lock = asyncio.Lock()
+        self._batch_depth = 0
+        # Time basis of the seen windows (wall clock when None). Replay points clock at the
+        # archive's time and sets archive_time, so a row is dated by its article's published_at.
+        self.clock: Callable[[], float] | None = None
+        self.archive_time = False
 
     async def init(self):
         os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
         self._conn = await aiosqlite.connect(self.path)
         await self._conn.execute("PRAGMA journal_mode=WAL")
+        await self._conn.execute("PRAGMA busy_timeout=5000")  # replicas may share the file
+        # seen articles keyed by 64-bit hashes; titles stored once in `titles`
         await self._conn.execute(
-            "CREATE TABLE IF NOT EXISTS seen_urls (url TEXT PRIMARY KEY)"
+            "CREATE TABLE IF NOT EXISTS seen ("
+            "url_hash INTEGER PRIMARY KEY, guid_hash INTEGER, title_hash INTEGER, "
+            "source_title_hash INTEGER, published_at REAL, posted_at INTEGER NOT NULL"
+            ") WITHOUT ROWID"
         )
-        # migrate: add title and posted_at columns
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_seen_posted_at ON seen(posted_at)"
+        )
+        await self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_seen_guid_hash ON seen(guid_hash) WHERE guid_hash IS NOT NULL"
+        )
+        # rowid table: hash is the rowid, and title rows are too wide for WITHOUT ROWID
+        await self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS titles ("
+            "hash INTEGER PRIMARY KEY, text TEXT NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        cursor = await self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'seen_urls'"
+        )
+        migrated = await cursor.fetchone() is not None
+        if migrated:
+            await self._migrate_seen_urls()
+        # story clusters: one post per event, later sources appended to it
+        await self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS clusters ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, "
+            "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+        )
+        await self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cluster_sources ("
+            "cluster_id INTEGER NOT NULL, url TEXT NOT NULL, source TEXT DEFAULT '', "
+            "PRIMARY KEY (cluster_id, url))"
+        )
+        await self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cluster_messages ("
+            "cluster_id INTEGER NOT NULL, channel_id TEXT NOT NULL, message_id INTEGER NOT NULL, "
+            "summary TEXT DEFAULT '', PRIMARY KEY (cluster_id, channel_id))"
+        )
+        # articles a cycle ran out of time for, carried into the next one
+        await self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pending ("
+            "url TEXT PRIMARY KEY, title TEXT NOT NULL, source TEXT DEFAULT '', "
+            "published_at REAL DEFAULT 0, enqueued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+        )
+        # low-priority spill queue: articles over the admission limits, drained as capacity frees up
+        await self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS backlog ("
+            "url TEXT PRIMARY KEY, title TEXT NOT NULL, source TEXT DEFAULT '', "
+            "published_at REAL DEFAULT 0, enqueued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, "
+            "guid TEXT DEFAULT '', description TEXT DEFAULT '')"
+        )
+        cursor = await self._conn.execute("PRAGMA table_info(cluster_sources)")
+        if "title" not in {row[1] for row in await cursor.fetchall()}:
+            # untranslated headline of each source, so same-wording copies find their cluster
+            await self._conn.execute("ALTER TABLE cluster_sources ADD COLUMN title TEXT DEFAULT ''")
+        cursor = await self._conn.execute("PRAGMA table_info(cluster_messages)")
+        if "tags" not in {row[1] for row in await cursor.fetchall()}:
+            await self._conn.execute("ALTER TABLE cluster_messages ADD COLUMN tags TEXT DEFAULT ''")
+        cursor = await self._conn.execute("PRAGMA table_info(pending)")
+        pending_cols = {row[1] for row in await cursor.fetchall()}
+        if "guid" not in pending_cols:
+            await self._conn.execute("ALTER TABLE pending ADD COLUMN guid TEXT DEFAULT ''")
+        if "description" not in pending_cols:
+            await self._conn.execute("ALTER TABLE pending ADD COLUMN description TEXT DEFAULT ''")
+        # multi-instance coordination: source leases and worker liveness
+        await self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS source_leases ("
+            "source TEXT PRIMARY KEY, worker_id TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        await self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS workers (worker_id TEXT PRIMARY KEY, last_seen REAL NOT NULL)"
+        )
+        await self._conn.commit()
+        if migrated:
+            await self._conn.execute("VACUUM")
+
+    async def _migrate_seen_urls(self):
+        """One-off migration from the old text-keyed seen_urls table to seen + titles."""
         cursor = await self._conn.execute("PRAGMA table_info(seen_urls)")
         cols = {row[1] for row in await cursor.fetchall()}
-        if "title" not in cols:
-            await self._conn.execute("ALTER TABLE seen_urls ADD COLUMN title TEXT DEFAULT ''")
-        if "posted_at" not in cols:
-            await self._conn.execute(
-                "ALTER TABLE seen_urls ADD COLUMN posted_at TIMESTAMP DEFAULT NULL"
-            )
-        else:
-            await self._conn.execute("UPDATE seen_urls SET posted_at = NULL WHERE posted_at = ''")
+        for col, decl in (
+            ("title", "TEXT DEFAULT ''"),
+            ("posted_at", "TIMESTAMP DEFAULT NULL"),
+            ("source_title", "TEXT DEFAULT ''"),
+            ("guid_hash", "INTEGER DEFAULT NULL"),
+            ("published_at", "REAL DEFAULT NULL"),
+        ):
+            if col not in cols:
+                await self._conn.execute(f"ALTER TABLE seen_urls ADD COLUMN {col} {decl}")
+        await self._conn.create_function("url_key", 1, url_key, deterministic=True)
+        await self._conn.create_function("title_key", 1, title_key, deterministic=True)
+        await self._conn.create_function("normalize_title", 1, normalize_title, deterministic=True)
+        # rows from before posted_at existed count as posted now, so they survive one window
+        posted = f"COALESCE(CAST(strftime('%s', NULLIF(posted_at, '')) AS INTEGER), {int(time.time())})"
         await self._conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_posted_at ON seen_urls(posted_at)"
+            "INSERT OR REPLACE INTO titles (hash, text, last_used) "
+            "SELECT title_key(t), normalize_title(t), MAX(p) FROM ("
+            f"SELECT title AS t, {posted} AS p FROM seen_urls UNION ALL "
+            f"SELECT source_title, {posted} FROM seen_urls"
+            ") WHERE title_key(t) IS NOT NULL GROUP BY title_key(t)"
         )
-        await self._conn.commit()
+        await self._conn.execute(
+            "INSERT OR REPLACE INTO seen "
+            "(url_hash, guid_hash, title_hash, source_title_hash, published_at, posted_at) "
+            "SELECT url_key(url), guid_hash, title_key(title), title_key(source_title), "
+            f"published_at, {posted} FROM seen_urls"
+        )
+        await self._conn.execute("DROP TABLE seen_urls")
+
+    async def _commit(self):
+        if self._batch_depth == 0:
+            await self._conn.commit()
+
+    @asynccontextmanager
+    async def batch(self):
+        """Defer commits until the block exits (bulk loads such as replay)."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                async with self._lock:
+                    await self._conn.commit()
 
     async def close(self):
         if self._conn:
             await self._conn.close()
             self._conn = None
 
-    async def is_seen(self, url: str) -> bool:
+    async def is_seen(self, url: str, guid: str = "", source: str = "") -> bool:
+        """True if the URL or, when given, the source's feed entry GUID was seen before."""
         async with self._lock, self._conn.execute(
-            "SELECT 1 FROM seen_urls WHERE url = ?", (url,)
+            "SELECT 1 FROM seen WHERE url_hash = ? OR guid_hash = ? LIMIT 1",
+            (url_key(url), guid_key(source, guid)),
         ) as cursor:
             return await cursor.fetchone() is not None
 
-    async def mark_seen(self, url: str, title: str = ""):
+    def _now(self) -> int:
+        return int(self.clock() if self.clock else time.time())
+
+    def _posted_at(self, published_at: float | None) -> int:
+        if self.archive_time and published_at:
+            return int(published_at)
+        return self._now()
+
+    async def _store_titles(self, now: int, *titles: str) -> list[int | None]:
+        keys = [title_key(t) for t in titles]
+        await self._conn.executemany(
+            "INSERT INTO titles (hash, text, last_used) VALUES (?, ?, ?) "
+            "ON CONFLICT(hash) DO UPDATE SET last_used = MAX(last_used, excluded.last_used)",
+            [(key, normalize_title(t), now) for key, t in zip(keys, titles) if key is not None],
+        )
+        return keys
+
+    async def mark_seen(
+        self,
+        url: str,
+        title: str = "",
+        source_title: str = "",
+        guid: str = "",
+        published_at: float | None = None,
+        source: str = "",
+    ):
+        now = self._posted_at(published_at)
         async with self._lock:
+            title_hash, source_title_hash = await self._store_titles(now, title, source_title)
             await self._conn.execute(
-                "INSERT INTO seen_urls (url, title, posted_at) VALUES (?, ?, CURRENT_TIMESTAMP) "
-                "ON CONFLICT(url) DO UPDATE SET title=excluded.title, posted_at=excluded.posted_at",
-                (url, title),
+                "INSERT INTO seen (url_hash, guid_hash, title_hash, source_title_hash, published_at, posted_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(url_hash) DO UPDATE SET guid_hash=excluded.guid_hash, "
+                "title_hash=excluded.title_hash, source_title_hash=excluded.source_title_hash, "
+                "published_at=excluded.published_at, posted_at=excluded.posted_at",
+                (url_key(url), guid_key(source, guid), title_hash, source_title_hash, published_at, now),
+            )
+            await self._commit()
+
+    async def claim(
+        self,
+        url: str,
+        title: str = "",
+        source_title: str = "",
+        guid: str = "",
+        published_at: float | None = None,
+        source: str = "",
+    ) -> bool:
+        """Atomically mark an article seen; False if it (URL or GUID) was already taken.
+
+        A single INSERT, so two replicas can never both claim the same article.
+        """
+        guid_hash = guid_key(source, guid)
+        now = self._posted_at(published_at)
+        async with self._lock:
+            cursor = await self._conn.execute(
+                "INSERT INTO seen (url_hash, guid_hash, title_hash, source_title_hash, published_at, posted_at) "
+                "SELECT ?, ?, ?, ?, ?, ? "
+                "WHERE ? IS NULL OR NOT EXISTS (SELECT 1 FROM seen WHERE guid_hash = ?) "
+                "ON CONFLICT(url_hash) DO NOTHING",
+                (url_key(url), guid_hash, title_key(title), title_key(source_title), published_at, now,
+                 guid_hash, guid_hash),
             )
+            claimed = cursor.rowcount == 1
+            if claimed:
+                await self._store_titles(now, title, source_title)
+            await self._commit()
+            return claimed
+
+    async def heartbeat(self, worker_id: str):
+        async with self._lock:
+            await self._conn.execute(
+                "INSERT OR REPLACE INTO workers (worker_id, last_seen) VALUES (?, ?)",
+                (worker_id, time.time()),
+            )
+            await self._commit()
+
+    async def acquire_leases(self, worker_id: str, sources: list[str], ttl: float) -> list[str]:
+        """Renew this worker's leases and take free or expired ones, up to a fair share
+        of the sources among live workers. Leases over the share are released."""
+        async with self._lock:
             await self._conn.commit()
+            await self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                (live,) = await (await self._conn.execute(
+                    "SELECT COUNT(*) FROM workers WHERE last_seen >= ? OR worker_id = ?",
+                    (now - ttl, worker_id),
+                )).fetchone()
+                share = -(-len(sources) // max(live, 1))
+                leases = {
+                    source: (owner, expires) for source, owner, expires in
+                    await self._conn.execute_fetchall("SELECT source, worker_id, expires_at FROM source_leases")
+                }
+                mine = [s for s in sources if s in leases and leases[s][0] == worker_id and leases[s][1] > now]
+                free = [s for s in sources if s not in leases or leases[s][1] <= now]
+                keep = mine[:share]
+                owned = keep + free[: share - len(keep)]
+                await self._conn.executemany(
+                    "DELETE FROM source_leases WHERE source = ? AND worker_id = ?",
+                    [(s, worker_id) for s in mine[share:]],
+                )
+                await self._conn.executemany(
+                    "INSERT OR REPLACE INTO source_leases (source, worker_id, expires_at) VALUES (?, ?, ?)",
+                    [(s, worker_id, now + ttl) for s in owned],
+                )
+                await self._conn.commit()
+            except BaseException:
+                await self._conn.rollback()
+                raise
+            return owned
+
+    async def release_leases(self, worker_id: str):
+        async with self._lock:
+            await self._conn.execute("DELETE FROM source_leases WHERE worker_id = ?", (worker_id,))
+            await self._conn.execute("DELETE FROM workers WHERE worker_id = ?", (worker_id,))
+            await self._commit()
 
     async def prune(self, keep_days: int = 30):
         async with self._lock:
+            cutoff = self._now() - keep_days * 86400
+            await self._conn.execute("DELETE FROM seen WHERE posted_at < ?", (cutoff,))
+            # a title last used before the cutoff is no longer referenced by any seen row
+            await self._conn.execute("DELETE FROM titles WHERE last_used < ?", (cutoff,))
             await self._conn.execute(
-                "DELETE FROM seen_urls WHERE posted_at IS NULL OR posted_at < datetime('now', ?)",
-                (f"-{keep_days} days",),
+                "DELETE FROM clusters WHERE created_at < datetime('now', ?)", (f"-{keep_days} days",)
             )
-            await self._conn.commit()
+            await self._conn.execute(
+                "DELETE FROM cluster_sources WHERE cluster_id NOT IN (SELECT id FROM clusters)"
+            )
+            await self._conn.execute(
+                "DELETE FROM cluster_messages WHERE cluster_id NOT IN (SELECT id FROM clusters)"
+            )
+            for queue in ("pending", "backlog"):
+                await self._conn.execute(
+                    f"DELETE FROM {queue} WHERE enqueued_at < datetime('now', '-1 day')"
+                )
+            await self._commit()
 
-    async def find_similar(self, title: str, threshold: int = 80, hours: int = 24) -> str | None:
+    @staticmethod
+    def _source_filter(sources: list[str] | None) -> tuple[str, list[str]]:
+        """WHERE clause limiting a queue to some sources; None means every row."""
+        if sources is None:
+            return "", []
+        return f" WHERE source IN ({', '.join('?' * len(sources))})", list(sources)
+
+    async def _queue_rows(
+        self, queue: str, sources: list[str] | None = None
+    ) -> list[tuple[str, str, str, float, str, str]]:
+        where, params = self._source_filter(sources)
+        async with self._lock, self._conn.execute(
+            "SELECT title, url, source, published_at, guid, description FROM "
+            f"{queue}{where} ORDER BY published_at DESC",
+            params,
+        ) as cursor:
+            return list(await cursor.fetchall())
+
+    async def _replace_queue(
+        self, queue: str, rows: list[tuple[str, str, str, float, str, str]], sources: list[str] | None = None
+    ):
+        """Replace the rows of the given sources (all rows when None), keeping enqueued_at
+        of rows still queued; rows of other sources are neither written nor dropped.
+        Replicas lease disjoint sources, so they never touch each other's rows."""
+        where, params = self._source_filter(sources)
+        if sources is not None:
+            rows = [row for row in rows if row[2] in sources]
+        async with self._lock:
+            existing = {
+                url: enqueued for url, enqueued in
+                await self._conn.execute_fetchall(f"SELECT url, enqueued_at FROM {queue}{where}", params)
+            }
+            await self._conn.execute(f"DELETE FROM {queue}{where}", params)
+            await self._conn.executemany(
+                f"INSERT OR REPLACE INTO {queue} "
+                "(title, url, source, published_at, guid, description, enqueued_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))",
+                [(*row, existing.get(row[1])) for row in rows],
+            )
+            await self._commit()
+
+    async def pending_articles(
+        self, sources: list[str] | None = None
+    ) -> list[tuple[str, str, str, float, str, str]]:
+        """Return carried-over (title, url, source, published_at, guid, description) rows,
+        newest first, of the given sources (all when None)."""
+        return await self._queue_rows("pending", sources)
+
+    async def replace_pending(
+        self, rows: list[tuple[str, str, str, float, str, str]], sources: list[str] | None = None
+    ):
+        """Replace the pending rows of the given sources (all when None) with
+        (title, url, source, published_at, guid, description) rows."""
+        await self._replace_queue("pending", rows, sources)
+
+    async def backlog_articles(
+        self, sources: list[str] | None = None
+    ) -> list[tuple[str, str, str, float, str, str]]:
+        """Return deferred rows of the given sources, shaped and ordered as pending_articles."""
+        return await self._queue_rows("backlog", sources)
+
+    async def replace_backlog(
+        self, rows: list[tuple[str, str, str, float, str, str]], sources: list[str] | None = None
+    ):
+        """Replace the low-priority backlog rows of the given sources, as replace_pending."""
+        await self._replace_queue("backlog", rows, sources)
+
+    async def create_cluster(self, title: str) -> int:
+        async with self._lock:
+            cursor = await self._conn.execute("INSERT INTO clusters (title) VALUES (?)", (title,))
+            await self._commit()
+            return cursor.lastrowid
+
+    async def recent_clusters(self, hours: int = 24) -> list[tuple[int, str]]:
         async with self._lock, self._conn.execute(
-            "SELECT title FROM seen_urls WHERE title != '' "
-            "AND posted_at >= datetime('now', ?) "
-            "ORDER BY posted_at DESC LIMIT 5000",
+            "SELECT id, title FROM clusters WHERE created_at >= datetime('now', ?) ORDER BY id",
             (f"-{hours} hours",),
         ) as cursor:
-            rows = await cursor.fetchall()
-        for (existing,) in rows:
+            return list(await cursor.fetchall())
+
+    async def add_cluster_source(self, cluster_id: int, url: str, source: str = "", title: str = ""):
+        async with self._lock:
+            await self._conn.execute(
+                "INSERT OR IGNORE INTO cluster_sources (cluster_id, url, source, title) VALUES (?, ?, ?, ?)",
+                (cluster_id, url, source, normalize_title(title)),
+            )
+            await self._commit()
+
+    async def recent_cluster_source_titles(self, hours: int = 24) -> list[tuple[int, str]]:
+        """(cluster_id, untranslated source title) of every source of clusters in the window."""
+        async with self._lock, self._conn.execute(
+            "SELECT cluster_sources.cluster_id, cluster_sources.title FROM cluster_sources "
+            "JOIN clusters ON clusters.id = cluster_sources.cluster_id "
+            "WHERE clusters.created_at >= datetime('now', ?) AND cluster_sources.title != '' "
+            "ORDER BY cluster_sources.rowid",
+            (f"-{hours} hours",),
+        ) as cursor:
+            return list(await cursor.fetchall())
+
+    async def cluster_sources(self, cluster_id: int) -> list[tuple[str, str]]:
+        async with self._lock, self._conn.execute(
+            "SELECT url, source FROM cluster_sources WHERE cluster_id = ? ORDER BY rowid",
+            (cluster_id,),
+        ) as cursor:
+            return list(await cursor.fetchall())
+
+    async def set_cluster_message(
+        self, cluster_id: int, channel_id: str, message_id: int, summary: str, tags: list[str] | None = None
+    ):
+        async with self._lock:
+            await self._conn.execute(
+                "INSERT OR REPLACE INTO cluster_messages (cluster_id, channel_id, message_id, summary, tags) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (cluster_id, channel_id, message_id, summary, " ".join(tags or [])),
+            )
+            await self._commit()
+
+    async def cluster_messages(self, cluster_id: int) -> list[tuple[str, int, str, list[str]]]:
+        """(channel_id, message_id, summary, tags) of each message posted for a cluster."""
+        async with self._lock, self._conn.execute(
+            "SELECT channel_id, message_id, summary, tags FROM cluster_messages WHERE cluster_id = ?",
+            (cluster_id,),
+        ) as cursor:
+            return [
+                (channel_id, message_id, summary, tags.split())
+                for channel_id, message_id, summary, tags in await cursor.fetchall()
+            ]
+
+    async def find_similar(self, title: str, threshold: int = 80, hours: int = 24) -> str | None:
+        return await self._find_similar("title_hash", title, threshold, hours)
+
+    async def find_similar_source(
+        self, source_title: str, threshold: int = 90, hours: int = 24
+    ) -> str | None:
+        """Match an untranslated (Hungarian) title against recently stored source titles."""
+        return await self._find_similar("source_title_hash", source_title, threshold, hours)
+
+    async def recent_source_titles(self, hours: int = 24) -> list[str]:
+        """Untranslated titles stored in the last ``hours``, newest first (at most 5000)."""
+        return await self._recent_titles("source_title_hash", hours)
+
+    async def _recent_titles(self, column: str, hours: int) -> list[str]:
+        async with self._lock, self._conn.execute(
+            f"SELECT titles.text FROM seen JOIN titles ON titles.hash = seen.{column} "
+            "WHERE seen.posted_at >= ? "
+            "ORDER BY seen.posted_at DESC LIMIT 5000",
+            (self._now() - hours * 3600,),
+        ) as cursor:
+            return [text for (text,) in await cursor.fetchall()]
+
+    async def _find_similar(self, column: str, title: str, threshold: int, hours: int) -> str | None:
+        for existing in await self._recent_titles(column, hours):
             if token_sort_ratio(title, existing) >= threshold:
                 return existing
         return None
@@ -1,10 +1,18 @@
 import asyncio
+import calendar
+import html
 import logging
-import urllib.request
-from dataclasses import dataclass
+import os
+import re
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
 
 import feedparser
 
+from bot import net
+
 logger = logging.getLogger(__name__)
 
 SOURCES = [
@@ -19,47 +27,174 @@ SOURCES = [
     {"name": "Daily News Hungary", "url": "https://dailynewshungary.com/rss"},
 ]
 
-_FEED_TIMEOUT = 30
+_FEED_TIMEOUT = 30  # total download deadline per feed (seconds)
+_FEED_TTFB_TIMEOUT = float(os.environ.get("FEED_TTFB_TIMEOUT", "10"))
+_MAX_FEED_BYTES = int(os.environ.get("MAX_FEED_BYTES", str(5 * 2**20)))
+_MAX_FEED_ENTRIES = int(os.environ.get("MAX_FEED_ENTRIES", "200"))
+_MIN_FEED_BYTES = 256 * 2**10
+_ENTRY_END_RE = re.compile(rb"</(?:item|entry)\s*>", re.IGNORECASE)
+_ROOT_RE = re.compile(rb"<([A-Za-z][\w:.-]*)")
 
-@dataclass
+@dataclass(slots=True)
 class Article:
     title: str
     url: str
     source: str
+    published_at: float = 0.0  # unix time from the feed entry; fetch time if the feed has none
+    guid: str = ""  # stable entry id (RSS guid / Atom id), survives URL changes
+    description: str = ""  # plain-text lead, at most _MAX_DESCRIPTION chars
+
+_MAX_DESCRIPTION = 300
+_TAG_RE = re.compile(r"<[^>]+>")
+
+def _clean_description(raw: str) -> str:
+    text = " ".join(html.unescape(_TAG_RE.sub(" ", raw)).split())
+    if len(text) <= _MAX_DESCRIPTION:
+        return text
+    return text[:_MAX_DESCRIPTION].rsplit(" ", 1)[0] + "…"
 
 _USER_AGENT = "Mozilla/5.0 (compatible; HungaryNewsBot/1.0; +https://t.me/hungary_news_ru)"
 
-def _parse_with_timeout(url: str):
-    """Fetch and parse RSS with per-request timeout (thread-safe)."""
-    req = urllib.request.Request(url, headers={"User-Agent": _USER_AGENT})
-    resp = urllib.request.urlopen(req, timeout=_FEED_TIMEOUT)
-    return feedparser.parse(resp.read())
+@dataclass(slots=True)
+class FeedStats:
+    """Size and timing of the last downloads of one feed URL."""
+    bytes: int = 0
+    ttfb: float = 0.0
+    seconds: float = 0.0
+    entries: int = 0
+    truncated: str = ""  # why the last download stopped early: "entries", "bytes" or "deadline"
+    sizes: deque = field(default_factory=lambda: deque(maxlen=20))
 
-async def fetch_feed(source: dict) -> list[Article]:
-    feed = await asyncio.wait_for(
-        asyncio.to_thread(_parse_with_timeout, source["url"]),
-        timeout=_FEED_TIMEOUT + 5,
-    )
+    def byte_cap(self) -> int:
+        """Per-source cap: 4x the largest recent body, within [_MIN_FEED_BYTES, _MAX_FEED_BYTES]."""
+        if not self.sizes:
+            return _MAX_FEED_BYTES
+        return min(_MAX_FEED_BYTES, max(_MIN_FEED_BYTES, 4 * max(self.sizes)))
+
+_stats: dict[str, FeedStats] = {}
+
+def feed_stats() -> dict[str, dict]:
+    return {
+        url: {
+            "bytes": s.bytes, "ttfb": round(s.ttfb, 3), "seconds": round(s.seconds, 3),
+            "entries": s.entries, "truncated": s.truncated, "byte_cap": s.byte_cap(),
+        }
+        for url, s in _stats.items()
+    }
+
+def _close_document(body: bytearray):
+    """Append end tags for the elements still open after the last entry, so a cut
+    body parses as well-formed XML (feedparser's loose fallback is about 2x slower)."""
+    root = _ROOT_RE.search(body)
+    if not root:
+        return
+    # RSS 2.0 items sit inside <channel>; in RSS 1.0 the channel is closed before the items
+    if root.group(1).lower() == b"rss" or (b"<channel" in body and b"</channel>" not in body):
+        body += b"</channel>"
+    body += b"</" + root.group(1) + b">"
+
+async def _download(url: str, stats: FeedStats) -> bytes:
+    """Stream a feed body, stopping at _MAX_FEED_ENTRIES complete entries, the
+    source's byte cap or the total deadline. A cut body ends after the last
+    complete entry; feedparser recovers the entries of such a document."""
+    start = time.monotonic()
+    deadline = start + _FEED_TIMEOUT
+    max_bytes = stats.byte_cap()
+    # the timeout bounds connect, headers and every single read
+    async with net.shared().stream(
+        "GET", url, headers={"User-Agent": _USER_AGENT}, timeout=_FEED_TTFB_TIMEOUT
+    ) as resp:
+        resp.raise_for_status()
+        stats.ttfb = time.monotonic() - start
+        body = bytearray()
+        entries, entry_end, scanned = 0, 0, 0
+        stats.truncated = ""
+        async for chunk in resp.aiter_bytes():
+            body += chunk
+            # rescan a few bytes before the chunk so a tag split across chunks is found
+            for match in _ENTRY_END_RE.finditer(body, max(scanned - 16, entry_end)):
+                entries += 1
+                entry_end = match.end()
+                if entries >= _MAX_FEED_ENTRIES:
+                    break
+            scanned = len(body)
+            if entries >= _MAX_FEED_ENTRIES:
+                stats.truncated = "entries"
+            elif len(body) >= max_bytes:
+                stats.truncated = "bytes"
+            elif time.monotonic() > deadline:
+                stats.truncated = "deadline"
+            if stats.truncated:
+                if entry_end:
+                    del body[entry_end:]
+                    _close_document(body)
+                break
+    stats.seconds = time.monotonic() - start
+    stats.bytes = len(body)
+    stats.entries = entries
+    if stats.truncated != "entries":
+        stats.sizes.append(len(body))
+    if stats.truncated in ("bytes", "deadline"):
+        logger.warning(
+            f"Feed {url} cut at {len(body)} bytes after {stats.seconds:.1f}s ({stats.truncated} limit), "
+            f"keeping {entries} entries"
+        )
+    return bytes(body)
+
+def _parse_articles(body: bytes, source_name: str) -> list[Article]:
+    """Parse and reduce a feed to Articles inside a worker thread,
+    so the parsed feed object is released before control returns."""
+    return articles_from_feed(feedparser.parse(body), source_name)
+
+async def _extract_articles(source: dict) -> list[Article]:
+    """Download a feed on the shared HTTP client (with size and time guards), then parse it off the loop."""
+    body = await _download(source["url"], _stats.setdefault(source["url"], FeedStats()))
+    return await asyncio.to_thread(_parse_articles, body, source["name"])
+
+def articles_from_feed(feed, source_name: str) -> list[Article]:
+    """Reduce a parsed feedparser result to Articles."""
     if feed.bozo and not feed.entries:
-        logger.warning(f"Feed {source['name']} failed: {feed.bozo_exception}")
+        logger.warning(f"Feed {source_name} failed: {feed.bozo_exception}")
         return []
     articles = []
+    fetched_at = time.time()
     for entry in feed.entries:
         url = entry.get("link", "")
         title = entry.get("title", "")
         if url and title:
-            articles.append(Article(title=title, url=url, source=source["name"]))
+            parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+            published_at = float(calendar.timegm(parsed)) if parsed else fetched_at
+            articles.append(Article(
+                title=title,
+                url=url,
+                source=source_name,
+                published_at=published_at,
+                guid=entry.get("id", ""),
+                description=_clean_description(entry.get("summary", "")[:_MAX_DESCRIPTION * 4]),
+            ))
     return articles
 
-async def fetch_all() -> list[Article]:
-    results = await asyncio.gather(
-        *[fetch_feed(source) for source in SOURCES],
-        return_exceptions=True,
+async def fetch_feed(source: dict) -> AsyncIterator[Article]:
+    articles = await asyncio.wait_for(
+        _extract_articles(source),
+        timeout=_FEED_TIMEOUT + _FEED_TTFB_TIMEOUT + 5,  # the last read may block for up to TTFB
     )
-    articles = []
-    for source, result in zip(SOURCES, results):
+    for article in articles:
+        yield article
+
+async def _collect(source: dict) -> tuple[dict, list[Article] | Exception]:
+    try:
+        return source, [a async for a in fetch_feed(source)]
+    except Exception as e:
+        return source, e
+
+async def fetch_all(sources: list[dict] | None = None) -> AsyncIterator[Article]:
+    """Yield articles source by source, in the order the sources finish downloading."""
+    for next_done in asyncio.as_completed([_collect(source) for source in (sources or SOURCES)]):
+        source, result = await next_done
         if isinstance(result, Exception):
             logger.error(f"Error fetching {source['name']}: {result}")
-        else:
-            articles.extend(result)
-    return articles
+            continue
+        for article in result:
+            yield article
+        del result
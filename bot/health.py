@@ -0,0 +1,188 @@
+"""In-process health/readiness HTTP server (HEALTH_PORT, 0 disables).
+
+  GET /healthz  liveness: 503 once no cycle has succeeded for HEALTH_MAX_CYCLE_AGE
+  GET /readyz   readiness: 503 until a cycle has succeeded, or while the DB, every
+                translator backend or Telegram is unavailable
+
+Both return the full status as JSON. The server runs on its own thread and only
+reads a status snapshot, component state and its own SQLite connection, so a
+health probe never waits on the event loop.
+
+``python -m bot.health`` is the container healthcheck: it probes /healthz on
+HEALTH_PORT, or only opens the database when the server is disabled.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+import urllib.request
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEALTH_PORT = 8080  # main reads HEALTH_PORT after loading .env
+
+
+class PipelineStatus:
+    """Cycle outcomes and per-stage counts, written by run_once and read by the health thread."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.cycle_started_at: float | None = None
+        self.last_success_at: float | None = None
+        self.last_failure_at: float | None = None
+        self.last_error = ""
+        self.stages: dict[str, int] = {}
+        self.totals: Counter[str] = Counter()  # counts accumulated over all cycles
+
+    def cycle_started(self):
+        self.cycle_started_at = time.time()
+        self.stages = {}
+
+    def stage(self, name: str, count: int):
+        self.stages[name] = count
+
+    def count(self, name: str, n: int = 1):
+        self.totals[name] += n
+
+    def cycle_succeeded(self):
+        self.last_success_at = time.time()
+        self.cycle_started_at = None
+
+    def cycle_failed(self, error: str):
+        self.last_failure_at = time.time()
+        self.last_error = error
+        self.cycle_started_at = None
+
+    def snapshot(self) -> dict:
+        now = time.time()
+        return {
+            "uptime": round(now - self.started_at, 1),
+            "since_last_success": round(now - self.last_success_at, 1) if self.last_success_at else None,
+            "cycle_running_for": round(now - self.cycle_started_at, 1) if self.cycle_started_at else None,
+            "last_failure_at": self.last_failure_at,
+            "last_error": self.last_error,
+            "stages": dict(self.stages),
+            "totals": dict(self.totals),
+        }
+
+
+status = PipelineStatus()
+
+
+class HealthServer:
+    def __init__(
+        self,
+        db_path: str,
+        max_cycle_age: float,
+        translator=None,
+        posters: list | None = None,
+        port: int = DEFAULT_HEALTH_PORT,
+        pipeline: PipelineStatus = status,
+        http=None,
+    ):
+        self._db_path = db_path
+        self._max_cycle_age = max_cycle_age
+        self._translator = translator
+        self._posters = [p for p in (posters or []) if p is not None]
+        self._pipeline = pipeline
+        self._http = http
+        self._server = ThreadingHTTPServer(("0.0.0.0", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="health", daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self):
+        self._thread.start()
+        logger.info(f"Health server listening on :{self.port}")
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _db_latency(self) -> float | None:
+        start = time.perf_counter()
+        try:
+            conn = sqlite3.connect(f"file:{self._db_path}?mode=ro", uri=True, timeout=2)
+            try:
+                conn.execute("SELECT 1 FROM seen LIMIT 1").fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Health DB probe failed: {e}")
+            return None
+        return time.perf_counter() - start
+
+    def _component(self, obj) -> dict | None:
+        try:
+            return obj.stats() if hasattr(obj, "stats") else None
+        except Exception as e:  # state is read from another thread; report rather than fail
+            return {"error": str(e)}
+
+    def report(self) -> tuple[bool, bool, dict]:
+        """(alive, ready, status body)."""
+        body = self._pipeline.snapshot()
+        db_latency = self._db_latency()
+        body["db_latency_ms"] = round(db_latency * 1000, 2) if db_latency is not None else None
+        body["translator"] = self._component(self._translator)
+        body["telegram"] = {p.channel_id: self._component(p) for p in self._posters}
+        body["http"] = self._component(self._http)
+
+        age = body["since_last_success"]
+        alive = age < self._max_cycle_age if age is not None else body["uptime"] < self._max_cycle_age
+        circuits = [c for c in (body["translator"] or {}).values() if isinstance(c, dict) and "circuit" in c]
+        translator_ok = not circuits or any(c["circuit"] == "closed" for c in circuits)
+        telegram_ok = all(t is None or t.get("circuit") != "open" for t in body["telegram"].values())
+        ready = alive and age is not None and db_latency is not None and translator_ok and telegram_ok
+        return alive, ready, body
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path not in ("/healthz", "/readyz"):
+                    self.send_error(404)
+                    return
+                alive, ready, body = server.report()
+                ok = alive if self.path == "/healthz" else ready
+                payload = json.dumps({"ok": ok, **body}).encode()
+                self.send_response(200 if ok else 503)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass  # probes every few seconds would flood the log
+
+        return Handler
+
+
+def probe(port: int, db_path: str = "data/seen.db", timeout: float = 5) -> None:
+    """Raise unless /healthz answers 200; with the server disabled (port 0), check the DB opens."""
+    if port:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/healthz", timeout=timeout):
+            return
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=timeout)
+    try:
+        conn.execute("SELECT 1").fetchone()
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    try:
+        probe(int(os.environ.get("HEALTH_PORT", DEFAULT_HEALTH_PORT)))
+    except Exception as e:
+        print(f"unhealthy: {e}", file=sys.stderr)
+        sys.exit(1)
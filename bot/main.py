@@ -1,15 +1,23 @@
 import asyncio
+import json
 import logging
 import os
 import signal
+import time
+from datetime import datetime
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from telegram import Bot
 
+from bot import net
+from bot.clusters import StoryClusterer
 from bot.db import Database
-from bot.poster import Poster
+from bot.health import DEFAULT_HEALTH_PORT, HealthServer
+from bot.poster import Poster, TelegramRequest
+from bot.profiling import Profiler
 from bot.scheduler import run_once
-from bot.translator.gemma import OLLAMA_URL, GemmaTranslator
+from bot.tagger import Tagger
+from bot.translator.base import Translator
 
 try:
     from dotenv import load_dotenv
@@ -25,6 +33,15 @@ logger = logging.getLogger(__name__)
 
 _STARTUP_TIMEOUT = float(os.environ.get("STARTUP_TIMEOUT", "300"))
 _POLL_INTERVAL_MINUTES = int(os.environ.get("POLL_INTERVAL_MINUTES", "5"))
+_SEMANTIC_DEDUP = os.environ.get("SEMANTIC_DEDUP", "") == "1"
+_STORY_CLUSTERS = os.environ.get("STORY_CLUSTERS", "") == "1"
+_FAST_START = os.environ.get("FAST_START", "") == "1"
+_MULTI_INSTANCE = os.environ.get("MULTI_INSTANCE", "") == "1"
+_TRANSLATOR = os.environ.get("TRANSLATOR", "gemma")
+_HEALTH_CACHE_PATH = "data/health.json"
+_HEALTH_CACHE_TTL = float(os.environ.get("HEALTH_CACHE_TTL", "600"))
+# /healthz fails once no cycle has succeeded for this long
+_HEALTH_MAX_CYCLE_AGE = float(os.environ.get("HEALTH_MAX_CYCLE_AGE", str(_POLL_INTERVAL_MINUTES * 60 * 3)))
 
 def _require_env(name: str) -> str:
     value = os.environ.get(name)
@@ -32,17 +49,62 @@ def _require_env(name: str) -> str:
         raise RuntimeError(f"Missing required environment variable: {name}")
     return value
 
-async def _check_ollama():
-    """Verify Ollama is reachable. Raises on failure."""
-    import httpx
-    base = OLLAMA_URL.rsplit("/", 2)[0]  # strip /api/generate
+def _build_backend(name: str) -> Translator:
+    """Instantiate one translator backend, importing only its module."""
+    if name == "gemma":
+        from bot.translator.gemma import GemmaTranslator
+        return GemmaTranslator()
+    if name == "deepl":
+        from bot.translator.deepl import DeepLTranslator
+        return DeepLTranslator(_require_env("DEEPL_API_KEY"))
+    if name == "stub":
+        from bot.translator.stub import StubTranslator
+        return StubTranslator()
+    raise RuntimeError(f"Unknown TRANSLATOR: {name}")
+
+def _build_translator() -> Translator:
+    """Single backend, or a latency-aware router when TRANSLATOR lists several (e.g. gemma,deepl)."""
+    names = [n.strip() for n in _TRANSLATOR.split(",") if n.strip()]
+    if len(names) == 1:
+        return _build_backend(names[0])
+    from bot.translator.router import RoutingTranslator
+    return RoutingTranslator({name: _build_backend(name) for name in names})
+
+def _load_health_cache() -> dict[str, float]:
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.get(base)
-            resp.raise_for_status()
-        logger.info("Ollama health check passed.")
-    except Exception as e:
-        raise RuntimeError(f"Ollama not reachable at {base}: {e}") from e
+        with open(_HEALTH_CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_health_cache(cache: dict[str, float]):
+    try:
+        os.makedirs(os.path.dirname(_HEALTH_CACHE_PATH), exist_ok=True)
+        with open(_HEALTH_CACHE_PATH, "w") as f:
+            json.dump(cache, f)
+    except OSError as e:
+        logger.warning(f"Failed to write health cache: {e}")
+
+async def _run_health_checks(checks: dict):
+    """Run checks concurrently, skipping any that passed within HEALTH_CACHE_TTL. Raises on failure."""
+    cache = _load_health_cache()
+    now = time.time()
+    pending = {name: check for name, check in checks.items() if now - cache.get(name, 0) > _HEALTH_CACHE_TTL}
+    for name in checks.keys() - pending.keys():
+        logger.info(f"{name} health check skipped (passed {now - cache[name]:.0f}s ago).")
+    await asyncio.gather(*(check() for check in pending.values()))
+    cache.update(dict.fromkeys(pending, now))
+    _save_health_cache(cache)
+
+async def _check_ollama(translator):
+    """Verify at least one Ollama endpoint is reachable. Raises on failure."""
+    results = await translator.check_endpoints()
+    down = [url for url, ok in results.items() if not ok]
+    if len(down) == len(results):
+        raise RuntimeError(f"Ollama not reachable at {', '.join(down)}")
+    if down:
+        logger.warning(f"Ollama endpoints out of rotation: {', '.join(down)}")
+    logger.info(f"Ollama health check passed ({len(results) - len(down)}/{len(results)} endpoints).")
 
 async def _check_telegram(bot: Bot):
     """Verify Telegram bot token is valid. Raises on failure."""
@@ -60,11 +122,37 @@ async def main():
     db = Database()
     await db.init()
 
-    translator = GemmaTranslator()
-    bot = Bot(token=bot_token)
+    translator = _build_translator()
+    bot = Bot(token=bot_token, request=TelegramRequest())
     poster_ru = Poster(bot=bot, channel_id=channel_id_ru)
     poster_en = Poster(bot=bot, channel_id=channel_id_en) if channel_id_en else None
 
+    deduper = None
+    if _SEMANTIC_DEDUP:
+        from bot.semantic import OllamaEmbedder, SemanticDeduper  # needs numpy
+        # share the translator's endpoint pool, so a host that failed a translation is skipped here too
+        deduper = SemanticDeduper(OllamaEmbedder(pool=getattr(translator, "pool", None)))
+        logger.info("Semantic dedup enabled.")
+
+    clusterer = StoryClusterer(db) if _STORY_CLUSTERS else None
+    tagger = Tagger(translator if hasattr(translator, "generate") else None)
+
+    coordinator = None
+    if _MULTI_INSTANCE:
+        from bot.coordination import Coordinator
+        coordinator = Coordinator(db)
+        await coordinator.heartbeat()
+        logger.info(f"Multi-instance mode: worker {coordinator.worker_id}")
+
+    health = None
+    health_port = int(os.environ.get("HEALTH_PORT", DEFAULT_HEALTH_PORT))  # read after load_dotenv
+    if health_port:
+        health = HealthServer(
+            db.path, _HEALTH_MAX_CYCLE_AGE, translator, [poster_ru, poster_en],
+            port=health_port, http=net.shared(),
+        )
+        health.start()
+
     stop_event = asyncio.Event()
 
     def _handle_signal():
@@ -75,27 +163,46 @@ async def main():
     for sig in (signal.SIGTERM, signal.SIGINT):
         loop.add_signal_handler(sig, _handle_signal)
 
-    # Startup health checks
-    await asyncio.gather(_check_ollama(), _check_telegram(bot))
+    profiler = Profiler.from_env()
+    if os.environ.get("PROFILE", "") == "1":
+        profiler.enable()
+    loop.add_signal_handler(signal.SIGUSR1, profiler.toggle)  # kill -USR1 <pid>
+    cycle = profiler.wrap(run_once)
 
-    # Run immediately on startup with timeout
-    try:
-        await asyncio.wait_for(run_once(db, translator, poster_ru, poster_en), timeout=_STARTUP_TIMEOUT)
-    except TimeoutError:
-        logger.error(f"Initial run_once timed out after {_STARTUP_TIMEOUT}s")
-    except Exception as e:
-        logger.error(f"Initial run_once failed: {e}")
+    # Startup health checks
+    checks = {"telegram": lambda: _check_telegram(bot)}
+    if _TRANSLATOR == "gemma":  # with several backends the router's circuit breaker covers Ollama
+        checks["ollama"] = lambda: _check_ollama(translator)
+    await _run_health_checks(checks)
+
+    job_args = [db, translator, poster_ru, poster_en, deduper, clusterer, tagger,
+                coordinator.fetch if coordinator else None, coordinator.leased if coordinator else None]
+    if not _FAST_START:
+        # Run immediately on startup with timeout
+        try:
+            await asyncio.wait_for(cycle(*job_args), timeout=_STARTUP_TIMEOUT)
+        except TimeoutError:
+            logger.error(f"Initial run_once timed out after {_STARTUP_TIMEOUT}s")
+        except Exception as e:
+            logger.error(f"Initial run_once failed: {e}")
 
     scheduler = AsyncIOScheduler()
+    first_run = {}
+    if _FAST_START:
+        # first cycle is an ordinary scheduled job instead of blocking startup
+        first_run["next_run_time"] = datetime.now().astimezone()
     scheduler.add_job(
-        run_once,
+        cycle,
         "interval",
         minutes=_POLL_INTERVAL_MINUTES,
-        args=[db, translator, poster_ru, poster_en],
+        args=job_args,
         max_instances=1,
         misfire_grace_time=_POLL_INTERVAL_MINUTES * 60 // 2,
         coalesce=True,
+        **first_run,
     )
+    if coordinator is not None:
+        scheduler.add_job(coordinator.heartbeat, "interval", seconds=max(coordinator.ttl / 3, 10))
     scheduler.start()
     logger.info(f"Bot started. Polling every {_POLL_INTERVAL_MINUTES} minutes.")
 
@@ -103,9 +210,17 @@ async def main():
 
     logger.info("Shutting down...")
     scheduler.shutdown(wait=True)
+    profiler.disable()
+    if health is not None:
+        health.stop()
+    if coordinator is not None:
+        await coordinator.release()
     await translator.close()
+    if deduper is not None:
+        await deduper.close()
     await db.close()
     await bot.close()
+    await net.close_shared()
 
 if __name__ == "__main__":
     asyncio.run(main())
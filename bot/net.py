@@ -0,0 +1,256 @@
+"""Shared outbound HTTP layer: feeds, Ollama and Telegram all go through one Http.
+
+- one pooled httpx.AsyncClient per host, so a slow feed cannot starve Telegram;
+- DNS answers cached for DNS_CACHE_TTL (a stale answer is used if re-resolving fails);
+- the same default timeouts everywhere (HTTP_CONNECT_TIMEOUT / HTTP_TIMEOUT);
+- retries with backoff: only on errors where the request never reached the server,
+  plus read timeouts for idempotent methods;
+- per-host request, error, byte and latency stats.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import statistics
+import time
+from collections import Counter, deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import httpcore
+import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", "30"))
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", "2"))
+DNS_CACHE_TTL = float(os.environ.get("DNS_CACHE_TTL", "300"))
+
+_MAX_CONNECTIONS_PER_HOST = 10
+_KEEPALIVE_EXPIRY = 30.0
+_LATENCY_WINDOW = 100
+_IDEMPOTENT = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+# the request never reached the server, so even a POST is safe to resend
+_NOT_SENT = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+_IDEMPOTENT_RETRY = (*_NOT_SENT, httpx.ReadTimeout, httpx.RemoteProtocolError)
+
+
+class DnsCache:
+    def __init__(self, ttl: float = DNS_CACHE_TTL):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[tuple[str, int], tuple[float, list[str]]] = {}
+
+    async def resolve(self, host: str, port: int, timeout: float | None = None) -> list[str]:
+        key = (host, port)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry and entry[0] > now:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        try:
+            infos = await asyncio.wait_for(
+                asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM), timeout
+            )
+        except (OSError, TimeoutError) as e:
+            if entry:
+                logger.warning(f"DNS lookup for {host} failed ({e}), using cached answer")
+                return entry[1]
+            raise httpcore.ConnectError(f"DNS lookup for {host} failed: {e}") from e
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._entries[key] = (now + self.ttl, addresses)
+        return addresses
+
+
+class _CachingBackend(httpcore.AsyncNetworkBackend):
+    """httpcore network backend that connects to cached addresses.
+
+    Only the TCP connect uses the IP; TLS still sends the hostname (SNI) and verifies it.
+    """
+
+    def __init__(self, dns: DnsCache):
+        self._dns = dns
+        self._inner = httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        last_error: Exception | None = None
+        for address in await self._dns.resolve(host, port, timeout):
+            try:
+                return await self._inner.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        raise last_error or httpcore.ConnectError(f"No addresses for {host}")
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._inner.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._inner.sleep(seconds)
+
+
+def _transport(dns: DnsCache) -> httpx.AsyncHTTPTransport:
+    limits = httpx.Limits(max_connections=_MAX_CONNECTIONS_PER_HOST, keepalive_expiry=_KEEPALIVE_EXPIRY)
+    transport = httpx.AsyncHTTPTransport(limits=limits)
+    # httpx has no public hook for the network backend; swap in a pool built with ours
+    transport._pool = httpcore.AsyncConnectionPool(
+        ssl_context=httpx.create_ssl_context(),
+        max_connections=limits.max_connections,
+        keepalive_expiry=limits.keepalive_expiry,
+        network_backend=_CachingBackend(dns),
+    )
+    return transport
+
+
+class _HostStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.statuses: Counter[int] = Counter()
+        self.latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    def record(self, response: httpx.Response, seconds: float, body_bytes: int):
+        self.requests += 1
+        self.statuses[response.status_code] += 1
+        self.bytes_in += body_bytes
+        self.bytes_out += int(response.request.headers.get("content-length", 0))
+        self.latencies.append(seconds)
+
+    def as_dict(self) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "statuses": dict(self.statuses),
+            "latency_ms": round(statistics.fmean(latencies) * 1000, 1) if latencies else None,
+            "p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 1) if latencies else None,
+        }
+
+
+def _timeout(timeout: float | httpx.Timeout | None) -> httpx.Timeout:
+    if isinstance(timeout, httpx.Timeout):
+        return timeout
+    total = HTTP_TIMEOUT if timeout is None else timeout
+    return httpx.Timeout(total, connect=min(HTTP_CONNECT_TIMEOUT, total))
+
+
+class Http:
+    def __init__(self, dns_ttl: float = DNS_CACHE_TTL, transport: httpx.AsyncBaseTransport | None = None):
+        self.dns = DnsCache(dns_ttl)
+        self._transport = transport  # tests pass an httpx.MockTransport
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._stats: dict[str, _HostStats] = {}
+
+    def _client(self, host: str) -> httpx.AsyncClient:
+        client = self._clients.get(host)
+        if client is None:
+            client = httpx.AsyncClient(
+                transport=self._transport or _transport(self.dns),
+                timeout=_timeout(None),
+                follow_redirects=True,
+            )
+            self._clients[host] = client
+        return client
+
+    def _host_stats(self, host: str) -> _HostStats:
+        return self._stats.setdefault(host, _HostStats())
+
+    async def _send(self, method: str, url: str, retries: int | None, timeout, stream: bool, **kwargs):
+        host = httpx.URL(url).host
+        client = self._client(host)
+        stats = self._host_stats(host)
+        retryable = _IDEMPOTENT_RETRY if method.upper() in _IDEMPOTENT else _NOT_SENT
+        retries = HTTP_RETRIES if retries is None else retries
+        request = client.build_request(method, url, timeout=_timeout(timeout), **kwargs)
+        for attempt in range(retries + 1):
+            start = time.monotonic()
+            try:
+                return await client.send(request, stream=stream), start, stats
+            except retryable as e:
+                stats.errors += 1
+                if attempt == retries:
+                    raise
+                stats.retries += 1
+                delay = min(0.5 * 2**attempt, 4.0)
+                logger.warning(f"{method} {host} failed ({e!r}), retry {attempt + 1}/{retries} in {delay}s")
+                await asyncio.sleep(delay)
+            except httpx.HTTPError:
+                stats.errors += 1
+                raise
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        timeout: float | httpx.Timeout | None = None,
+        retries: int | None = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """Send a request and read the whole body. ``retries`` defaults to HTTP_RETRIES."""
+        response, start, stats = await self._send(method, url, retries, timeout, stream=False, **kwargs)
+        stats.record(response, time.monotonic() - start, len(response.content))
+        return response
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        *,
+        timeout: float | httpx.Timeout | None = None,
+        retries: int | None = None,
+        **kwargs,
+    ) -> AsyncIterator[httpx.Response]:
+        """Send a request and yield the response once headers arrive; the body is read by the caller."""
+        response, start, stats = await self._send(method, url, retries, timeout, stream=True, **kwargs)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+            stats.record(response, time.monotonic() - start, response.num_bytes_downloaded)
+
+    def stats(self) -> dict:
+        return {
+            "dns": {"hits": self.dns.hits, "misses": self.dns.misses},
+            **{host: s.as_dict() for host, s in list(self._stats.items())},
+        }
+
+    async def aclose(self):
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+_shared: Http | None = None
+
+
+def shared() -> Http:
+    """The process-wide Http instance, created on first use."""
+    global _shared
+    if _shared is None:
+        _shared = Http()
+    return _shared
+
+
+async def close_shared():
+    global _shared
+    if _shared is not None:
+        await _shared.aclose()
+        _shared = None
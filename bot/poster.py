@@ -2,36 +2,180 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from html import escape
 
+import httpx
 from telegram import Bot
-from telegram.error import RetryAfter
+from telegram.error import NetworkError, RetryAfter, TimedOut
+from telegram.request import BaseRequest, RequestData
+
+from bot import net
 
 logger = logging.getLogger(__name__)
 
+_MAX_MESSAGE_LENGTH = 4096  # Telegram limit; checked on the HTML source, which is never shorter
+_DIGEST_SEPARATOR = "\n\n➖➖➖\n\n"
+
+# (summary, [(url, source), ...], tags) for one story in a digest
+DigestItem = tuple[str, list[tuple[str, str]], list[str] | None]
+
+class TelegramRequest(BaseRequest):
+    """python-telegram-bot transport over the shared Http, so Bot API calls get
+    its pooled connections, DNS cache and stats (Bot(token, request=TelegramRequest()))."""
+
+    def __init__(self, http: net.Http | None = None):
+        self._http = http
+
+    @property
+    def read_timeout(self) -> float:
+        return net.HTTP_TIMEOUT
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass  # the shared Http is closed by main
+
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        request_data: RequestData | None = None,
+        read_timeout=BaseRequest.DEFAULT_NONE,
+        write_timeout=BaseRequest.DEFAULT_NONE,
+        connect_timeout=BaseRequest.DEFAULT_NONE,
+        pool_timeout=BaseRequest.DEFAULT_NONE,
+    ) -> tuple[int, bytes]:
+        def pick(value, default):
+            # PTB passes a DefaultValue when the caller gave no timeout; None means no limit
+            return default if isinstance(value, type(BaseRequest.DEFAULT_NONE)) else value
+
+        timeout = httpx.Timeout(
+            connect=pick(connect_timeout, net.HTTP_CONNECT_TIMEOUT),
+            read=pick(read_timeout, net.HTTP_TIMEOUT),
+            write=pick(write_timeout, net.HTTP_TIMEOUT),
+            pool=pick(pool_timeout, net.HTTP_TIMEOUT),
+        )
+        try:
+            response = await (self._http or net.shared()).request(
+                method,
+                url,
+                headers={"User-Agent": self.USER_AGENT},
+                timeout=timeout,
+                files=request_data.multipart_data if request_data else None,
+                data=request_data.json_parameters if request_data else None,
+            )
+        except httpx.TimeoutException as e:
+            raise TimedOut from e
+        except httpx.HTTPError as e:
+            raise NetworkError(f"httpx.{e.__class__.__name__}: {e}") from e
+        return response.status_code, response.content
+
 class Poster:
     def __init__(self, bot: Bot, channel_id: str):
         self._bot = bot
         self._channel_id = channel_id
+        self._last_ok = 0.0
+        self._last_failure = 0.0
+        self._flood_until = 0.0
 
     _MAX_RETRIES = 3
 
-    async def post(self, summary: str, url: str, source: str = "", tags: list[str] | None = None):
+    @property
+    def channel_id(self) -> str:
+        return self._channel_id
+
+    @staticmethod
+    def _render(summary: str, links: list[tuple[str, str]], tags: list[str] | None) -> str:
         tags_line = ("\n" + " ".join(tags)) if tags else ""
-        source_label = escape(source) if source else "Источник"
-        link = f'<a href="{escape(url, quote=True)}">{source_label}</a>'
-        text = f"{escape(summary)}{tags_line}\n\n{link}"
+        link_line = " · ".join(
+            f'<a href="{escape(url, quote=True)}">{escape(source) if source else "Источник"}</a>'
+            for url, source in links
+        )
+        return f"{escape(summary)}{tags_line}\n\n{link_line}"
+
+    async def post(
+        self,
+        summary: str,
+        url: str,
+        source: str = "",
+        tags: list[str] | None = None,
+        extra_links: list[tuple[str, str]] | None = None,
+    ) -> int | None:
+        """Send a post and return its Telegram message id."""
+        text = self._render(summary, [(url, source), *(extra_links or [])], tags)
+        message = await self._call(
+            self._bot.send_message,
+            chat_id=self._channel_id,
+            text=text,
+            parse_mode="HTML",
+            disable_web_page_preview=True,
+        )
+        return getattr(message, "message_id", None)
+
+    async def post_digest(self, items: list[DigestItem], delay: float = 0) -> list[int | None]:
+        """Send several stories merged into as few messages as fit the length limit.
+
+        Returns the message id of each message sent, waiting ``delay`` seconds between them.
+        """
+        messages: list[str] = []
+        for summary, links, tags in items:
+            block = self._render(summary, links, tags)
+            if messages and len(messages[-1]) + len(_DIGEST_SEPARATOR) + len(block) <= _MAX_MESSAGE_LENGTH:
+                messages[-1] += _DIGEST_SEPARATOR + block
+            else:
+                messages.append(block)
+        message_ids = []
+        for i, text in enumerate(messages):
+            if i:
+                await asyncio.sleep(delay)
+            message = await self._call(
+                self._bot.send_message,
+                chat_id=self._channel_id,
+                text=text,
+                parse_mode="HTML",
+                disable_web_page_preview=True,
+            )
+            message_ids.append(getattr(message, "message_id", None))
+        return message_ids
+
+    async def edit(
+        self, message_id: int, summary: str, links: list[tuple[str, str]], tags: list[str] | None = None
+    ):
+        """Rewrite an existing post, e.g. to append sources of the same story."""
+        await self._call(
+            self._bot.edit_message_text,
+            chat_id=self._channel_id,
+            message_id=message_id,
+            text=self._render(summary, links, tags),
+            parse_mode="HTML",
+            disable_web_page_preview=True,
+        )
+
+    def stats(self) -> dict:
+        """Telegram circuit state: open while flood-limited or when the last call failed."""
+        now = time.time()
+        flood_wait = max(0.0, self._flood_until - now)
+        return {
+            "circuit": "open" if flood_wait or self._last_failure > self._last_ok else "closed",
+            "flood_wait": round(flood_wait, 1),
+            "since_last_ok": round(now - self._last_ok, 1) if self._last_ok else None,
+        }
+
+    async def _call(self, method, **kwargs):
         for attempt in range(1, self._MAX_RETRIES + 1):
             try:
-                await self._bot.send_message(
-                    chat_id=self._channel_id,
-                    text=text,
-                    parse_mode="HTML",
-                    disable_web_page_preview=True,
-                )
-                return
+                result = await method(**kwargs)
+                self._last_ok = time.time()
+                return result
             except RetryAfter as e:
+                self._flood_until = time.time() + e.retry_after
                 if attempt == self._MAX_RETRIES:
+                    self._last_failure = time.time()
                     raise
                 logger.warning(f"Telegram 429, retry {attempt}/{self._MAX_RETRIES} after {e.retry_after}s")
                 await asyncio.sleep(e.retry_after)
+            except Exception:
+                self._last_failure = time.time()
+                raise
@@ -0,0 +1,206 @@
+"""Runtime profiling, switched on with PROFILE=1 or toggled with SIGUSR1 (no restart).
+
+While enabled:
+  * a loop-lag monitor measures how late the event loop wakes up;
+  * asyncio debug mode reports callbacks/coroutine steps slower than SLOW_CALLBACK
+    to data/profile/slow_callbacks.log;
+  * each run_once cycle is sampled by a background thread and written as
+    collapsed stacks (data/profile/cycle-<time>.folded), the format read by
+    flamegraph.pl, speedscope and inferno;
+  * tracemalloc snapshots are diffed between cycles (data/profile/tracemalloc-<time>.txt).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = "data/profile"
+PROFILE_INTERVAL = 0.005
+SLOW_CALLBACK = 0.1
+
+_LAG_INTERVAL = 0.5
+_TRACEMALLOC_FRAMES = 10
+_TRACEMALLOC_TOP = 25
+
+
+class StackSampler:
+    """Samples every thread's Python stack at a fixed interval into collapsed-stack counts."""
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        self.samples.clear()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self.samples
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                self.samples[_fold(names.get(ident, str(ident)), frame)] += 1
+
+    def write(self, path: str):
+        """Write one 'root;caller;callee count' line per distinct stack."""
+        with open(path, "w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _fold(thread_name: str, frame) -> str:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    stack.append(thread_name)
+    return ";".join(reversed(stack))
+
+
+class Profiler:
+    def __init__(
+        self,
+        out_dir: str = PROFILE_DIR,
+        interval: float = PROFILE_INTERVAL,
+        slow_callback: float = SLOW_CALLBACK,
+    ):
+        self.out_dir = out_dir
+        self.enabled = False
+        self.max_lag = 0.0
+        self._sampler = StackSampler(interval)
+        self._slow_callback = slow_callback
+        self._lag_task: asyncio.Task | None = None
+        self._slow_log: logging.Handler | None = None
+        self._snapshot: tracemalloc.Snapshot | None = None
+
+    @classmethod
+    def from_env(cls) -> Profiler:
+        """Settings from PROFILE_DIR, PROFILE_INTERVAL and SLOW_CALLBACK, read at call time
+        so that values from .env (loaded in main) apply."""
+        return cls(
+            out_dir=os.environ.get("PROFILE_DIR", PROFILE_DIR),
+            interval=float(os.environ.get("PROFILE_INTERVAL", PROFILE_INTERVAL)),
+            slow_callback=float(os.environ.get("SLOW_CALLBACK", SLOW_CALLBACK)),
+        )
+
+    def enable(self):
+        if self.enabled:
+            return
+        os.makedirs(self.out_dir, exist_ok=True)
+        loop = asyncio.get_running_loop()
+        loop.set_debug(True)
+        loop.slow_callback_duration = self._slow_callback
+        # asyncio logs "Executing <Task ...> took 0.3 seconds" for each slow step
+        self._slow_log = logging.FileHandler(os.path.join(self.out_dir, "slow_callbacks.log"))
+        self._slow_log.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logging.getLogger("asyncio").addHandler(self._slow_log)
+        self._lag_task = loop.create_task(self._monitor_lag())
+        tracemalloc.start(_TRACEMALLOC_FRAMES)
+        self._snapshot = None
+        self.enabled = True
+        logger.info(f"Profiling enabled, writing to {self.out_dir}")
+
+    def disable(self):
+        if not self.enabled:
+            return
+        asyncio.get_running_loop().set_debug(False)
+        logging.getLogger("asyncio").removeHandler(self._slow_log)
+        self._slow_log.close()
+        self._lag_task.cancel()
+        tracemalloc.stop()
+        self._snapshot = None
+        self.enabled = False
+        logger.info("Profiling disabled.")
+
+    def toggle(self):
+        self.disable() if self.enabled else self.enable()
+
+    async def _monitor_lag(self):
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(_LAG_INTERVAL)
+            lag = time.monotonic() - start - _LAG_INTERVAL
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self._slow_callback:
+                logger.warning(f"Event loop lag {lag * 1000:.0f}ms")
+
+    @asynccontextmanager
+    async def cycle(self):
+        """Sample the wrapped cycle and diff memory against the previous one, if enabled."""
+        if not self.enabled:
+            yield
+            return
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self.max_lag = 0.0
+        start = time.monotonic()
+        self._sampler.start()
+        try:
+            yield
+        finally:
+            samples = self._sampler.stop()
+            elapsed = time.monotonic() - start
+            try:
+                folded = os.path.join(self.out_dir, f"cycle-{stamp}.folded")
+                self._sampler.write(folded)
+                self._diff_memory(os.path.join(self.out_dir, f"tracemalloc-{stamp}.txt"))
+                logger.info(
+                    f"Cycle profile: {elapsed:.1f}s, max loop lag {self.max_lag * 1000:.0f}ms, "
+                    f"{sum(samples.values())} samples -> {folded}"
+                )
+            except OSError as e:
+                logger.warning(f"Failed to write profile: {e}")
+
+    def _diff_memory(self, path: str):
+        if not tracemalloc.is_tracing():
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+        previous, self._snapshot = self._snapshot, snapshot
+        current, peak = tracemalloc.get_traced_memory()
+        with open(path, "w") as f:
+            f.write(f"traced: current={current / 2**20:.1f}MiB peak={peak / 2**20:.1f}MiB\n")
+            if previous is None:
+                f.write("first cycle since profiling was enabled; top allocations:\n")
+                for stat in snapshot.statistics("lineno")[:_TRACEMALLOC_TOP]:
+                    f.write(f"{stat}\n")
+                return
+            f.write("growth since previous cycle:\n")
+            for stat in snapshot.compare_to(previous, "lineno")[:_TRACEMALLOC_TOP]:
+                f.write(f"{stat}\n")
+
+    def wrap(self, func: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+        """Return ``func`` wrapped so each call is profiled as one cycle."""
+        @wraps(func)
+        async def profiled(*args, **kwargs):
+            async with self.cycle():
+                return await func(*args, **kwargs)
+        return profiled
@@ -0,0 +1,200 @@
+"""Replay stored feed archives through the run_once pipeline.
+
+    python -m bot.replay <dir-or-file> [--db data/replay.db] [--translator stub]
+
+Accepts JSONL files (one article object per line: title, url, source and
+optionally published_at, guid, description), saved RSS/Atom files, or a
+directory of them. Nothing is sent to Telegram: posts go to a dry-run poster.
+Use it to seed dedup state on a fresh node (--db data/seen.db), to try a new
+threshold offline, or to measure pipeline throughput.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import feedparser
+
+from bot import scheduler
+from bot.db import Database
+from bot.feeds import Article, articles_from_feed
+from bot.tagger import Tagger
+
+logger = logging.getLogger(__name__)
+
+_BATCH_SIZE = 500
+_FEED_SUFFIXES = {".xml", ".rss", ".atom"}
+
+
+class DryRunPoster:
+    """Poster stand-in that records posts instead of sending them."""
+
+    def __init__(self, channel_id: str = "dry-run", verbose: bool = False):
+        self.channel_id = channel_id
+        self.posts = 0
+        self.edits = 0
+        self._verbose = verbose
+
+    async def post(self, summary: str, url: str, source: str = "", tags=None, extra_links=None) -> int:
+        self.posts += 1
+        if self._verbose:
+            logger.info(f"[dry-run] {source}: {summary} {' '.join(tags or [])} {url}")
+        return self.posts
+
+    async def post_digest(self, items, delay: float = 0) -> list[int]:
+        for summary, links, tags in items:
+            await self.post(summary, *links[0], tags=tags, extra_links=links[1:])
+        return [self.posts]
+
+    async def edit(self, message_id: int, summary: str, links, tags=None):
+        self.edits += 1
+
+
+def _read_jsonl(path: Path) -> list[Article]:
+    articles = []
+    with path.open(encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+                articles.append(Article(
+                    title=item["title"],
+                    url=item["url"],
+                    source=item.get("source", path.stem),
+                    published_at=float(item.get("published_at", 0.0)),
+                    guid=item.get("guid", ""),
+                    description=item.get("description", ""),
+                ))
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Skipping {path}:{line_no}: {e}")
+    return articles
+
+
+def _read_feed(path: Path) -> list[Article]:
+    feed = feedparser.parse(path.read_bytes())
+    return articles_from_feed(feed, feed.feed.get("title", path.stem))
+
+
+def _archive_files(root: Path) -> list[Path]:
+    if root.is_file():
+        return [root]
+    return sorted(
+        p for p in root.rglob("*") if p.is_file() and (p.suffix in _FEED_SUFFIXES or p.suffix == ".jsonl")
+    )
+
+
+async def read_archive(root: Path) -> AsyncIterator[Article]:
+    """Yield archived articles file by file; each file is parsed in a worker thread."""
+    for path in _archive_files(root):
+        reader = _read_jsonl if path.suffix == ".jsonl" else _read_feed
+        try:
+            articles = await asyncio.to_thread(reader, path)
+        except Exception as e:
+            logger.error(f"Failed to read {path}: {e}")
+            continue
+        for article in articles:
+            yield article
+
+
+async def _batches(source: AsyncIterator[Article], size: int) -> AsyncIterator[list[Article]]:
+    batch: list[Article] = []
+    async for article in source:
+        batch.append(article)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# Offline run: no wall-clock budget, no admission limits, no pause between (dry-run) posts
+_OFFLINE_SETTINGS = {
+    "_CYCLE_BUDGET": float("inf"),
+    "_MAX_PER_CYCLE": 0,
+    "_MAX_PER_SOURCE": 0,
+    "_MAX_ARTICLE_AGE": 0.0,
+    "_POST_DELAY": 0,
+}
+
+
+@contextmanager
+def _offline(db: Database) -> Iterator[list[float]]:
+    """Apply _OFFLINE_SETTINGS and date seen rows by archive time; restore both on exit.
+
+    Yields a one-item list holding the latest published_at replayed so far, which
+    is the database clock, so the 24h dedup windows slide along the archive.
+    """
+    saved = {name: getattr(scheduler, name) for name in _OFFLINE_SETTINGS}
+    saved_clock, saved_archive_time = db.clock, db.archive_time
+    latest = [0.0]
+    for name, value in _OFFLINE_SETTINGS.items():
+        setattr(scheduler, name, value)
+    db.clock = lambda: latest[0] or time.time()
+    db.archive_time = True
+    try:
+        yield latest
+    finally:
+        for name, value in saved.items():
+            setattr(scheduler, name, value)
+        db.clock, db.archive_time = saved_clock, saved_archive_time
+
+
+async def replay(root: Path, db: Database, translator, poster, batch_size: int = _BATCH_SIZE) -> dict:
+    """Run every archived article through run_once, one batch per cycle, committing per batch."""
+    tagger = Tagger(translator if hasattr(translator, "generate") else None)
+
+    read = 0
+    start = time.perf_counter()
+    with _offline(db) as latest:
+        async for batch in _batches(read_archive(root), batch_size):
+            read += len(batch)
+            batch.sort(key=lambda a: a.published_at)
+            latest[0] = max(latest[0], batch[-1].published_at)
+
+            async def fetch(batch=batch):
+                for article in batch:
+                    yield article
+
+            async with db.batch():
+                # scoped to no sources, so the live pending/backlog queues are never read or written
+                await scheduler.run_once(db, translator, poster, tagger=tagger, fetch=fetch, sources=list)
+            elapsed = time.perf_counter() - start
+            logger.info(f"Replayed {read} articles, {poster.posts} posts, {read / elapsed:.1f} articles/s")
+
+    elapsed = time.perf_counter() - start
+    return {
+        "articles": read,
+        "posts": poster.posts,
+        "seconds": round(elapsed, 2),
+        "articles_per_second": round(read / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+async def _main(args: argparse.Namespace):
+    from bot.main import _build_backend, _build_translator
+
+    db = Database(args.db)
+    await db.init()
+    translator = _build_backend(args.translator) if args.translator else _build_translator()
+    poster = DryRunPoster(verbose=args.verbose)
+    try:
+        stats = await replay(Path(args.path), db, translator, poster, batch_size=args.batch_size)
+    finally:
+        await translator.close()
+        await db.close()
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay feed archives through the bot pipeline.")
+    parser.add_argument("path", help="JSONL/RSS file or a directory of them")
+    parser.add_argument("--db", default="data/replay.db", help="SQLite file to write dedup state to")
+    parser.add_argument("--translator", help="translator backend (default: TRANSLATOR env)")
+    parser.add_argument("--batch-size", type=int, default=_BATCH_SIZE)
+    parser.add_argument("--verbose", action="store_true", help="log every dry-run post")
+    asyncio.run(_main(parser.parse_args()))
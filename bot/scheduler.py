@@ -1,48 +1,149 @@
+from __future__ import annotations
+
 import asyncio
 import logging
+import math
 import os
+import time
+from collections import Counter, deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import TYPE_CHECKING
 
+from rapidfuzz import process
 from rapidfuzz.fuzz import token_sort_ratio
 
 from bot.db import Database
-from bot.feeds import fetch_all
+from bot.feeds import Article, fetch_all
+from bot.health import status
 from bot.poster import Poster
 from bot.summarizer import summarize
-from bot.tagger import get_tags
+from bot.tagger import Tagger
 from bot.translator.base import Translator
 
+if TYPE_CHECKING:
+    from bot.clusters import StoryClusterer
+    from bot.semantic import SemanticDeduper
+
 logger = logging.getLogger(__name__)
 
 _SIMILARITY_THRESHOLD = 80
+_SOURCE_SIMILARITY_THRESHOLD = 90
 _prune_fail_count = 0
 _PRUNE_FAIL_LIMIT = 10
 _POST_DELAY = float(os.environ.get("POST_DELAY", "3"))
+# Also translate the entry's lead and post it under the title (one extra translation per post)
+_POST_DESCRIPTION = os.environ.get("POST_DESCRIPTION", "") == "1"
+_SEEN_CHUNK = 100
+# Wall-clock budget for one cycle; should stay below POLL_INTERVAL_MINUTES
+_CYCLE_BUDGET = float(os.environ.get("CYCLE_BUDGET", "240"))
+# Rough cost of posting one article, reserved out of the budget before translating another
+_POST_COST_ESTIMATE = _POST_DELAY + 1.0
+# At this many articles to post in one cycle, merge them into digest messages (0 disables)
+_DIGEST_THRESHOLD = int(os.environ.get("DIGEST_THRESHOLD", "10"))
+# Stories per digest message, conservatively: blocks run up to ~700 of 4096 characters
+_DIGEST_STORIES_PER_MESSAGE = 4
+# Admission control (0 disables each limit): articles over the per-cycle or per-source cap
+# spill to the low-priority backlog, drained by later cycles with spare capacity
+_MAX_PER_CYCLE = int(os.environ.get("MAX_PER_CYCLE", "50"))
+_MAX_PER_SOURCE = int(os.environ.get("MAX_PER_SOURCE", "15"))
+_MAX_BACKLOG = int(os.environ.get("MAX_BACKLOG", "500"))
+# Articles published more than this many hours ago are dropped without posting
+_MAX_ARTICLE_AGE = float(os.environ.get("MAX_ARTICLE_AGE", "12"))
 
 
-async def run_once(db: Database, translator: Translator, poster_ru: Poster, poster_en: "Poster | None" = None):
-    global _prune_fail_count
-    # Prune old entries periodically
+async def _load_queue(
+    load: Callable[..., Awaitable[list]], queue: str, sources: list[str] | None
+) -> list[Article]:
     try:
-        await db.prune()
-        _prune_fail_count = 0
+        rows = await load(sources)
     except Exception as e:
-        _prune_fail_count += 1
-        if _prune_fail_count >= _PRUNE_FAIL_LIMIT:
-            logger.error(f"DB prune failed {_prune_fail_count} times consecutively: {e}")
-            raise
-        logger.warning(f"DB prune failed ({_prune_fail_count}/{_PRUNE_FAIL_LIMIT}): {e}")
+        logger.warning(f"Failed to load {queue} queue: {e}")
+        return []
+    return [
+        Article(title=t, url=u, source=s, published_at=p, guid=g, description=d)
+        for t, u, s, p, g, d in rows
+    ]
+
 
-    # Phase 1: Fetch all articles from all sources concurrently
+async def _save_queue(
+    save: Callable[..., Awaitable[None]], queue: str, articles: list[Article], sources: list[str] | None
+):
     try:
-        articles = await fetch_all()
+        await save(
+            [(a.title, a.url, a.source, a.published_at, a.guid, a.description) for a in articles],
+            sources,
+        )
     except Exception as e:
-        logger.error(f"Feed fetch failed entirely: {e}")
-        return
-    logger.info(f"Fetched {len(articles)} articles.")
+        logger.warning(f"Failed to save {queue} queue ({len(articles)} articles): {e}")
+
+
+def _admit(
+    fresh: list[Article], backlog: list[Article], now: float
+) -> tuple[list[Article], list[Article], list[Article]]:
+    """Split this cycle's candidates into (admitted, deferred, shed).
 
-    # Phase 2: Filter already-seen URLs in parallel
+    Fresh and carried articles are considered first, then the backlog, each newest
+    first; an article is admitted while both the cycle and its source are under their
+    caps and deferred otherwise. Articles older than _MAX_ARTICLE_AGE, and the oldest
+    deferred ones beyond _MAX_BACKLOG, are shed. An unknown (0) publish time never expires.
+    """
+    cutoff = now - _MAX_ARTICLE_AGE * 3600 if _MAX_ARTICLE_AGE else 0.0
+    admitted: list[Article] = []
+    deferred: list[Article] = []
+    shed: list[Article] = []
+    per_source: Counter[str] = Counter()
+    for article in [*fresh, *backlog]:
+        if 0 < article.published_at < cutoff:
+            shed.append(article)
+        elif (_MAX_PER_CYCLE and len(admitted) >= _MAX_PER_CYCLE) or (
+            _MAX_PER_SOURCE and per_source[article.source] >= _MAX_PER_SOURCE
+        ):
+            deferred.append(article)
+        else:
+            per_source[article.source] += 1
+            admitted.append(article)
+    if _MAX_BACKLOG and len(deferred) > _MAX_BACKLOG:
+        deferred.sort(key=lambda a: a.published_at, reverse=True)
+        shed.extend(deferred[_MAX_BACKLOG:])
+        del deferred[_MAX_BACKLOG:]
+    return admitted, deferred, shed
+
+
+def _posting_cost(accepted: int, candidates: int) -> float:
+    """Budget to reserve for posting ``accepted`` articles. A cycle with DIGEST_THRESHOLD or
+    more candidates is expected to post digests, so it reserves per message, not per article."""
+    if 0 < _DIGEST_THRESHOLD <= candidates:
+        return math.ceil(accepted / _DIGEST_STORIES_PER_MESSAGE) * _POST_COST_ESTIMATE
+    return accepted * _POST_COST_ESTIMATE
+
+
+def _translate_window(translator: Translator) -> int:
+    """Titles to translate ahead: the translator's concurrency (1 for duck-typed ones)."""
+    concurrency = getattr(translator, "concurrency", 1)
+    return concurrency if isinstance(concurrency, int) and concurrency > 0 else 1
+
+
+async def _mark_seen(db: Database, article: Article, translated: str = ""):
+    await db.mark_seen(
+        article.url, title=translated, source_title=article.title,
+        guid=article.guid, published_at=article.published_at, source=article.source,
+    )
+
+
+async def _translate_description(translator: Translator, article: Article, target_lang: str) -> str:
+    if not _POST_DESCRIPTION or not article.description:
+        return ""
+    try:
+        return await translator.translate(article.description, source_lang="HU", target_lang=target_lang)
+    except Exception as e:
+        logger.warning(f"Description translation failed for {article.url}: {e}")
+        return ""
+
+
+async def _filter_unseen(db: Database, articles: list[Article]) -> list[Article]:
+    """Check a chunk of URLs/GUIDs against the DB in parallel."""
     seen_results = await asyncio.gather(
-        *[db.is_seen(a.url) for a in articles], return_exceptions=True
+        *[db.is_seen(a.url, a.guid, a.source) for a in articles], return_exceptions=True
     )
     new_articles = []
     for article, result in zip(articles, seen_results):
@@ -51,24 +152,329 @@ async def run_once(db: Database, translator: Translator, poster_ru: Poster, post
             new_articles.append(article)  # assume unseen on error
         elif not result:
             new_articles.append(article)
+    return new_articles
+
+
+async def _shed(db: Database, articles: list[Article]):
+    """Mark shed articles seen, so the feeds still listing them do not re-admit them."""
+    for article in articles:
+        try:
+            await _mark_seen(db, article)
+        except Exception as e:
+            logger.warning(f"Failed to mark shed article seen {article.url}: {e}")
+    logger.warning(f"Load shedding: dropped {len(articles)} stale or overflow articles unposted.")
+
+
+async def _dedup_source_titles(
+    db: Database, articles: list[Article]
+) -> tuple[list[Article], list[tuple[Article, str]]]:
+    """Split articles whose untranslated title matches a recent or in-batch source title.
+
+    Returns the unique articles and (duplicate, matched source title) pairs; the
+    caller marks duplicates seen or attaches them to the matched story's cluster.
+    """
+    try:
+        # one window query per cycle; every article is matched against it in memory
+        known = await db.recent_source_titles()
+    except Exception as e:
+        logger.warning(f"Failed to load recent source titles: {e}")
+        known = []
+    unique: list[Article] = []
+    duplicates: list[tuple[Article, str]] = []
+    for article in articles:
+        match = process.extractOne(
+            article.title, known, scorer=token_sort_ratio, score_cutoff=_SOURCE_SIMILARITY_THRESHOLD
+        )
+        if match is not None:
+            duplicates.append((article, match[0]))
+            continue
+        known.append(article.title)
+        unique.append(article)
+    if duplicates:
+        skipped = len(duplicates)
+        logger.info(f"Pre-translation dedup skipped {skipped} articles, saved {skipped} translation calls.")
+    return unique, duplicates
+
+
+async def _settle_source_dupes(
+    db: Database,
+    clusterer: StoryClusterer | None,
+    duplicates: list[tuple[Article, str]],
+    pending_links: dict[int, list[tuple[str, str]]],
+    posters: dict[str, Poster],
+):
+    """Mark source-title duplicates seen, joining the matched story's cluster when there is one."""
+    for article, matched in duplicates:
+        try:
+            await _mark_seen(db, article)
+        except Exception as e:
+            logger.warning(f"Failed to mark source dupe seen {article.url}: {e}")
+        cluster_id = clusterer.match_source(matched) if clusterer is not None else None
+        if cluster_id is None:
+            logger.info(f"Skipped (source-title duplicate): {article.url}")
+            continue
+        try:
+            await _join_cluster(clusterer, cluster_id, article, pending_links, posters)
+        except Exception as e:
+            logger.warning(f"Failed to join cluster {cluster_id} for {article.url}: {e}")
+        logger.info(f"Joined story cluster {cluster_id} (source-title duplicate): {article.url}")
+
+
+async def _join_cluster(
+    clusterer: StoryClusterer,
+    cluster_id: int,
+    article: Article,
+    pending_links: dict[int, list[tuple[str, str]]],
+    posters: dict[str, Poster],
+):
+    """Attach an article to an existing story: extend a pending post or edit the published one."""
+    if cluster_id in pending_links:
+        await clusterer.attach(cluster_id, article.url, article.source, article.title)
+        pending_links[cluster_id].append((article.url, article.source))
+        return
+    links = await clusterer.attach(cluster_id, article.url, article.source, article.title)
+    for channel_id, message_id, summary, tags in await clusterer.messages(cluster_id):
+        poster = posters.get(channel_id)
+        if poster is None:
+            continue
+        try:
+            await poster.edit(message_id, summary, links, tags)
+        except Exception as e:
+            logger.warning(f"Failed to edit cluster {cluster_id} message in {channel_id}: {e}")
+
+
+async def _remember_message(
+    clusterer: StoryClusterer | None,
+    cluster_id: int | None,
+    poster: Poster,
+    message_id,
+    summary: str,
+    tags: list[str],
+):
+    if clusterer is None or cluster_id is None or message_id is None:
+        return
+    try:
+        await clusterer.set_message(cluster_id, poster.channel_id, message_id, summary, tags)
+    except Exception as e:
+        logger.warning(f"Failed to store message id for cluster {cluster_id}: {e}")
+
+
+async def _post_digest(
+    db: Database,
+    translator: Translator,
+    poster_ru: Poster,
+    poster_en: Poster | None,
+    to_post: list[tuple],
+    tags_per_post: list[list[str]],
+    pending_links: dict[int, list[tuple[str, str]]],
+):
+    """Claim a backlog of articles and post them as a few merged messages per channel.
+
+    Digest messages are not linked to story clusters: editing one would replace
+    every story in it, so later sources of these stories are only recorded.
+    """
+    claimed: list[tuple[Article, str, list[str], list[tuple[str, str]]]] = []
+    for (article, translated, cluster_id), tags in zip(to_post, tags_per_post):
+        try:
+            if not await db.claim(
+                article.url, title=translated, source_title=article.title,
+                guid=article.guid, published_at=article.published_at, source=article.source,
+            ):
+                logger.info(f"Skipped (already claimed): {article.url}")
+                continue
+        except Exception as e:
+            logger.error(f"Failed to mark seen before post {article.url}: {e}")
+            continue
+        links = [(article.url, article.source), *pending_links.get(cluster_id, [])]
+        claimed.append((article, translated, tags, links))
+    if not claimed:
+        return
+
+    items = [
+        (summarize(translated, await _translate_description(translator, article, "RU")), links, tags)
+        for article, translated, tags, links in claimed
+    ]
+    try:
+        message_ids = await poster_ru.post_digest(items, delay=_POST_DELAY)
+        logger.info(f"Posted digest of {len(items)} articles in {len(message_ids)} messages.")
+    except Exception as e:
+        logger.error(f"Failed to post digest of {len(items)} articles: {e}")
+
+    if poster_en is not None:
+        items_en = []
+        for article, _, tags, links in claimed:
+            try:
+                translated_en = await translator.translate(article.title, source_lang="HU", target_lang="EN")
+            except Exception as e:
+                logger.error(f"Failed to translate EN for {article.url}: {e}")
+                continue
+            summary_en = summarize(translated_en, await _translate_description(translator, article, "EN"))
+            items_en.append((summary_en, links, tags))
+        try:
+            if items_en:
+                await poster_en.post_digest(items_en, delay=_POST_DELAY)
+        except Exception as e:
+            logger.error(f"Failed to post EN digest of {len(items_en)} articles: {e}")
+
+
+async def run_once(
+    db: Database,
+    translator: Translator,
+    poster_ru: Poster,
+    poster_en: Poster | None = None,
+    deduper: SemanticDeduper | None = None,
+    clusterer: StoryClusterer | None = None,
+    tagger: Tagger | None = None,
+    fetch: Callable[[], AsyncIterator[Article]] | None = None,
+    sources: Callable[[], list[str]] | None = None,
+):
+    """One fetch → dedup → translate → post cycle; its outcome is reported to the health server.
+
+    ``sources`` returns the sources this replica leases (MULTI_INSTANCE); the pending and
+    backlog queues are then read and rewritten for those sources only.
+    """
+    status.cycle_started()
+    try:
+        ok = await _run_cycle(
+            db, translator, poster_ru, poster_en, deduper, clusterer, tagger, fetch, sources
+        )
+    except BaseException as e:
+        status.cycle_failed(repr(e))
+        raise
+    if ok:
+        status.cycle_succeeded()
+
+
+async def _run_cycle(
+    db: Database,
+    translator: Translator,
+    poster_ru: Poster,
+    poster_en: Poster | None,
+    deduper: SemanticDeduper | None,
+    clusterer: StoryClusterer | None,
+    tagger: Tagger | None,
+    fetch: Callable[[], AsyncIterator[Article]] | None,
+    sources: Callable[[], list[str]] | None,
+) -> bool:
+    global _prune_fail_count
+    # Prune old entries periodically
+    try:
+        await db.prune()
+        _prune_fail_count = 0
+    except Exception as e:
+        _prune_fail_count += 1
+        if _prune_fail_count >= _PRUNE_FAIL_LIMIT:
+            logger.error(f"DB prune failed {_prune_fail_count} times consecutively: {e}")
+            raise
+        logger.warning(f"DB prune failed ({_prune_fail_count}/{_PRUNE_FAIL_LIMIT}): {e}")
+
+    deadline = asyncio.get_running_loop().time() + _CYCLE_BUDGET
+
+    # Phase 1+2: Stream articles as sources complete and drop already-seen URLs chunk by chunk,
+    # so only new articles are kept in memory. Work carried over from the last cycle goes first.
+    fetched = 0
+    new_articles: list[Article] = []
+    # the queue scope is fixed for the cycle, so only the rows loaded here are rewritten
+    scope = sources() if sources is not None else None
+    chunk = await _load_queue(db.pending_articles, "pending", scope)
+    backlog = await _load_queue(db.backlog_articles, "backlog", scope)
+    urls = {a.url for a in chunk} | {a.url for a in backlog}
+    try:
+        async for article in (fetch or fetch_all)():
+            fetched += 1
+            if article.url in urls:
+                continue
+            urls.add(article.url)
+            chunk.append(article)
+            if len(chunk) >= _SEEN_CHUNK:
+                new_articles.extend(await _filter_unseen(db, chunk))
+                chunk = []
+        new_articles.extend(await _filter_unseen(db, chunk))
+        backlog = await _filter_unseen(db, backlog)
+    except Exception as e:
+        logger.error(f"Feed fetch failed entirely: {e}")
+        status.cycle_failed(f"feed fetch failed: {e}")
+        return False
+    logger.info(f"Fetched {fetched} articles.")
     logger.info(f"{len(new_articles)} new articles after URL filter.")
+    status.stage("fetched", fetched)
+    status.stage("new", len(new_articles))
+
+    # Newest first, so a backlog never delays fresh news
+    new_articles.sort(key=lambda a: a.published_at, reverse=True)
+
+    # Phase 2a: Admission control, so catching up after an outage cannot flood the backends
+    backlog_urls = {a.url for a in backlog}
+    new_articles, deferred, shed = _admit(new_articles, backlog, time.time())
+    if shed:
+        await _shed(db, shed)
+    await _save_queue(db.replace_backlog, "backlog", deferred, scope)
+    newly_deferred = sum(a.url not in backlog_urls for a in deferred)
+    if newly_deferred:
+        logger.warning(f"Admission limits: deferred {newly_deferred} articles, backlog is {len(deferred)}.")
+    status.stage("admitted", len(new_articles))
+    status.stage("shed", len(shed))
+    status.stage("backlog", len(deferred))
+    status.count("shed", len(shed))
+    status.count("deferred", newly_deferred)
+
+    pending_links: dict[int, list[tuple[str, str]]] = {}
+    posters = {p.channel_id: p for p in (poster_ru, poster_en) if p is not None}
+    if clusterer is not None and new_articles:
+        try:
+            await clusterer.load()
+        except Exception as e:
+            logger.warning(f"Failed to load story clusters: {e}")
 
+    # Phase 2b: Drop duplicates on the original title before paying for translation;
+    # they are settled after Phase 3, once the stories they copy have their clusters
+    source_dupes: list[tuple[Article, str]] = []
+    if new_articles:
+        new_articles, source_dupes = await _dedup_source_titles(db, new_articles)
+    status.stage("to_translate", len(new_articles))
     if not new_articles:
-        return
+        await _settle_source_dupes(db, clusterer, source_dupes, pending_links, posters)
+        await _save_queue(db.replace_pending, "pending", [], scope)
+        return True
 
     # Phase 3: Translate and build deduplicated post list
     to_post: list[tuple] = []
     accepted_titles: list[str] = []
 
-    for article in new_articles:
+    carried: list[Article] = []
+    loop = asyncio.get_running_loop()
+    # Translate up to `window` titles ahead, so every Ollama host is busy; results are
+    # still taken in order, so dedup sees articles exactly as in a sequential run.
+    window = _translate_window(translator)
+    ahead: deque[asyncio.Task] = deque()
+    for i, article in enumerate(new_articles):
+        # Stop translating once the remaining budget only covers posting what is already accepted
+        if loop.time() + _posting_cost(len(to_post), len(new_articles)) >= deadline:
+            carried = new_articles[i:]
+            logger.warning(f"Cycle budget exhausted, carrying {len(carried)} articles to the next cycle.")
+            break
+        while len(ahead) < window and i + len(ahead) < len(new_articles):
+            ahead.append(asyncio.ensure_future(translator.translate(new_articles[i + len(ahead)].title)))
         try:
-            translated = await translator.translate(article.title)
+            translated = await ahead.popleft()
+
+            # Join an existing story cluster instead of dropping the article
+            if clusterer is not None:
+                cluster_id = clusterer.match(translated)
+                if cluster_id is not None:
+                    try:
+                        await _mark_seen(db, article, translated)
+                        await _join_cluster(clusterer, cluster_id, article, pending_links, posters)
+                    except Exception as e:
+                        logger.warning(f"Failed to join cluster {cluster_id} for {article.url}: {e}")
+                    logger.info(f"Joined story cluster {cluster_id}: {article.url}")
+                    continue
 
             # Deduplicate against DB (last 24h)
             try:
                 if await db.find_similar(translated):
                     try:
-                        await db.mark_seen(article.url, title=translated)
+                        await _mark_seen(db, article, translated)
                     except Exception as e:
                         logger.warning(f"Failed to mark dupe seen {article.url}: {e}")
                     logger.info(f"Skipped (DB duplicate): {article.url}")
@@ -79,44 +485,113 @@ async def run_once(db: Database, translator: Translator, poster_ru: Poster, post
             # Deduplicate within this batch
             if any(token_sort_ratio(translated, t) >= _SIMILARITY_THRESHOLD for t in accepted_titles):
                 try:
-                    await db.mark_seen(article.url, title=translated)
+                    await _mark_seen(db, article, translated)
                 except Exception as e:
                     logger.warning(f"Failed to mark batch dupe seen {article.url}: {e}")
                 logger.info(f"Skipped (batch duplicate): {article.url}")
                 continue
 
+            # Optional semantic dedup (paraphrased headlines from different outlets)
+            if deduper is not None:
+                try:
+                    match = await deduper.find_similar(translated)
+                except Exception as e:
+                    logger.warning(f"Semantic dedup failed for {article.url}: {e}")
+                    match = None
+                if match:
+                    try:
+                        await _mark_seen(db, article, translated)
+                    except Exception as e:
+                        logger.warning(f"Failed to mark semantic dupe seen {article.url}: {e}")
+                    logger.info(f"Skipped (semantic duplicate): {article.url}")
+                    continue
+                deduper.add(translated)
+
+            cluster_id = None
+            if clusterer is not None:
+                try:
+                    cluster_id = await clusterer.create(translated, article.url, article.source, article.title)
+                    pending_links[cluster_id] = []
+                except Exception as e:
+                    logger.warning(f"Failed to create cluster for {article.url}: {e}")
+
             accepted_titles.append(translated)
-            to_post.append((article, translated))
+            to_post.append((article, translated, cluster_id))
 
         except Exception as e:
             logger.error(f"Translation failed for {article.url}: {e}")
+    # translations started for carried articles are redone next cycle
+    for task in ahead:
+        task.cancel()
+    await asyncio.gather(*ahead, return_exceptions=True)
+    await _settle_source_dupes(db, clusterer, source_dupes, pending_links, posters)
 
+    if deduper is not None:
+        try:
+            await asyncio.to_thread(deduper.save)
+        except Exception as e:
+            logger.warning(f"Failed to persist semantic index: {e}")
+
+    await _save_queue(db.replace_pending, "pending", carried, scope)
     logger.info(f"{len(to_post)} unique articles to post.")
+    status.stage("carried", len(carried))
+    status.stage("to_post", len(to_post))
 
-    # Phase 4: Post verified unique articles — mark seen first to prevent duplicates
-    for article, translated in to_post:
+    # Phase 4: Post verified unique articles — claim (atomic mark seen) first to prevent duplicates
+    # Tags for the whole batch at once: keyword classifier, cache, one LLM call for the rest
+    tags_per_post: list[list[str]] = [[] for _ in to_post]
+    if tagger is not None and to_post:
         try:
-            await db.mark_seen(article.url, title=translated)
+            tags_per_post = await tagger.tag_many([translated for _, translated, _ in to_post])
+        except Exception as e:
+            logger.warning(f"Tagging failed: {e}")
+
+    if 0 < _DIGEST_THRESHOLD <= len(to_post):
+        # Backlog (burst or catch-up): a handful of messages instead of one per article
+        await _post_digest(db, translator, poster_ru, poster_en, to_post, tags_per_post, pending_links)
+        return True
+
+    for posted, ((article, translated, cluster_id), tags) in enumerate(zip(to_post, tags_per_post)):
+        status.stage("to_post", len(to_post) - posted)
+        extra_links = pending_links.get(cluster_id, [])
+        try:
+            claimed = await db.claim(
+                article.url, title=translated, source_title=article.title,
+                guid=article.guid, published_at=article.published_at, source=article.source,
+            )
         except Exception as e:
             logger.error(f"Failed to mark seen before post {article.url}: {e}")
             continue  # skip posting if we can't guarantee dedup
+        if not claimed:
+            logger.info(f"Skipped (already claimed): {article.url}")
+            continue
 
         try:
-            summary = summarize(translated)
-            # tags = await get_tags(translated, translator)
-            tags: list[str] = []
-            await poster_ru.post(summary=summary, url=article.url, source=article.source, tags=tags)
+            summary = summarize(translated, await _translate_description(translator, article, "RU"))
+            message_id = await poster_ru.post(
+                summary=summary, url=article.url, source=article.source, tags=tags,
+                extra_links=extra_links,
+            )
         except Exception as e:
             logger.error(f"Failed to post {article.url}: {e}")
             continue
+        await _remember_message(clusterer, cluster_id, poster_ru, message_id, summary, tags)
 
         if poster_en is not None:
             try:
                 translated_en = await translator.translate(article.title, source_lang="HU", target_lang="EN")
-                summary_en = summarize(translated_en)
-                await poster_en.post(summary=summary_en, url=article.url, source=article.source, tags=tags)
+                summary_en = summarize(
+                    translated_en, await _translate_description(translator, article, "EN")
+                )
+                message_id = await poster_en.post(
+                    summary=summary_en, url=article.url, source=article.source, tags=tags,
+                    extra_links=extra_links,
+                )
+                await _remember_message(clusterer, cluster_id, poster_en, message_id, summary_en, tags)
             except Exception as e:
                 logger.error(f"Failed to post EN for {article.url}: {e}")
 
         logger.info(f"Posted: {article.url}")
         await asyncio.sleep(_POST_DELAY)
+    status.stage("to_post", 0)
+    return True
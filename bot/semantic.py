@@ -0,0 +1,177 @@
+"""Optional embedding-based duplicate detection (SEMANTIC_DEDUP=1).
+
+Translated titles are embedded with a local Ollama model and kept in an in-memory
+NumPy matrix covering the dedup window, persisted to disk between restarts.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+
+import numpy as np
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+from bot import net
+from bot.translator.gemma import FAILOVER_EXCEPTIONS, OLLAMA_TIMEOUT, EndpointPool
+
+logger = logging.getLogger(__name__)
+
+OLLAMA_EMBED_MODEL = os.environ.get("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+SEMANTIC_THRESHOLD = float(os.environ.get("SEMANTIC_THRESHOLD", "0.85"))
+SEMANTIC_INDEX_PATH = os.environ.get("SEMANTIC_INDEX_PATH", "data/embeddings.npz")
+
+_INITIAL_CAPACITY = 1024
+
+
+class VectorIndex:
+    """Sliding-window matrix of unit-normalized title vectors with cosine search."""
+
+    def __init__(self, hours: int = 24):
+        self.hours = hours
+        self._vectors: np.ndarray | None = None  # (capacity, dim) float32
+        self._times = np.empty(0, dtype=np.float64)
+        self._titles: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def add(self, title: str, vector: np.ndarray, ts: float | None = None):
+        vector = _normalize(np.asarray(vector, dtype=np.float32))
+        n = len(self._titles)
+        if self._vectors is None:
+            self._vectors = np.empty((_INITIAL_CAPACITY, vector.shape[0]), dtype=np.float32)
+            self._times = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+        elif n == self._vectors.shape[0]:
+            self._vectors = np.resize(self._vectors, (n * 2, self._vectors.shape[1]))
+            self._times = np.resize(self._times, n * 2)
+        self._vectors[n] = vector
+        self._times[n] = time.time() if ts is None else ts
+        self._titles.append(title)
+
+    def search(self, queries: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return (best index, best cosine score) for each row of ``queries``."""
+        queries = _normalize(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+        n = len(self._titles)
+        if n == 0:
+            return np.full(len(queries), -1), np.zeros(len(queries), dtype=np.float32)
+        scores = queries @ self._vectors[:n].T
+        best = scores.argmax(axis=1)
+        return best, scores[np.arange(len(queries)), best]
+
+    def find_similar(self, vector: np.ndarray, threshold: float = SEMANTIC_THRESHOLD) -> str | None:
+        best, score = self.search(vector)
+        if best[0] >= 0 and score[0] >= threshold:
+            return self._titles[best[0]]
+        return None
+
+    def prune(self, now: float | None = None):
+        n = len(self._titles)
+        if n == 0:
+            return
+        cutoff = (time.time() if now is None else now) - self.hours * 3600
+        keep = np.flatnonzero(self._times[:n] >= cutoff)
+        if len(keep) == n:
+            return
+        self._vectors[: len(keep)] = self._vectors[keep]
+        self._times[: len(keep)] = self._times[keep]
+        self._titles = [self._titles[i] for i in keep]
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        n = len(self._titles)
+        vectors = self._vectors[:n] if self._vectors is not None else np.empty((0, 0), np.float32)
+        tmp = f"{path}.tmp.npz"
+        np.savez(tmp, vectors=vectors, times=self._times[:n], titles=np.array(self._titles, dtype=str))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, hours: int = 24) -> VectorIndex:
+        index = cls(hours=hours)
+        if not os.path.exists(path):
+            return index
+        with np.load(path) as data:
+            for title, vector, ts in zip(data["titles"], data["vectors"], data["times"]):
+                index.add(str(title), vector, ts=float(ts))
+        index.prune()
+        return index
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class OllamaEmbedder:
+    """Embeds on the Ollama endpoint pool; pass the translator's pool to share its failover state."""
+
+    def __init__(
+        self, model: str = OLLAMA_EMBED_MODEL, pool: EndpointPool | None = None, http: net.Http | None = None
+    ):
+        self._model = model
+        self._pool = pool or EndpointPool()
+        self._client = http or net.shared()
+
+    async def close(self) -> None:
+        """Nothing to release: connections belong to the shared Http, closed by main."""
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=4),
+        retry=retry_if_exception_type(FAILOVER_EXCEPTIONS),
+    )
+    async def embed(self, text: str) -> np.ndarray:
+        endpoint = self._pool.pick()
+        endpoint.outstanding += 1
+        try:
+            response = await self._client.post(
+                endpoint.url.rsplit("/", 1)[0] + "/embeddings",  # /api/generate -> /api/embeddings
+                json={"model": self._model, "prompt": text},
+                timeout=OLLAMA_TIMEOUT,
+                retries=0,
+            )
+            response.raise_for_status()
+        except FAILOVER_EXCEPTIONS as e:
+            self._pool.mark_down(endpoint, e)  # the retry goes to another endpoint
+            raise
+        finally:
+            endpoint.outstanding -= 1
+        embedding = response.json().get("embedding")
+        if not embedding:
+            raise ValueError("Ollama returned empty embedding")
+        return np.asarray(embedding, dtype=np.float32)
+
+
+class SemanticDeduper:
+    """Embeds translated titles and matches them against the persisted window index."""
+
+    def __init__(
+        self,
+        embedder: OllamaEmbedder,
+        path: str = SEMANTIC_INDEX_PATH,
+        threshold: float = SEMANTIC_THRESHOLD,
+        hours: int = 24,
+    ):
+        self._embedder = embedder
+        self._path = path
+        self._threshold = threshold
+        self._index = VectorIndex.load(path, hours=hours)
+        self._pending: dict[str, np.ndarray] = {}
+
+    async def find_similar(self, title: str) -> str | None:
+        vector = await self._embedder.embed(title)
+        self._pending[title] = vector
+        return self._index.find_similar(vector, self._threshold)
+
+    def add(self, title: str):
+        vector = self._pending.pop(title, None)
+        if vector is not None:
+            self._index.add(title, vector)
+
+    def save(self):
+        self._pending.clear()
+        self._index.prune()
+        self._index.save(self._path)
+
+    async def close(self) -> None:
+        await self._embedder.close()
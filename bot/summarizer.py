@@ -1,9 +1,11 @@
 MAX_CHARS = 500
 
-def summarize(text: str) -> str:
+def summarize(text: str, description: str = "") -> str:
     if not text:
         return ""
     text = text.strip()
+    if description.strip():
+        text = f"{text}\n\n{description.strip()}"
     if len(text) <= MAX_CHARS:
         return text
     truncated = text[:MAX_CHARS - 1]
@@ -1,4 +1,6 @@
 import logging
+import re
+from collections import OrderedDict
 from typing import Protocol
 
 logger = logging.getLogger(__name__)
@@ -25,6 +27,65 @@ CATEGORIES = frozenset([
 MAX_TAGS = 3
 _CATEGORIES_STR = ", ".join(sorted(CATEGORIES))
 
+# Word stems per category for the local classifier; stems of 3 letters or fewer match whole words only
+KEYWORDS = {
+    "политика": ["полит", "парти", "оппозиц", "фидес", "тиса", "депутат", "парламент"],
+    "выборы": ["выбор", "голосован", "избират", "референдум", "кандидат"],
+    "общество": ["обществ", "жител", "пенсионер", "протест", "демонстрац", "забастов"],
+    "право": ["суд", "закон", "прокурор", "адвокат", "приговор", "конституц"],
+    "безопасность": ["полиц", "арест", "арми", "оборон", "нато", "террор", "преступ", "убийств"],
+    "экономика": ["эконом", "инфляц", "ввп", "бюджет", "налог", "зарплат", "форинт"],
+    "бизнес": ["компани", "бизнес", "предприят", "завод", "фирм", "инвестиц"],
+    "финансы": ["банк", "финанс", "кредит", "ипотек", "ставк", "долг"],
+    "рынки": ["рынк", "рынок", "бирж", "акци", "валют", "нефт"],
+    "недвижимость": ["недвижим", "квартир", "жиль", "аренд", "застройщ"],
+    "мир": ["международ", "оон", "саммит", "китай", "росси", "путин"],
+    "европа": ["европ", "евросоюз", "брюссел", "ес", "еврокомисс"],
+    "сша": ["сша", "трамп", "вашингтон", "американ"],
+    "украина": ["украин", "киев", "зеленск"],
+    "ближнийвосток": ["израил", "иран", "хамас", "ливан", "сири"],
+    "венгрия": ["венгр"],
+    "будапешт": ["будапешт"],
+    "правительство": ["правительств", "орбан", "министр", "кабмин"],
+    "культура": ["культур", "театр", "фильм", "кино", "музе", "концерт", "выставк"],
+    "спорт": ["спорт", "матч", "футбол", "чемпион", "олимпи", "сборн", "турнир"],
+    "здоровье": ["здоров", "больниц", "врач", "медиц", "вирус", "болезн", "эпидеми"],
+    "технологии": ["технолог", "интернет", "цифров", "искусственн", "смартфон", "кибер"],
+    "наука": ["наук", "научн", "учён", "учен", "исследовател"],
+    "образование": ["образован", "школ", "университет", "студент", "учител", "экзамен"],
+    "туризм": ["туризм", "турист", "отел", "авиакомпан", "аэропорт"],
+    "расследование": ["расследован", "коррупц", "утечк"],
+    "аналитика": ["аналит", "прогноз", "обзор"],
+}
+# Place tags alone don't make the keyword classifier confident — almost every headline has one
+_GENERIC = frozenset(["венгрия", "будапешт"])
+_WORD_RE = re.compile(r"\w+")
+_CACHE_SIZE = 1000
+
+def _parse_tags(text: str) -> list[str]:
+    words = (w.strip(".,!?;:#") for w in text.lower().split())
+    valid = []
+    for w in words:
+        if w in CATEGORIES and f"#{w}" not in valid:
+            valid.append(f"#{w}")
+    return valid[:MAX_TAGS]
+
+def classify_keywords(title: str) -> tuple[list[str], bool]:
+    """Tag a headline by keyword stems. Returns (tags, confident)."""
+    words = _WORD_RE.findall(title.lower())
+    found = []
+    for category, stems in KEYWORDS.items():
+        for stem in stems:
+            if any(w == stem if len(stem) <= 3 else w.startswith(stem) for w in words):
+                found.append(category)
+                break
+    topical = [c for c in found if c not in _GENERIC]
+    generic = [c for c in found if c in _GENERIC]
+    return [f"#{c}" for c in (topical + generic)[:MAX_TAGS]], bool(topical)
+
+def _normalize(title: str) -> str:
+    return " ".join(_WORD_RE.findall(title.lower()))
+
 async def get_tags(title: str, llm: LLMGenerator) -> list[str]:
     try:
         prompt = (
@@ -34,9 +95,65 @@ async def get_tags(title: str, llm: LLMGenerator) -> list[str]:
             f"Headline: {title}"
         )
         result = await llm.generate(prompt)
-        words = result.lower().split()
-        valid = [f"#{w.strip('.,!?;:')}" for w in words if w.strip('.,!?;:') in CATEGORIES]
-        return valid[:MAX_TAGS]
+        return _parse_tags(result)
     except Exception as e:
         logger.warning(f"Failed to get tags: {e}")
         return []
+
+async def get_tags_batch(titles: list[str], llm: LLMGenerator) -> list[list[str]]:
+    """Classify several headlines with a single LLM call."""
+    numbered = "\n".join(f"{i}. {t}" for i, t in enumerate(titles, 1))
+    prompt = (
+        f"Classify each numbered news headline into 1-3 tags. "
+        f"Choose ONLY from this exact list: {_CATEGORIES_STR}. "
+        f"Answer with one line per headline: its number, a colon, then tag names "
+        f"from the list, space-separated. Nothing else.\n\n{numbered}"
+    )
+    result = await llm.generate(prompt)
+    tags: list[list[str]] = [[] for _ in titles]
+    for line in result.splitlines():
+        m = re.match(r"\s*(\d+)\s*[.:)]\s*(.*)", line)
+        if m and 1 <= int(m.group(1)) <= len(titles):
+            tags[int(m.group(1)) - 1] = _parse_tags(m.group(2))
+    return tags
+
+class Tagger:
+    """Keyword classifier first, one batched LLM call for the unsure rest, LRU cache by title."""
+
+    def __init__(self, llm: LLMGenerator | None = None, cache_size: int = _CACHE_SIZE):
+        self._llm = llm
+        self._cache: OrderedDict[str, list[str]] = OrderedDict()
+        self._cache_size = cache_size
+
+    def _remember(self, key: str, tags: list[str]):
+        self._cache[key] = tags
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    async def tag_many(self, titles: list[str]) -> list[list[str]]:
+        results: list[list[str]] = [[] for _ in titles]
+        unsure: list[int] = []
+        for i, title in enumerate(titles):
+            key = _normalize(title)
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                results[i] = self._cache[key]
+                continue
+            tags, confident = classify_keywords(title)
+            results[i] = tags
+            if confident or self._llm is None:
+                self._remember(key, tags)
+            else:
+                unsure.append(i)
+        if unsure:
+            try:
+                llm_tags = await get_tags_batch([titles[i] for i in unsure], self._llm)
+            except Exception as e:
+                logger.warning(f"Batched tagging failed for {len(unsure)} titles: {e}")
+                return results
+            for i, tags in zip(unsure, llm_tags):
+                if tags:
+                    results[i] = tags
+                self._remember(_normalize(titles[i]), results[i])
+        return results
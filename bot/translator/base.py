@@ -8,5 +8,10 @@ class Translator(ABC):
     ) -> str:
         """Translate text from source_lang to target_lang."""
 
+    @property
+    def concurrency(self) -> int:
+        """How many translate calls are worth running at once (run_once translates ahead)."""
+        return 1
+
     async def close(self) -> None:
         """Release resources. Override in subclasses if needed."""
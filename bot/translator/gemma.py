@@ -1,50 +1,215 @@
+import asyncio
 import json
+import logging
 import os
+import time
+from dataclasses import dataclass
 
 import httpx
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
+from bot import net
 from bot.translator.base import Translator
 
+logger = logging.getLogger(__name__)
+
 OLLAMA_URL = os.environ.get(
     "OLLAMA_URL", "http://host.docker.internal:11434/api/generate"
 )
+# OLLAMA_URL may list several inference hosts, comma-separated
+OLLAMA_URLS = [u.strip() for u in OLLAMA_URL.split(",") if u.strip()]
 OLLAMA_TIMEOUT = float(os.environ.get("OLLAMA_TIMEOUT", "60"))
+OLLAMA_ENDPOINT_COOLDOWN = float(os.environ.get("OLLAMA_ENDPOINT_COOLDOWN", "30"))
+# Translation prompt: "verbose" (instructions in every prompt), "compact" (short instruction
+# in the system field) or "context" (compact, primed once and continued via Ollama's context)
+OLLAMA_PROMPT = os.environ.get("OLLAMA_PROMPT", "verbose")
+PROMPT_STRATEGIES = ("verbose", "compact", "context")
+
+# Errors that take an endpoint out of rotation and retry on another: every transport
+# failure (connect/read/pool timeouts, resets, protocol errors) and error statuses
+FAILOVER_EXCEPTIONS = (httpx.TransportError, httpx.HTTPStatusError)
+
+@dataclass(slots=True)
+class TokenUsage:
+    """Totals of Ollama's per-response counters (durations are reported in nanoseconds)."""
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    prompt_seconds: float = 0.0
+    eval_seconds: float = 0.0
+    total_seconds: float = 0.0
+
+    def record(self, data: dict):
+        self.calls += 1
+        self.prompt_tokens += data.get("prompt_eval_count", 0)
+        self.completion_tokens += data.get("eval_count", 0)
+        self.prompt_seconds += data.get("prompt_eval_duration", 0) / 1e9
+        self.eval_seconds += data.get("eval_duration", 0) / 1e9
+        self.total_seconds += data.get("total_duration", 0) / 1e9
+
+    def as_dict(self) -> dict:
+        per_call = max(self.calls, 1)
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "prompt_tokens_per_call": round(self.prompt_tokens / per_call, 1),
+            "completion_tokens_per_call": round(self.completion_tokens / per_call, 1),
+            "prompt_seconds_per_call": round(self.prompt_seconds / per_call, 3),
+            "seconds_per_call": round(self.total_seconds / per_call, 3),
+        }
+
+def _verbose_prompt(text: str, source_lang: str, target_lang: str) -> str:
+    return (
+        f"Translate the following {source_lang} text to {target_lang}. "
+        f"The translation must sound natural and fluent to a native {target_lang} speaker — not literal or awkward. "
+        f"Return only the translation, no explanations:\n\n{text}"
+    )
+
+def _compact_system(source_lang: str, target_lang: str) -> str:
+    return f"Translate {source_lang} to natural {target_lang}. Output only the translation."
+
+class _Endpoint:
+    def __init__(self, url: str):
+        self.url = url
+        self.outstanding = 0
+        self.down_until = 0.0
+
+class EndpointPool:
+    """Ollama hosts with least-outstanding selection and a cooldown for failed ones."""
+
+    def __init__(self, urls: list[str] | None = None):
+        self.endpoints = [_Endpoint(url) for url in (urls or OLLAMA_URLS)]
+        self._turn = 0
 
-_RETRY_EXCEPTIONS = (httpx.ConnectError, httpx.ReadTimeout, httpx.HTTPStatusError)
+    def pick(self) -> _Endpoint:
+        """Least outstanding requests among endpoints in rotation (all of them if none are);
+        ties go round-robin, so sequential calls are spread too."""
+        now = time.monotonic()
+        healthy = [e for e in self.endpoints if e.down_until <= now] or self.endpoints
+        start = self._turn % len(healthy)
+        self._turn += 1
+        return min(healthy[start:] + healthy[:start], key=lambda e: e.outstanding)
+
+    def mark_down(self, endpoint: _Endpoint, error: Exception):
+        if len(self.endpoints) > 1:
+            logger.warning(f"Ollama endpoint {endpoint.url} out of rotation: {error}")
+        endpoint.down_until = time.monotonic() + OLLAMA_ENDPOINT_COOLDOWN
+
+    def stats(self) -> dict[str, dict]:
+        now = time.monotonic()
+        return {
+            e.url: {"outstanding": e.outstanding, "circuit": "open" if e.down_until > now else "closed"}
+            for e in self.endpoints
+        }
 
 class GemmaTranslator(Translator):
-    def __init__(self, model: str = "translategemma:latest"):
+    def __init__(
+        self,
+        model: str = "translategemma:latest",
+        endpoints: list[str] | None = None,
+        strategy: str | None = None,
+        http: net.Http | None = None,
+    ):
         self._model = model
-        self._client = httpx.AsyncClient(timeout=OLLAMA_TIMEOUT)
+        self.pool = EndpointPool(endpoints)
+        self._client = http or net.shared()
+        self._strategy = OLLAMA_PROMPT if strategy is None else strategy
+        if self._strategy not in PROMPT_STRATEGIES:
+            raise ValueError(f"Unknown OLLAMA_PROMPT: {self._strategy}")
+        self._contexts: dict[tuple[str, str], list[int]] = {}
+        self._priming_lock = asyncio.Lock()
+        self.usage = TokenUsage()
+
+    @property
+    def concurrency(self) -> int:
+        return len(self.pool.endpoints)
+
+    def stats(self) -> dict[str, dict]:
+        return self.pool.stats()
+
+    async def check_endpoints(self) -> dict[str, bool]:
+        """Probe every endpoint's server root; unreachable ones leave the rotation."""
+        results = {}
+        for endpoint in self.pool.endpoints:
+            try:
+                resp = await self._client.get(endpoint.url.rsplit("/", 2)[0], timeout=10)
+                resp.raise_for_status()
+                endpoint.down_until = 0.0
+                results[endpoint.url] = True
+            except Exception as e:
+                self.pool.mark_down(endpoint, e)
+                results[endpoint.url] = False
+        return results
 
     async def close(self) -> None:
-        await self._client.aclose()
+        """Nothing to release: connections belong to the shared Http, closed by main."""
 
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=1, max=4),
-        retry=retry_if_exception_type(_RETRY_EXCEPTIONS),
+        retry=retry_if_exception_type(FAILOVER_EXCEPTIONS),
     )
-    async def generate(self, prompt: str) -> str:
-        response = await self._client.post(OLLAMA_URL, json={
-            "model": self._model,
-            "prompt": prompt,
-            "stream": False,
-        })
-        response.raise_for_status()
+    async def _request(self, payload: dict) -> dict:
+        endpoint = self.pool.pick()
+        endpoint.outstanding += 1
+        try:
+            # no transport-level retries: tenacity below fails over to another endpoint
+            response = await self._client.post(endpoint.url, json={
+                "model": self._model,
+                "stream": False,
+                **payload,
+            }, timeout=OLLAMA_TIMEOUT, retries=0)
+            response.raise_for_status()
+        except FAILOVER_EXCEPTIONS as e:
+            self.pool.mark_down(endpoint, e)  # the retry goes to another endpoint
+            raise
+        finally:
+            endpoint.outstanding -= 1
         try:
             data = response.json()
         except json.JSONDecodeError as e:
             raise ValueError(f"Ollama returned invalid JSON: {e}") from e
-        result = data.get("response", "").strip()
+        self.usage.record(data)
+        logger.debug(
+            f"Ollama call: {data.get('prompt_eval_count', 0)} prompt + "
+            f"{data.get('eval_count', 0)} completion tokens in {data.get('total_duration', 0) / 1e9:.2f}s"
+        )
+        return data
+
+    async def generate(self, prompt: str, system: str | None = None, context: list[int] | None = None) -> str:
+        payload = {"prompt": prompt}
+        if system is not None:
+            payload["system"] = system
+        if context is not None:
+            payload["context"] = context
+        result = (await self._request(payload)).get("response", "").strip()
         if not result:
             raise ValueError("Ollama returned empty response")
         return result
 
+    async def _primed_context(self, source_lang: str, target_lang: str) -> list[int]:
+        """Evaluate the instruction once; its returned context prefixes every later title.
+
+        Ollama keeps the evaluated prefix in its KV cache, so later calls only pay
+        for the title tokens.
+        """
+        key = (source_lang, target_lang)
+        async with self._priming_lock:
+            if key not in self._contexts:
+                data = await self._request({
+                    "system": _compact_system(source_lang, target_lang),
+                    "prompt": "Each following message is one headline to translate.",
+                    "options": {"num_predict": 1},
+                })
+                self._contexts[key] = data.get("context") or []
+        return self._contexts[key]
+
     async def translate(self, text: str, source_lang: str = "HU", target_lang: str = "RU") -> str:
-        return await self.generate(
-            f"Translate the following {source_lang} text to {target_lang}. "
-            f"The translation must sound natural and fluent to a native {target_lang} speaker — not literal or awkward. "
-            f"Return only the translation, no explanations:\n\n{text}"
-        )
+        if self._strategy == "context":
+            context = await self._primed_context(source_lang, target_lang)
+            if context:  # servers that return no context fall back to the compact prompt
+                return await self.generate(text, context=context)
+        if self._strategy in ("compact", "context"):
+            return await self.generate(text, system=_compact_system(source_lang, target_lang))
+        return await self.generate(_verbose_prompt(text, source_lang, target_lang))
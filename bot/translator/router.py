@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import statistics
+import time
+from collections import deque
+
+from bot.translator.base import Translator
+
+logger = logging.getLogger(__name__)
+
+_WINDOW = 50
+_MIN_SAMPLES = 5
+_MIN_HEDGE_DELAY = 0.5
+
+
+class _Backend:
+    """Rolling latency/error stats and circuit-breaker state for one translator."""
+
+    def __init__(self, name: str, translator: Translator):
+        self.name = name
+        self.translator = translator
+        self.latencies: deque[float] = deque(maxlen=_WINDOW)
+        self.outcomes: deque[bool] = deque(maxlen=_WINDOW)
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return statistics.fmean(self.latencies) if self.latencies else 0.0
+
+    def p95(self) -> float | None:
+        if len(self.latencies) < _MIN_SAMPLES:
+            return None
+        return statistics.quantiles(self.latencies, n=20)[-1]
+
+
+class RoutingTranslator(Translator):
+    """Sends each request to the fastest healthy backend, hedges slow ones, fails over on error.
+
+    A backend whose calls fail ``failure_threshold`` times in a row is skipped for
+    ``cooldown`` seconds, then gets a single trial request (half-open) before rejoining.
+    """
+
+    def __init__(
+        self,
+        backends: dict[str, Translator],
+        failure_threshold: int = 2,
+        cooldown: float = 120,
+        hedge: bool = True,
+    ):
+        if not backends:
+            raise ValueError("RoutingTranslator needs at least one backend")
+        self._backends = [_Backend(name, t) for name, t in backends.items()]
+        self._failure_threshold = failure_threshold
+        self._cooldown = cooldown
+        self._hedge = hedge
+
+    @property
+    def concurrency(self) -> int:
+        return max(b.translator.concurrency for b in self._backends)
+
+    def stats(self) -> dict[str, dict]:
+        now = time.monotonic()
+        return {
+            b.name: {
+                "mean_latency": round(b.mean_latency, 3),
+                "error_rate": round(b.error_rate, 3),
+                "circuit": "open" if b.open_until > now else "closed",
+            }
+            for b in self._backends
+        }
+
+    def _ranked(self, method: str) -> list[_Backend]:
+        now = time.monotonic()
+        usable = [
+            b for b in self._backends
+            if b.open_until <= now and callable(getattr(b.translator, method, None))
+        ]
+        return sorted(usable, key=lambda b: (b.error_rate > 0.5, b.mean_latency))
+
+    async def _attempt(self, backend: _Backend, method: str, *args, **kwargs):
+        start = time.monotonic()
+        try:
+            result = await getattr(backend.translator, method)(*args, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            backend.outcomes.append(False)
+            backend.consecutive_failures += 1
+            if backend.consecutive_failures >= self._failure_threshold:
+                backend.open_until = time.monotonic() + self._cooldown
+                logger.warning(f"Translator {backend.name} circuit open for {self._cooldown:.0f}s")
+            raise
+        backend.latencies.append(time.monotonic() - start)
+        backend.outcomes.append(True)
+        backend.consecutive_failures = 0
+        return result
+
+    async def _route(self, method: str, *args, **kwargs):
+        backends = self._ranked(method)
+        if not backends:
+            raise RuntimeError(f"No healthy translator backend for {method}")
+        queue = deque(backends)
+        primary = queue[0]
+        pending = {asyncio.create_task(self._attempt(queue.popleft(), method, *args, **kwargs))}
+        hedged = False
+        last_error: Exception | None = None
+        try:
+            while pending:
+                delay = primary.p95() if self._hedge and not hedged and queue else None
+                if delay is not None:
+                    delay = max(delay, _MIN_HEDGE_DELAY)
+                done, pending = await asyncio.wait(
+                    pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    hedged = True
+                    backend = queue.popleft()
+                    logger.info(f"Hedging slow {primary.name} request with {backend.name}")
+                    pending.add(asyncio.create_task(self._attempt(backend, method, *args, **kwargs)))
+                    continue
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+                if not pending and queue:
+                    backend = queue.popleft()
+                    logger.warning(f"Failing over to {backend.name}: {last_error}")
+                    pending.add(asyncio.create_task(self._attempt(backend, method, *args, **kwargs)))
+        finally:
+            for task in pending:
+                task.cancel()
+        raise last_error
+
+    async def translate(self, text: str, source_lang: str = "HU", target_lang: str = "RU") -> str:
+        return await self._route("translate", text, source_lang=source_lang, target_lang=target_lang)
+
+    async def generate(self, prompt: str) -> str:
+        return await self._route("generate", prompt)
+
+    async def close(self) -> None:
+        for backend in self._backends:
+            await backend.translator.close()
@@ -0,0 +1,56 @@
+# tests/test_clusters.py
+import pytest
+
+from bot.clusters import StoryClusterer
+from bot.db import Database
+
+
+@pytest.fixture
+async def db(tmp_path):
+    database = Database(tmp_path / "test.db")
+    await database.init()
+    yield database
+    await database.close()
+
+@pytest.mark.asyncio
+async def test_match_returns_none_when_empty(db):
+    clusterer = StoryClusterer(db)
+    await clusterer.load()
+    assert clusterer.match("Венгрия повысила налоги на доходы") is None
+
+@pytest.mark.asyncio
+async def test_create_and_match_similar_title(db):
+    clusterer = StoryClusterer(db)
+    cluster_id = await clusterer.create("Венгрия повысила налоги на доходы", "https://telex.hu/1", "Telex")
+    assert clusterer.match("Венгрия повысила налоги на доходы граждан") == cluster_id
+    assert clusterer.match("Погода в Будапеште на выходные") is None
+
+@pytest.mark.asyncio
+async def test_attach_returns_all_sources_in_order(db):
+    clusterer = StoryClusterer(db)
+    cluster_id = await clusterer.create("Налоги", "https://telex.hu/1", "Telex")
+    links = await clusterer.attach(cluster_id, "https://hvg.hu/1", "HVG")
+    assert links == [("https://telex.hu/1", "Telex"), ("https://hvg.hu/1", "HVG")]
+
+@pytest.mark.asyncio
+async def test_state_survives_reload(db):
+    clusterer = StoryClusterer(db)
+    cluster_id = await clusterer.create("Венгрия повысила налоги на доходы", "https://telex.hu/1", "Telex")
+    await clusterer.set_message(cluster_id, "@chan", 42, "Венгрия повысила налоги", ["#экономика"])
+
+    restored = StoryClusterer(db)
+    await restored.load()
+    assert restored.match("Венгрия повысила налоги на доходы") == cluster_id
+    assert await restored.messages(cluster_id) == [("@chan", 42, "Венгрия повысила налоги", ["#экономика"])]
+
+@pytest.mark.asyncio
+async def test_match_source_finds_cluster_by_untranslated_title(db):
+    clusterer = StoryClusterer(db)
+    cluster_id = await clusterer.create("Налоги", "https://telex.hu/1", "Telex", "A kormány  emelte az adókat")
+    await clusterer.attach(cluster_id, "https://hvg.hu/1", "HVG", "Adóemelés jön")
+    assert clusterer.match_source("A kormány emelte az adókat") == cluster_id
+    assert clusterer.match_source("Esik az eső") is None
+
+    restored = StoryClusterer(db)
+    await restored.load()
+    assert restored.match_source("Adóemelés jön") == cluster_id
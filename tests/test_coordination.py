@@ -0,0 +1,71 @@
+# tests/test_coordination.py
+import time
+from unittest.mock import patch
+
+import pytest
+
+from bot.coordination import Coordinator
+from bot.db import Database
+from bot.feeds import SOURCES
+
+_NAMES = [s["name"] for s in SOURCES]
+
+
+@pytest.fixture
+async def db(tmp_path):
+    database = Database(tmp_path / "test.db")
+    await database.init()
+    yield database
+    await database.close()
+
+@pytest.mark.asyncio
+async def test_claim_is_exclusive_by_url_and_guid(db):
+    assert await db.claim("https://telex.hu/1", guid="g1")
+    assert not await db.claim("https://telex.hu/1")
+    assert not await db.claim("https://telex.hu/moved", guid="g1")
+    assert await db.claim("https://telex.hu/2")
+
+@pytest.mark.asyncio
+async def test_single_worker_leases_all_sources(db):
+    await db.heartbeat("a")
+    assert await db.acquire_leases("a", _NAMES, ttl=60) == _NAMES
+
+@pytest.mark.asyncio
+async def test_two_workers_split_sources(db):
+    await db.heartbeat("a")
+    await db.acquire_leases("a", _NAMES, ttl=60)
+    await db.heartbeat("b")
+    b = await db.acquire_leases("b", _NAMES, ttl=60)
+    assert b == []  # everything is leased by a
+    a = await db.acquire_leases("a", _NAMES, ttl=60)  # a gives back its excess
+    b = await db.acquire_leases("b", _NAMES, ttl=60)
+    assert len(a) + len(b) == len(_NAMES)
+    assert not set(a) & set(b)
+    assert abs(len(a) - len(b)) <= 1
+
+@pytest.mark.asyncio
+async def test_dead_worker_sources_move_to_live_worker(db):
+    await db.heartbeat("a")
+    await db.acquire_leases("a", _NAMES, ttl=60)
+    with patch("bot.db.time.time", return_value=time.time() + 120):
+        await db.heartbeat("b")
+        assert await db.acquire_leases("b", _NAMES, ttl=60) == _NAMES
+
+@pytest.mark.asyncio
+async def test_coordinator_fetches_only_leased_sources(db):
+    seen_sources = []
+
+    async def fake_fetch_all(sources):
+        seen_sources.extend(s["name"] for s in sources)
+        return
+        yield
+
+    coordinator = Coordinator(db, worker_id="a", ttl=60)
+    await db.heartbeat("b")
+    await db.acquire_leases("b", _NAMES[:4], ttl=60)
+    with patch("bot.coordination.fetch_all", fake_fetch_all):
+        _ = [a async for a in coordinator.fetch()]
+    assert seen_sources == coordinator.sources
+    assert not set(coordinator.sources) & set(_NAMES[:4])
+    await coordinator.release()
+    assert await db.acquire_leases("b", _NAMES, ttl=60) == _NAMES  # b is the only live worker again
@@ -1,8 +1,11 @@
 # tests/test_db.py
+import time
+from unittest.mock import patch
+
 import aiosqlite
 import pytest
 
-from bot.db import Database
+from bot.db import Database, canonicalize_url, url_key
 
 
 @pytest.mark.asyncio
@@ -30,9 +33,11 @@ async def test_different_urls_independent(tmp_path):
 async def test_mark_seen_stores_title(tmp_path):
     db = Database(tmp_path / "test.db")
     await db.init()
-    await db.mark_seen("https://example.com/a", title="Венгрия повысила налоги")
-    async with aiosqlite.connect(str(tmp_path / "test.db")) as conn, \
-               conn.execute("SELECT title FROM seen_urls WHERE url = ?", ("https://example.com/a",)) as cur:
+    await db.mark_seen("https://example.com/a", title="Венгрия  повысила налоги ")
+    async with aiosqlite.connect(str(tmp_path / "test.db")) as conn, conn.execute(
+        "SELECT titles.text FROM seen JOIN titles ON titles.hash = seen.title_hash WHERE url_hash = ?",
+        (url_key("https://example.com/a"),),
+    ) as cur:
         row = await cur.fetchone()
     assert row[0] == "Венгрия повысила налоги"
 
@@ -56,12 +61,142 @@ async def test_find_similar_no_match_for_unrelated(tmp_path):
 async def test_find_similar_respects_time_window(tmp_path):
     db = Database(tmp_path / "test.db")
     await db.init()
-    # insert with old timestamp directly
+    with patch("bot.db.time.time", return_value=time.time() - 48 * 3600):
+        await db.mark_seen("https://a.com/old", title="Венгрия повысила налоги на доходы")
+    result = await db.find_similar("Венгрия повысила налоги на доходы", hours=24)
+    assert result is None
+
+def test_canonicalize_url_strips_tracking_and_unifies_host():
+    assert canonicalize_url("http://WWW.Telex.hu/belfold/cikk/?utm_source=fb&fbclid=x") == \
+        "https://telex.hu/belfold/cikk"
+    assert canonicalize_url("https://hvg.hu/a?id=5#comments") == "https://hvg.hu/a?id=5"
+
+@pytest.mark.asyncio
+async def test_is_seen_matches_canonical_variants(tmp_path):
+    db = Database(tmp_path / "test.db")
+    await db.init()
+    await db.mark_seen("https://www.telex.hu/cikk/?utm_medium=rss")
+    assert await db.is_seen("https://telex.hu/cikk")
+
+@pytest.mark.asyncio
+async def test_find_similar_source_matches_original_title(tmp_path):
+    db = Database(tmp_path / "test.db")
+    await db.init()
+    await db.mark_seen("https://a.com/1", title="Перевод", source_title="Emelkednek az adók jövőre")
+    assert await db.find_similar_source("Emelkednek az adók jövőre") is not None
+    assert await db.find_similar_source("Esős hétvége jön Budapesten") is None
+    assert await db.recent_source_titles() == ["Emelkednek az adók jövőre"]
+
+@pytest.mark.asyncio
+async def test_init_migrates_legacy_urls_to_canonical(tmp_path):
+    async with aiosqlite.connect(str(tmp_path / "test.db")) as conn:
+        await conn.execute("CREATE TABLE seen_urls (url TEXT PRIMARY KEY)")
+        await conn.execute("INSERT INTO seen_urls (url) VALUES ('https://www.hvg.hu/a/')")
+        await conn.commit()
+    db = Database(tmp_path / "test.db")
+    await db.init()
+    assert await db.is_seen("https://hvg.hu/a")
+
+@pytest.mark.asyncio
+async def test_pending_queue_roundtrip_newest_first(tmp_path):
+    db = Database(tmp_path / "test.db")
+    await db.init()
+    await db.replace_pending([
+        ("A", "https://a.com/1", "Telex", 1.0, "g1", ""), ("B", "https://a.com/2", "HVG", 2.0, "", "lead"),
+    ])
+    assert await db.pending_articles() == [
+        ("B", "https://a.com/2", "HVG", 2.0, "", "lead"), ("A", "https://a.com/1", "Telex", 1.0, "g1", ""),
+    ]
+    await db.replace_pending([])
+    assert await db.pending_articles() == []
+
+@pytest.mark.asyncio
+async def test_backlog_is_separate_from_pending(tmp_path):
+    db = Database(tmp_path / "test.db")
+    await db.init()
+    await db.replace_pending([("A", "https://a.com/1", "Telex", 1.0, "", "")])
+    await db.replace_backlog([("B", "https://a.com/2", "HVG", 2.0, "g2", "")])
+    assert await db.backlog_articles() == [("B", "https://a.com/2", "HVG", 2.0, "g2", "")]
+    assert await db.pending_articles() == [("A", "https://a.com/1", "Telex", 1.0, "", "")]
+    await db.prune()
+    assert len(await db.backlog_articles()) == 1
+
+@pytest.mark.asyncio
+async def test_replace_queue_keeps_other_sources_rows(tmp_path):
+    db = Database(tmp_path / "test.db")
+    await db.init()
+    await db.replace_backlog([
+        ("A", "https://telex.hu/1", "Telex", 1.0, "", ""),
+        ("B", "https://hvg.hu/1", "HVG", 2.0, "", ""),
+    ])
+    # the replica leasing Telex drains its row; the other replica's HVG row stays
+    assert await db.backlog_articles(["Telex"]) == [("A", "https://telex.hu/1", "Telex", 1.0, "", "")]
+    await db.replace_backlog([], ["Telex"])
+    assert await db.backlog_articles() == [("B", "https://hvg.hu/1", "HVG", 2.0, "", "")]
+    await db.replace_pending([], [])
+    assert await db.backlog_articles([]) == []
+    await db.close()
+
+@pytest.mark.asyncio
+async def test_is_seen_by_guid_after_url_change(tmp_path):
+    db = Database(tmp_path / "test.db")
+    await db.init()
+    await db.mark_seen(
+        "https://telex.hu/old-slug", guid="https://telex.hu/?p=123", published_at=1.0, source="Telex"
+    )
+    assert await db.is_seen("https://telex.hu/new-slug", guid="https://telex.hu/?p=123", source="Telex")
+    assert not await db.is_seen("https://telex.hu/new-slug", guid="https://telex.hu/?p=999", source="Telex")
+    assert not await db.is_seen("https://telex.hu/new-slug")
+
+@pytest.mark.asyncio
+async def test_same_guid_from_different_sources_is_not_a_duplicate(tmp_path):
+    db = Database(tmp_path / "test.db")
+    await db.init()
+    await db.mark_seen("https://telex.hu/a", guid="123", source="Telex")
+    assert await db.is_seen("https://telex.hu/b", guid="123", source="Telex")
+    assert not await db.is_seen("https://hvg.hu/a", guid="123", source="HVG")
+    assert await db.claim("https://hvg.hu/a", guid="123", source="HVG")
+    assert not await db.claim("https://hvg.hu/moved", guid="123", source="HVG")
+
+@pytest.mark.asyncio
+async def test_init_migrates_seen_urls_to_compact_schema(tmp_path):
     async with aiosqlite.connect(str(tmp_path / "test.db")) as conn:
         await conn.execute(
-            "INSERT INTO seen_urls (url, title, posted_at) VALUES (?, ?, datetime('now', '-48 hours'))",
-            ("https://a.com/old", "Венгрия повысила налоги на доходы"),
+            "CREATE TABLE seen_urls (url TEXT PRIMARY KEY, title TEXT DEFAULT '', "
+            "posted_at TIMESTAMP DEFAULT NULL, source_title TEXT DEFAULT '')"
+        )
+        await conn.executemany(
+            "INSERT INTO seen_urls (url, title, source_title, posted_at) VALUES (?, ?, ?, datetime('now', ?))",
+            [
+                ("https://telex.hu/1", "Венгрия повысила налоги", "Emelkednek az adók", "-1 hours"),
+                ("https://hvg.hu/2", "Венгрия повысила налоги", "Adóemelés jön", "-2 hours"),
+                ("https://hvg.hu/old", "Старая новость", "", "-40 days"),
+            ],
         )
         await conn.commit()
-    result = await db.find_similar("Венгрия повысила налоги на доходы", hours=24)
-    assert result is None
+    db = Database(tmp_path / "test.db")
+    await db.init()
+    assert await db.is_seen("https://telex.hu/1")
+    assert await db.find_similar("Венгрия повысила налоги") == "Венгрия повысила налоги"
+    assert await db.find_similar_source("Adóemelés jön") == "Adóemelés jön"
+    async with aiosqlite.connect(str(tmp_path / "test.db")) as conn:
+        tables = {row[0] for row in await conn.execute_fetchall("SELECT name FROM sqlite_master")}
+        (title_rows,) = await (await conn.execute("SELECT COUNT(*) FROM titles")).fetchone()
+    assert "seen_urls" not in tables
+    assert title_rows == 4  # the shared translated title is stored once
+    await db.prune()
+    assert not await db.is_seen("https://hvg.hu/old")
+    await db.close()
+
+@pytest.mark.asyncio
+async def test_prune_drops_titles_no_longer_referenced(tmp_path):
+    db = Database(tmp_path / "test.db")
+    await db.init()
+    with patch("bot.db.time.time", return_value=time.time() - 40 * 86400):
+        await db.mark_seen("https://a.com/old", title="Старая новость")
+    await db.mark_seen("https://a.com/new", title="Новая новость")
+    await db.prune()
+    async with aiosqlite.connect(str(tmp_path / "test.db")) as conn:
+        rows = await conn.execute_fetchall("SELECT text FROM titles")
+    assert rows == [("Новая новость",)]
+    await db.close()
@@ -1,4 +1,11 @@
 # tests/test_feeds.py
+import itertools
+
+import feedparser
+import httpx
+import pytest
+
+from bot import feeds, net
 from bot.feeds import SOURCES, Article
 
 
@@ -16,3 +23,107 @@ def test_article_fields():
     assert a.url == "http://x.com"
     assert a.source == "MTI"
 
+def test_article_uses_slots():
+    a = Article(title="T", url="http://x.com", source="MTI")
+    assert not hasattr(a, "__dict__")
+
+@pytest.mark.asyncio
+async def test_fetch_all_streams_articles_and_skips_failed_sources(monkeypatch):
+    sources = [{"name": "A", "url": "a"}, {"name": "B", "url": "b"}]
+
+    async def fake_extract(source):
+        if source["name"] == "B":
+            raise OSError("timeout")
+        return [Article(title="T1", url="http://a/1", source="A"),
+                Article(title="T2", url="http://a/2", source="A")]
+
+    monkeypatch.setattr(feeds, "SOURCES", sources)
+    monkeypatch.setattr(feeds, "_extract_articles", fake_extract)
+    articles = [a async for a in feeds.fetch_all()]
+    assert [a.url for a in articles] == ["http://a/1", "http://a/2"]
+
+def test_parse_articles_reads_entry_metadata():
+    rss = (
+        b'<?xml version="1.0"?><rss version="2.0"><channel><title>x</title>'
+        b'<item><title>Hir</title><link>https://telex.hu/1</link><guid>telex-1</guid>'
+        b'<description>&lt;p&gt;Els\xc5\x91 &lt;b&gt;bekezd\xc3\xa9s&lt;/b&gt;&lt;/p&gt;</description>'
+        b'<pubDate>Thu, 01 Jan 2026 00:00:00 GMT</pubDate></item></channel></rss>'
+    )
+    [article] = feeds._parse_articles(rss, "Telex")
+    assert article.published_at == 1767225600.0
+    assert article.guid == "telex-1"
+    assert article.description == "Első bekezdés"
+
+def test_clean_description_is_bounded():
+    text = feeds._clean_description("<p>" + "szó " * 500 + "</p>")
+    assert len(text) <= feeds._MAX_DESCRIPTION + 1
+    assert text.endswith("…")
+
+
+_RSS_HEAD = b'<?xml version="1.0"?><rss version="2.0"><channel><title>x</title>'
+
+def _item(i: int) -> bytes:
+    return b"<item><title>Hir %d</title><link>https://telex.hu/%d</link></item>" % (i, i)
+
+def _serve(monkeypatch, chunks):
+    """Serve the feed body in the given chunks (possibly endless) through a mocked shared Http."""
+    async def body():
+        for chunk in chunks:
+            yield chunk
+
+    http = net.Http(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=body())))
+    monkeypatch.setattr(feeds.net, "shared", lambda: http)
+
+async def test_download_stops_after_max_entries(monkeypatch):
+    monkeypatch.setattr(feeds, "_MAX_FEED_ENTRIES", 3)
+    # split items mid-tag to exercise matching across chunk boundaries
+    body = _RSS_HEAD + b"".join(_item(i) for i in range(10))
+    _serve(monkeypatch, [body[i:i + 50] for i in range(0, len(body), 50)])
+    stats = feeds.FeedStats()
+    data = await feeds._download("https://telex.hu/rss", stats)
+    assert stats.truncated == "entries"
+    feed = feedparser.parse(data)
+    assert not feed.bozo  # cut after the 3rd item and closed as well-formed XML
+    assert [e.link for e in feed.entries] == [f"https://telex.hu/{i}" for i in range(3)]
+
+async def test_download_caps_endless_body(monkeypatch):
+    monkeypatch.setattr(feeds, "_MAX_FEED_BYTES", 2000)
+    _serve(monkeypatch, itertools.chain([_RSS_HEAD], (_item(i) for i in itertools.count())))
+    stats = feeds.FeedStats()
+    data = await feeds._download("https://telex.hu/rss", stats)
+    assert stats.truncated == "bytes"
+    assert data.endswith(b"</item></channel></rss>")
+    assert len(feedparser.parse(data).entries) == stats.entries > 0
+
+async def test_download_stops_at_deadline(monkeypatch):
+    monkeypatch.setattr(feeds, "_FEED_TIMEOUT", 0)
+    _serve(monkeypatch, itertools.chain([_RSS_HEAD, _item(0)], itertools.repeat(b" ")))
+    stats = feeds.FeedStats()
+    await feeds._download("https://telex.hu/rss", stats)
+    assert stats.truncated == "deadline"
+
+def test_byte_cap_adapts_to_recent_sizes(monkeypatch):
+    stats = feeds.FeedStats()
+    assert stats.byte_cap() == feeds._MAX_FEED_BYTES
+    stats.sizes.extend([100_000, 120_000])
+    assert stats.byte_cap() == 480_000
+    stats.sizes.append(10)
+    assert stats.byte_cap() == 480_000
+    stats.sizes.clear()
+    stats.sizes.append(1000)
+    assert stats.byte_cap() == feeds._MIN_FEED_BYTES
+
+async def test_extract_articles_records_stats(monkeypatch):
+    _serve(monkeypatch, [_RSS_HEAD, _item(1), b"</channel></rss>"])
+    monkeypatch.setattr(feeds, "_stats", {})
+    articles = await feeds._extract_articles({"name": "Telex", "url": "https://telex.hu/rss"})
+    assert [a.url for a in articles] == ["https://telex.hu/1"]
+    stats = feeds.feed_stats()["https://telex.hu/rss"]
+    assert stats["entries"] == 1
+    assert stats["truncated"] == ""
+
+async def test_download_raises_on_http_error(monkeypatch):
+    http = net.Http(transport=httpx.MockTransport(lambda request: httpx.Response(404)))
+    monkeypatch.setattr(feeds.net, "shared", lambda: http)
+    with pytest.raises(httpx.HTTPStatusError):
+        await feeds._download("https://telex.hu/rss", feeds.FeedStats())
@@ -7,10 +7,13 @@ import pytest
 
 from bot.translator.gemma import GemmaTranslator
 
+_ENDPOINTS = ["http://a/api/generate", "http://b/api/generate"]
+
 
 @pytest.fixture
 def translator():
-    t = GemmaTranslator(model="test-model")
+    # a private mock client: patching post on net.shared() would leak into other tests
+    t = GemmaTranslator(model="test-model", http=MagicMock())
     yield t
 
 
@@ -102,7 +105,111 @@ async def test_translate_default_langs(translator):
 
 
 @pytest.mark.asyncio
-async def test_close(translator):
-    translator._client = AsyncMock()
-    await translator.close()
-    translator._client.aclose.assert_awaited_once()
+async def test_close_leaves_shared_client_open():
+    http = AsyncMock()
+    await GemmaTranslator(model="m", http=http).close()
+    http.aclose.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_balances_to_least_outstanding_endpoint():
+    t = GemmaTranslator(model="m", endpoints=_ENDPOINTS, http=MagicMock())
+    t.pool.endpoints[0].outstanding = 2
+    t._client.post = AsyncMock(return_value=_mock_response({"response": "ok"}))
+    await t.generate("x")
+    assert t._client.post.call_args[0][0] == "http://b/api/generate"
+    assert all(e.outstanding == 0 for e in t.pool.endpoints[1:])
+
+
+@pytest.mark.asyncio
+async def test_failed_endpoint_leaves_rotation_and_retry_uses_other():
+    t = GemmaTranslator(model="m", endpoints=_ENDPOINTS, http=MagicMock())
+    t._client.post = AsyncMock(side_effect=[
+        httpx.ConnectError("refused"),
+        _mock_response({"response": "ok"}),
+    ])
+    assert await t.generate("x") == "ok"
+    urls = [c[0][0] for c in t._client.post.call_args_list]
+    assert urls == ["http://a/api/generate", "http://b/api/generate"]
+    assert t.pool.endpoints[0].down_until > 0
+
+
+@pytest.mark.asyncio
+async def test_sequential_calls_alternate_between_idle_endpoints():
+    t = GemmaTranslator(model="m", endpoints=_ENDPOINTS, http=MagicMock())
+    t._client.post = AsyncMock(return_value=_mock_response({"response": "ok"}))
+    for _ in range(4):
+        await t.generate("x")
+    hosts = [c[0][0].split("/")[2] for c in t._client.post.call_args_list]
+    assert hosts == ["a", "b", "a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_silently_dead_endpoint_fails_over():
+    # a host that drops packets times out on connect rather than refusing
+    t = GemmaTranslator(model="m", endpoints=_ENDPOINTS, http=MagicMock())
+    t._client.post = AsyncMock(side_effect=[
+        httpx.ConnectTimeout("timed out"),
+        _mock_response({"response": "ok"}),
+        _mock_response({"response": "ok"}),
+    ])
+    assert await t.generate("x") == "ok"
+    assert t.stats()["http://a/api/generate"]["circuit"] == "open"
+    assert await t.generate("y") == "ok"
+    urls = [c[0][0] for c in t._client.post.call_args_list]
+    assert urls == ["http://a/api/generate", "http://b/api/generate", "http://b/api/generate"]
+
+
+@pytest.mark.asyncio
+async def test_check_endpoints_reports_each_host():
+    t = GemmaTranslator(model="m", endpoints=_ENDPOINTS, http=MagicMock())
+    ok = _mock_response({})
+    t._client.get = AsyncMock(side_effect=[ok, httpx.ConnectError("refused")])
+    assert await t.check_endpoints() == {"http://a/api/generate": True, "http://b/api/generate": False}
+    assert t._client.get.call_args_list[0][0][0] == "http://a"
+
+
+@pytest.mark.asyncio
+async def test_records_token_usage(translator):
+    translator._client.post = AsyncMock(return_value=_mock_response({
+        "response": "ok", "prompt_eval_count": 40, "eval_count": 10,
+        "prompt_eval_duration": 200_000_000, "eval_duration": 300_000_000, "total_duration": 600_000_000,
+    }))
+    await translator.generate("a")
+    await translator.generate("b")
+    usage = translator.usage.as_dict()
+    assert usage["calls"] == 2
+    assert usage["prompt_tokens"] == 80
+    assert usage["completion_tokens_per_call"] == 10
+    assert usage["seconds_per_call"] == 0.6
+
+
+@pytest.mark.asyncio
+async def test_compact_prompt_sends_title_with_system_instruction():
+    t = GemmaTranslator(model="m", strategy="compact", http=MagicMock())
+    t._client.post = AsyncMock(return_value=_mock_response({"response": "перевод"}))
+    await t.translate("Emelkednek az adók")
+    call_json = t._client.post.call_args[1]["json"]
+    assert call_json["prompt"] == "Emelkednek az adók"
+    assert "HU" in call_json["system"] and "RU" in call_json["system"]
+
+
+@pytest.mark.asyncio
+async def test_context_prompt_primes_once_per_language_pair():
+    t = GemmaTranslator(model="m", strategy="context", http=MagicMock())
+    t._client.post = AsyncMock(side_effect=[
+        _mock_response({"response": "O", "context": [1, 2, 3]}),
+        _mock_response({"response": "первый"}),
+        _mock_response({"response": "второй"}),
+    ])
+    assert await t.translate("első") == "первый"
+    assert await t.translate("második") == "второй"
+    calls = [c[1]["json"] for c in t._client.post.call_args_list]
+    assert "system" in calls[0] and calls[0]["options"] == {"num_predict": 1}
+    assert [c["prompt"] for c in calls[1:]] == ["első", "második"]
+    assert all(c["context"] == [1, 2, 3] and "system" not in c for c in calls[1:])
+
+
+def test_unknown_prompt_strategy_rejected():
+    with pytest.raises(ValueError, match="OLLAMA_PROMPT"):
+        GemmaTranslator(model="m", strategy="short", http=MagicMock())
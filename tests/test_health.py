@@ -0,0 +1,113 @@
+# tests/test_health.py
+import json
+import sqlite3
+import urllib.error
+import urllib.request
+
+import pytest
+
+from bot.db import Database
+from bot.health import HealthServer, PipelineStatus, probe
+
+
+class _Component:
+    def __init__(self, stats):
+        self.channel_id = "@ru"
+        self._stats = stats
+
+    def stats(self):
+        return self._stats
+
+
+@pytest.fixture
+async def db_path(tmp_path):
+    db = Database(tmp_path / "seen.db")
+    await db.init()
+    await db.close()
+    return str(tmp_path / "seen.db")
+
+def _get(port: int, path: str) -> tuple[int, dict]:
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=5) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+@pytest.fixture
+def serve(db_path):
+    servers = []
+
+    def start(pipeline, translator=None, posters=None, max_cycle_age=60, http=None):
+        server = HealthServer(db_path, max_cycle_age, translator, posters, port=0, pipeline=pipeline, http=http)
+        server.start()
+        servers.append(server)
+        return server.port
+
+    yield start
+    for server in servers:
+        server.stop()
+
+def test_not_ready_until_first_cycle_succeeds(serve):
+    pipeline = PipelineStatus()
+    port = serve(pipeline)
+    assert _get(port, "/healthz")[0] == 200  # still inside the startup window
+    code, body = _get(port, "/readyz")
+    assert code == 503
+    assert body["db_latency_ms"] is not None
+
+    pipeline.cycle_started()
+    pipeline.stage("to_post", 4)
+    pipeline.count("shed", 2)
+    pipeline.cycle_succeeded()
+    code, body = _get(port, "/readyz")
+    assert code == 200
+    assert body["stages"] == {"to_post": 4}
+    assert body["totals"] == {"shed": 2}
+    assert body["since_last_success"] < 5
+
+def test_liveness_fails_when_cycles_stop_succeeding(serve):
+    pipeline = PipelineStatus()
+    pipeline.last_success_at = pipeline.started_at = 0.0
+    port = serve(pipeline)
+    code, body = _get(port, "/healthz")
+    assert code == 503
+    assert body["ok"] is False
+
+def test_open_circuits_make_instance_unready(serve):
+    pipeline = PipelineStatus()
+    pipeline.cycle_succeeded()
+    translator = _Component({"gemma": {"circuit": "open"}, "deepl": {"circuit": "closed"}})
+    poster = _Component({"circuit": "closed"})
+    port = serve(pipeline, translator, [poster])
+    code, body = _get(port, "/readyz")
+    assert code == 200
+    assert body["translator"]["gemma"]["circuit"] == "open"
+
+    translator._stats["deepl"]["circuit"] = "open"
+    assert _get(port, "/readyz")[0] == 503
+    translator._stats["deepl"]["circuit"] = "closed"
+    poster._stats["circuit"] = "open"
+    code, body = _get(port, "/readyz")
+    assert code == 503
+    assert body["telegram"] == {"@ru": {"circuit": "open"}}
+    assert _get(port, "/healthz")[0] == 200
+
+def test_reports_http_stats(serve):
+    port = serve(PipelineStatus(), http=_Component({"dns": {"hits": 3, "misses": 1}}))
+    assert _get(port, "/healthz")[1]["http"] == {"dns": {"hits": 3, "misses": 1}}
+
+def test_unknown_path_is_404(serve):
+    port = serve(PipelineStatus())
+    with pytest.raises(urllib.error.HTTPError) as e:
+        urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5)
+    assert e.value.code == 404
+
+def test_probe_checks_healthz_or_db_when_disabled(serve, db_path, tmp_path):
+    pipeline = PipelineStatus()
+    probe(serve(pipeline), db_path)
+    stale = serve(pipeline, max_cycle_age=0)
+    with pytest.raises(urllib.error.HTTPError):
+        probe(stale, db_path)
+    probe(0, db_path)  # HEALTH_PORT=0: only the DB is checked
+    with pytest.raises(sqlite3.OperationalError):
+        probe(0, str(tmp_path / "missing.db"))
@@ -0,0 +1,35 @@
+# tests/test_main.py
+from unittest.mock import AsyncMock
+
+import pytest
+
+import bot.main as main_mod
+
+
+@pytest.fixture(autouse=True)
+def health_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(main_mod, "_HEALTH_CACHE_PATH", str(tmp_path / "health.json"))
+
+def test_build_translator_stub_by_name(monkeypatch):
+    from bot.translator.stub import StubTranslator
+    monkeypatch.setattr(main_mod, "_TRANSLATOR", "stub")
+    assert isinstance(main_mod._build_translator(), StubTranslator)
+
+def test_build_translator_rejects_unknown(monkeypatch):
+    monkeypatch.setattr(main_mod, "_TRANSLATOR", "nope")
+    with pytest.raises(RuntimeError, match="Unknown TRANSLATOR"):
+        main_mod._build_translator()
+
+@pytest.mark.asyncio
+async def test_health_checks_cached_between_restarts():
+    check = AsyncMock()
+    await main_mod._run_health_checks({"ollama": check})
+    await main_mod._run_health_checks({"ollama": check})
+    check.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_failed_health_check_raises_and_is_not_cached():
+    failing = AsyncMock(side_effect=RuntimeError("down"))
+    with pytest.raises(RuntimeError):
+        await main_mod._run_health_checks({"ollama": failing})
+    assert main_mod._load_health_cache() == {}
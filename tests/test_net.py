@@ -0,0 +1,125 @@
+# tests/test_net.py
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpcore
+import httpx
+import pytest
+
+from bot import net
+
+
+def _mock(handler) -> net.Http:
+    return net.Http(transport=httpx.MockTransport(handler))
+
+
+async def test_dns_cache_hits_within_ttl():
+    dns = net.DnsCache(ttl=60)
+    first = await dns.resolve("localhost", 80)
+    assert await dns.resolve("localhost", 80) == first
+    assert (dns.hits, dns.misses) == (1, 1)
+
+
+async def test_dns_cache_serves_stale_answer_when_lookup_fails(monkeypatch):
+    dns = net.DnsCache(ttl=0)
+    first = await dns.resolve("localhost", 80)
+
+    async def failing(*args, **kwargs):
+        raise OSError("no resolver")
+
+    loop = net.asyncio.get_running_loop()
+    monkeypatch.setattr(loop, "getaddrinfo", failing)
+    assert await dns.resolve("localhost", 80) == first
+    with pytest.raises(httpcore.ConnectError):
+        await dns.resolve("example.invalid", 80)
+
+
+async def test_post_is_retried_only_when_not_sent():
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        if len(calls) == 1:
+            raise httpx.ConnectError("refused")
+        raise httpx.ReadTimeout("slow")
+
+    http = _mock(handler)
+    with pytest.raises(httpx.ReadTimeout):
+        await http.post("https://ollama.local/api/generate", json={}, retries=2)
+    assert calls == ["POST", "POST"]  # the read timeout may have reached the server
+    assert http.stats()["ollama.local"]["retries"] == 1
+
+
+async def test_get_is_retried_on_read_timeout():
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        if len(calls) == 1:
+            raise httpx.ReadTimeout("slow")
+        return httpx.Response(200, content=b"ok")
+
+    http = _mock(handler)
+    response = await http.get("https://telex.hu/rss", retries=1)
+    assert response.content == b"ok"
+    stats = http.stats()["telex.hu"]
+    assert (stats["requests"], stats["errors"], stats["retries"]) == (1, 1, 1)
+
+
+async def test_stats_are_per_host_and_count_stream_bytes():
+    async def body():
+        yield b"x" * 4
+        yield b"x" * 6
+
+    def handler(request):
+        if request.url.host == "telex.hu":
+            return httpx.Response(200, content=body())
+        return httpx.Response(404 if "missing" in request.url.path else 200, content=b"x" * 10)
+
+    http = _mock(handler)
+    await http.get("https://hvg.hu/rss")
+    await http.get("https://hvg.hu/missing")
+    async with http.stream("GET", "https://telex.hu/rss") as response:
+        async for _ in response.aiter_bytes():
+            pass
+    stats = http.stats()
+    assert stats["hvg.hu"]["statuses"] == {200: 1, 404: 1}
+    assert stats["hvg.hu"]["bytes_in"] == 20
+    assert stats["telex.hu"]["bytes_in"] == 10
+    assert stats["telex.hu"]["latency_ms"] is not None
+    await http.aclose()
+
+
+@pytest.fixture
+def server():
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, format, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv.server_address[1]
+    srv.shutdown()
+    srv.server_close()
+
+
+async def test_connections_use_cached_dns(server):
+    http = net.Http(dns_ttl=60)
+    try:
+        for _ in range(3):
+            assert (await http.get(f"http://localhost:{server}/")).content == b"ok"
+        # one lookup; the keep-alive connection is reused, so later requests do not even resolve
+        assert http.dns.misses == 1
+        await http.get(f"http://localhost:{server}/", headers={"Connection": "close"})
+        await http.get(f"http://localhost:{server}/")
+        assert http.dns.misses == 1 and http.dns.hits >= 1
+    finally:
+        await http.aclose()
@@ -73,3 +73,69 @@ async def test_poster_escapes_html_in_summary_and_source():
     assert "&lt;b&gt;" in text
     assert "&amp;B" in text
     assert 'href="https://example.com/a?b=1&amp;c=2"' in text
+
+@pytest.mark.asyncio
+async def test_poster_returns_message_id():
+    mock_bot = MagicMock()
+    mock_bot.send_message = AsyncMock(return_value=MagicMock(message_id=17))
+    poster = Poster(bot=mock_bot, channel_id="@testchannel")
+    assert await poster.post(summary="Новость", url="https://example.com") == 17
+
+@pytest.mark.asyncio
+async def test_poster_renders_extra_source_links():
+    mock_bot = MagicMock()
+    mock_bot.send_message = AsyncMock()
+    poster = Poster(bot=mock_bot, channel_id="@testchannel")
+    await poster.post(summary="Новость", url="https://telex.hu/1", source="Telex",
+                      extra_links=[("https://hvg.hu/1", "HVG")])
+    text = mock_bot.send_message.call_args.kwargs["text"]
+    assert text.endswith('<a href="https://telex.hu/1">Telex</a> · <a href="https://hvg.hu/1">HVG</a>')
+
+@pytest.mark.asyncio
+async def test_poster_edit_rewrites_message_with_links():
+    mock_bot = MagicMock()
+    mock_bot.edit_message_text = AsyncMock()
+    poster = Poster(bot=mock_bot, channel_id="@testchannel")
+    await poster.edit(5, "Новость", [("https://telex.hu/1", "Telex"), ("https://444.hu/1", "444")])
+    call_kwargs = mock_bot.edit_message_text.call_args.kwargs
+    assert call_kwargs["message_id"] == 5
+    assert call_kwargs["chat_id"] == "@testchannel"
+    assert '<a href="https://444.hu/1">444</a>' in call_kwargs["text"]
+
+@pytest.mark.asyncio
+async def test_post_digest_packs_items_under_length_limit():
+    mock_bot = MagicMock()
+    mock_bot.send_message = AsyncMock(side_effect=[MagicMock(message_id=1), MagicMock(message_id=2)])
+    poster = Poster(bot=mock_bot, channel_id="@testchannel")
+    items = [
+        (f"Новость {i}: " + "текст " * 60, [(f"https://telex.hu/{i}", "Telex")], ["#политика"])
+        for i in range(12)
+    ]
+    message_ids = await poster.post_digest(items)
+    assert message_ids == [1, 2]
+    texts = [call.kwargs["text"] for call in mock_bot.send_message.call_args_list]
+    assert all(len(text) <= 4096 for text in texts)
+    joined = "".join(texts)
+    assert [joined.index(f"Новость {i}:") for i in range(12)] == sorted(joined.index(f"Новость {i}:") for i in range(12))
+    assert all(f'href="https://telex.hu/{i}">Telex</a>' in joined for i in range(12))
+
+@pytest.mark.asyncio
+async def test_post_digest_single_message_for_short_items():
+    mock_bot = MagicMock()
+    mock_bot.send_message = AsyncMock(return_value=MagicMock(message_id=7))
+    poster = Poster(bot=mock_bot, channel_id="@testchannel")
+    await poster.post_digest([("A", [("https://a.hu/1", "A")], None), ("B", [("https://b.hu/1", "B")], None)])
+    mock_bot.send_message.assert_called_once()
+    assert mock_bot.send_message.call_args.kwargs["parse_mode"] == "HTML"
+
+@pytest.mark.asyncio
+async def test_poster_stats_report_open_circuit_after_failure():
+    mock_bot = MagicMock()
+    mock_bot.send_message = AsyncMock(side_effect=[RuntimeError("network"), MagicMock(message_id=1)])
+    poster = Poster(bot=mock_bot, channel_id="@testchannel")
+    assert poster.stats()["circuit"] == "closed"
+    with pytest.raises(RuntimeError):
+        await poster.post(summary="Новость", url="https://example.com")
+    assert poster.stats()["circuit"] == "open"
+    await poster.post(summary="Новость", url="https://example.com")
+    assert poster.stats()["circuit"] == "closed"
@@ -0,0 +1,75 @@
+# tests/test_profiling.py
+import asyncio
+import time
+
+import pytest
+
+from bot.profiling import Profiler, StackSampler
+
+
+def _busy_leaf(seconds: float):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+def test_sampler_writes_collapsed_stacks(tmp_path):
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    _busy_leaf(0.2)
+    samples = sampler.stop()
+    assert any("_busy_leaf" in stack for stack in samples)
+    path = tmp_path / "out.folded"
+    sampler.write(str(path))
+    lines = [line.rsplit(" ", 1) for line in path.read_text().splitlines()]
+    assert all(int(count) > 0 for _, count in lines)
+    assert any(stack.startswith("MainThread;") and "_busy_leaf" in stack for stack, _ in lines)
+
+def test_from_env_reads_settings_when_called(tmp_path, monkeypatch):
+    # set after bot.profiling was imported, as main's load_dotenv does
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("SLOW_CALLBACK", "0.5")
+    profiler = Profiler.from_env()
+    assert profiler.out_dir == str(tmp_path)
+    assert profiler._slow_callback == 0.5
+
+@pytest.mark.asyncio
+async def test_cycle_is_noop_when_disabled(tmp_path):
+    profiler = Profiler(out_dir=str(tmp_path / "profile"))
+    async with profiler.cycle():
+        pass
+    assert not (tmp_path / "profile").exists()
+
+@pytest.mark.asyncio
+async def test_wrapped_cycles_write_profiles_and_memory_diff(tmp_path):
+    profiler = Profiler(out_dir=str(tmp_path), interval=0.001)
+    profiler.enable()
+    try:
+        async def run_once(n):
+            _busy_leaf(0.05)
+            return [bytearray(1024) for _ in range(n)]
+
+        cycle = profiler.wrap(run_once)
+        assert len(await cycle(10)) == 10
+        await asyncio.sleep(1.1)  # next cycle gets a new timestamp
+        kept = await cycle(1000)
+    finally:
+        profiler.disable()
+    assert len(kept) == 1000
+    folded = sorted(tmp_path.glob("cycle-*.folded"))
+    diffs = sorted(tmp_path.glob("tracemalloc-*.txt"))
+    assert len(folded) == 2 and len(diffs) == 2
+    assert "_busy_leaf" in folded[0].read_text()
+    assert "growth since previous cycle" in diffs[1].read_text()
+
+@pytest.mark.asyncio
+async def test_toggle_reports_loop_lag_and_slow_callbacks(tmp_path):
+    profiler = Profiler(out_dir=str(tmp_path), slow_callback=0.05)
+    profiler.toggle()
+    assert asyncio.get_running_loop().get_debug()
+    await asyncio.sleep(0.1)
+    time.sleep(0.6)  # noqa: ASYNC251 - block the loop past the lag monitor's wake-up
+    await asyncio.sleep(0.1)
+    profiler.toggle()
+    assert not asyncio.get_running_loop().get_debug()
+    assert profiler.max_lag > 0.05
+    assert "took" in (tmp_path / "slow_callbacks.log").read_text()
@@ -0,0 +1,102 @@
+# tests/test_replay.py
+import json
+import time
+
+import pytest
+
+from bot import scheduler
+from bot.db import Database
+from bot.replay import DryRunPoster, read_archive, replay
+from bot.translator.stub import StubTranslator
+
+_RSS = (
+    '<?xml version="1.0"?><rss version="2.0"><channel><title>Telex</title>'
+    '<item><title>Emelkednek az adók</title><link>https://telex.hu/1</link></item>'
+    '<item><title>Esős hétvége jön</title><link>https://telex.hu/2</link></item>'
+    '</channel></rss>'
+)
+
+
+@pytest.fixture
+def archive(tmp_path):
+    (tmp_path / "telex.xml").write_text(_RSS, encoding="utf-8")
+    lines = [
+        {"title": "Emelkednek az adók", "url": "https://g7.hu/1", "source": "G7"},  # same story
+        {"title": "Új metróvonal Budapesten", "url": "https://hvg.hu/1", "source": "HVG",
+         "published_at": time.time() - 3600},
+        {"url": "https://broken"},  # missing title, skipped
+    ]
+    (tmp_path / "dump.jsonl").write_text("\n".join(json.dumps(x) for x in lines), encoding="utf-8")
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_read_archive_reads_rss_and_jsonl(archive):
+    articles = [a async for a in read_archive(archive)]
+    assert sorted(a.url for a in articles) == [
+        "https://g7.hu/1", "https://hvg.hu/1", "https://telex.hu/1", "https://telex.hu/2",
+    ]
+    assert {a.source for a in articles} == {"Telex", "G7", "HVG"}
+
+
+@pytest.mark.asyncio
+async def test_replay_dedups_and_posts_dry_run(archive, tmp_path):
+    db = Database(tmp_path / "replay.db")
+    await db.init()
+    poster = DryRunPoster()
+    stats = await replay(archive, db, StubTranslator(), poster, batch_size=2)
+    assert stats["articles"] == 4
+    assert stats["posts"] == 3
+    assert await db.is_seen("https://g7.hu/1")
+
+    # replaying the same archive again posts nothing new
+    again = DryRunPoster()
+    await replay(archive, db, StubTranslator(), again)
+    assert again.posts == 0
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_replay_leaves_scheduler_settings_alone(archive, tmp_path):
+    before = {name: getattr(scheduler, name) for name in ("_CYCLE_BUDGET", "_MAX_PER_CYCLE", "_POST_DELAY")}
+    db = Database(tmp_path / "replay.db")
+    await db.init()
+    await replay(archive, db, StubTranslator(), DryRunPoster())
+    assert {name: getattr(scheduler, name) for name in before} == before
+    assert not db.archive_time
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_replay_windows_follow_archive_time(tmp_path):
+    day = 86400.0
+    lines = [
+        {"title": "Emelkednek az adók", "url": "https://telex.hu/1", "source": "Telex", "published_at": day},
+        {"title": "Emelkednek az adók", "url": "https://hvg.hu/1", "source": "HVG", "published_at": day + 3600},
+        # the same headline three days later is a new story, not a duplicate
+        {"title": "Emelkednek az adók", "url": "https://telex.hu/2", "source": "Telex", "published_at": 4 * day},
+    ]
+    (tmp_path / "dump.jsonl").write_text("\n".join(json.dumps(x) for x in lines), encoding="utf-8")
+    db = Database(tmp_path / "replay.db")
+    await db.init()
+    poster = DryRunPoster()
+    await replay(tmp_path / "dump.jsonl", db, StubTranslator(), poster, batch_size=1)
+    assert poster.posts == 2
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_replay_leaves_live_queues_alone(archive, tmp_path):
+    db = Database(tmp_path / "seen.db")
+    await db.init()
+    pending = ("Függő cikk", "https://444.hu/1", "444", 5.0, "", "")
+    deferred = ("Halasztott cikk", "https://444.hu/2", "444", 6.0, "", "")
+    await db.replace_pending([pending])
+    await db.replace_backlog([deferred])
+    poster = DryRunPoster()
+    stats = await replay(archive, db, StubTranslator(), poster)
+    assert stats["posts"] == 3  # archive articles only
+    assert await db.pending_articles() == [pending]
+    assert await db.backlog_articles() == [deferred]
+    assert not await db.is_seen("https://444.hu/1")
+    await db.close()
@@ -0,0 +1,90 @@
+# tests/test_router.py
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from bot.translator.base import Translator
+from bot.translator.router import RoutingTranslator
+
+
+class FakeTranslator(Translator):
+    def __init__(self, result="перевод", delay=0.0, error=None):
+        self.result = result
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def translate(self, text, source_lang="HU", target_lang="RU"):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def test_router_requires_backends():
+    with pytest.raises(ValueError):
+        RoutingTranslator({})
+
+@pytest.mark.asyncio
+async def test_fails_over_to_next_backend():
+    dead = FakeTranslator(error=ConnectionError("down"))
+    ok = FakeTranslator(result="ok")
+    router = RoutingTranslator({"gemma": dead, "deepl": ok}, hedge=False)
+    assert await router.translate("szöveg") == "ok"
+    assert dead.calls == 1
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_skips_dead_backend():
+    dead = FakeTranslator(error=ConnectionError("down"))
+    ok = FakeTranslator(result="ok")
+    router = RoutingTranslator({"gemma": dead, "deepl": ok}, failure_threshold=1, hedge=False)
+    for _ in range(3):
+        await router.translate("szöveg")
+    assert dead.calls == 1
+    assert router.stats()["gemma"]["circuit"] == "open"
+
+@pytest.mark.asyncio
+async def test_prefers_faster_backend():
+    slow = FakeTranslator(result="slow")
+    fast = FakeTranslator(result="fast")
+    router = RoutingTranslator({"slow": slow, "fast": fast}, hedge=False)
+    router._backends[0].latencies.extend([2.0] * 5)
+    router._backends[1].latencies.extend([0.1] * 5)
+    assert await router.translate("a") == "fast"
+    assert slow.calls == 0
+
+@pytest.mark.asyncio
+async def test_hedges_slow_primary_after_p95(monkeypatch):
+    monkeypatch.setattr("bot.translator.router._MIN_HEDGE_DELAY", 0.01)
+    primary = FakeTranslator(result="primary", delay=1.0)
+    backup = FakeTranslator(result="backup")
+    router = RoutingTranslator({"primary": primary, "backup": backup})
+    router._backends[0].latencies.extend([0.01] * 10)
+    router._backends[1].latencies.extend([0.5] * 10)
+    assert await router.translate("x") == "backup"
+    assert primary.calls == 1
+
+@pytest.mark.asyncio
+async def test_raises_last_error_when_all_fail():
+    router = RoutingTranslator({"a": FakeTranslator(error=ValueError("boom"))}, hedge=False)
+    with pytest.raises(ValueError, match="boom"):
+        await router.translate("x")
+
+@pytest.mark.asyncio
+async def test_generate_routes_only_to_backends_with_generate():
+    deepl_like = FakeTranslator()
+    llm = FakeTranslator()
+    llm.generate = AsyncMock(return_value="политика")
+    router = RoutingTranslator({"deepl": deepl_like, "gemma": llm})
+    assert await router.generate("prompt") == "политика"
+
+@pytest.mark.asyncio
+async def test_close_closes_all_backends():
+    a, b = FakeTranslator(), FakeTranslator()
+    a.close = AsyncMock()
+    b.close = AsyncMock()
+    await RoutingTranslator({"a": a, "b": b}).close()
+    a.close.assert_awaited_once()
+    b.close.assert_awaited_once()
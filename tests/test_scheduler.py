@@ -1,4 +1,5 @@
 # tests/test_scheduler.py
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -6,21 +7,45 @@ import pytest
 import bot.scheduler as scheduler_mod
 from bot.feeds import Article
 from bot.scheduler import run_once
+from bot.translator.gemma import GemmaTranslator
 
 
 @pytest.fixture(autouse=True)
 def reset_prune_counter():
     scheduler_mod._prune_fail_count = 0
 
-def make_article(url="https://telex.hu/1", title="Teszt cikk", source="Telex"):
-    return Article(title=title, url=url, source=source)
+@pytest.fixture(autouse=True)
+def default_budget(monkeypatch):
+    monkeypatch.setattr(scheduler_mod, "_CYCLE_BUDGET", 240.0)
+
+@pytest.fixture(autouse=True)
+def no_age_cutoff(monkeypatch):
+    # test articles use small fixed publish times
+    monkeypatch.setattr(scheduler_mod, "_MAX_ARTICLE_AGE", 0.0)
+
+def make_article(url="https://telex.hu/1", title="Teszt cikk", source="Telex", published_at=0.0,
+                 guid="", description=""):
+    return Article(title=title, url=url, source=source, published_at=published_at,
+                   guid=guid, description=description)
+
+def stream(articles):
+    async def fake_fetch_all():
+        for article in articles:
+            yield article
+    return fake_fetch_all
 
 def make_deps(articles=None):
     db = MagicMock()
     db.prune = AsyncMock()
     db.is_seen = AsyncMock(return_value=False)
     db.find_similar = AsyncMock(return_value=None)
+    db.recent_source_titles = AsyncMock(return_value=[])
+    db.pending_articles = AsyncMock(return_value=[])
+    db.replace_pending = AsyncMock()
+    db.backlog_articles = AsyncMock(return_value=[])
+    db.replace_backlog = AsyncMock()
     db.mark_seen = AsyncMock()
+    db.claim = AsyncMock(return_value=True)
 
     translator = MagicMock()
     translator.translate = AsyncMock(return_value="Тестовая статья")
@@ -39,7 +64,7 @@ async def test_skips_already_seen_article():
     db, translator, poster_ru, articles = make_deps()
     db.is_seen = AsyncMock(return_value=True)
 
-    with patch("bot.scheduler.fetch_all", return_value=articles):
+    with patch("bot.scheduler.fetch_all", new=stream(articles)):
         await run_once(db, translator, poster_ru)
 
     translator.translate.assert_not_called()
@@ -49,7 +74,7 @@ async def test_skips_already_seen_article():
 async def test_posts_new_article():
     db, translator, poster_ru, articles = make_deps()
 
-    with patch("bot.scheduler.fetch_all", return_value=articles), \
+    with patch("bot.scheduler.fetch_all", new=stream(articles)), \
          patch("asyncio.sleep", new_callable=AsyncMock):
             await run_once(db, translator, poster_ru)
 
@@ -62,22 +87,28 @@ async def test_posts_new_article():
 async def test_marks_seen_after_posting():
     db, translator, poster_ru, articles = make_deps()
 
-    with patch("bot.scheduler.fetch_all", return_value=articles), \
+    with patch("bot.scheduler.fetch_all", new=stream(articles)), \
          patch("asyncio.sleep", new_callable=AsyncMock):
             await run_once(db, translator, poster_ru)
 
-    db.mark_seen.assert_called_once_with(articles[0].url, title="Тестовая статья")
+    db.claim.assert_called_once_with(
+        articles[0].url, title="Тестовая статья", source_title=articles[0].title,
+        guid=articles[0].guid, published_at=articles[0].published_at, source=articles[0].source,
+    )
 
 @pytest.mark.asyncio
 async def test_skips_duplicate_and_marks_seen():
     db, translator, poster_ru, articles = make_deps()
     db.find_similar = AsyncMock(return_value="Похожая статья уже была")
 
-    with patch("bot.scheduler.fetch_all", return_value=articles):
+    with patch("bot.scheduler.fetch_all", new=stream(articles)):
         await run_once(db, translator, poster_ru)
 
     poster_ru.post.assert_not_called()
-    db.mark_seen.assert_called_once_with(articles[0].url, title="Тестовая статья")
+    db.mark_seen.assert_called_once_with(
+        articles[0].url, title="Тестовая статья", source_title=articles[0].title,
+        guid=articles[0].guid, published_at=articles[0].published_at, source=articles[0].source,
+    )
 
 @pytest.mark.asyncio
 async def test_continues_after_error_on_one_article():
@@ -87,7 +118,7 @@ async def test_continues_after_error_on_one_article():
     translator.translate = AsyncMock(side_effect=["Первая статья", "Вторая статья"])
     poster_ru.post = AsyncMock(side_effect=[Exception("Telegram error"), None])
 
-    with patch("bot.scheduler.fetch_all", return_value=[article1, article2]), \
+    with patch("bot.scheduler.fetch_all", new=stream([article1, article2])), \
          patch("asyncio.sleep", new_callable=AsyncMock):
             await run_once(db, translator, poster_ru)
 
@@ -103,12 +134,12 @@ async def test_processes_multiple_articles():
     db, translator, poster_ru, _ = make_deps(articles)
     translator.translate = AsyncMock(side_effect=["Первая", "Вторая", "Третья"])
 
-    with patch("bot.scheduler.fetch_all", return_value=articles), \
+    with patch("bot.scheduler.fetch_all", new=stream(articles)), \
          patch("asyncio.sleep", new_callable=AsyncMock):
             await run_once(db, translator, poster_ru)
 
     assert poster_ru.post.call_count == 3
-    assert db.mark_seen.call_count == 3
+    assert db.claim.call_count == 3
 
 @pytest.mark.asyncio
 async def test_skips_batch_duplicate():
@@ -121,18 +152,19 @@ async def test_skips_batch_duplicate():
         "Венгрия повысила налоги на доходы граждан",  # very similar (89% match)
     ])
 
-    with patch("bot.scheduler.fetch_all", return_value=[article1, article2]), \
+    with patch("bot.scheduler.fetch_all", new=stream([article1, article2])), \
          patch("asyncio.sleep", new_callable=AsyncMock):
             await run_once(db, translator, poster_ru)
 
     # Only first article posted; second skipped as batch duplicate
     assert poster_ru.post.call_count == 1
-    # article2 marked seen during Phase 3, article1 marked seen during Phase 4
-    assert db.mark_seen.call_count == 2
+    # article2 marked seen during Phase 3, article1 claimed during Phase 4
+    assert db.mark_seen.call_count == 1
+    assert db.claim.call_count == 1
 
 @pytest.mark.asyncio
 async def test_seen_urls_checked_in_parallel():
-    """Phase 2 checks all URLs in parallel via asyncio.gather."""
+    """Phase 2 checks streamed URLs in parallel chunks via asyncio.gather."""
     articles = [
         make_article(url="https://telex.hu/1"),
         make_article(url="https://telex.hu/2"),
@@ -142,7 +174,7 @@ async def test_seen_urls_checked_in_parallel():
     db.is_seen = AsyncMock(side_effect=[True, False])
     translator.translate = AsyncMock(return_value="Новая статья")
 
-    with patch("bot.scheduler.fetch_all", return_value=articles), \
+    with patch("bot.scheduler.fetch_all", new=stream(articles)), \
          patch("asyncio.sleep", new_callable=AsyncMock):
             await run_once(db, translator, poster_ru)
 
@@ -155,11 +187,11 @@ async def test_marks_seen_before_post_to_prevent_duplicates():
     db, translator, poster_ru, articles = make_deps()
     poster_ru.post = AsyncMock(side_effect=Exception("Telegram error"))
 
-    with patch("bot.scheduler.fetch_all", return_value=articles):
+    with patch("bot.scheduler.fetch_all", new=stream(articles)):
         await run_once(db, translator, poster_ru)
 
-    # mark_seen called before post attempt to guarantee dedup
-    db.mark_seen.assert_called_once()
+    # claimed (marked seen) before post attempt to guarantee dedup
+    db.claim.assert_called_once()
     poster_ru.post.assert_called_once()
 
 @pytest.mark.asyncio
@@ -178,7 +210,7 @@ async def test_posts_to_english_channel_when_poster_en_set():
     # First call: RU translation, second call: EN translation
     translator.translate = AsyncMock(side_effect=["Тестовая статья", "Test article"])
 
-    with patch("bot.scheduler.fetch_all", return_value=articles), \
+    with patch("bot.scheduler.fetch_all", new=stream(articles)), \
          patch("asyncio.sleep", new_callable=AsyncMock):
         await run_once(db, translator, poster_ru, poster_en)
 
@@ -195,7 +227,7 @@ async def test_english_channel_failure_does_not_block_ru_post():
     poster_en.post = AsyncMock(side_effect=Exception("EN channel error"))
     translator.translate = AsyncMock(side_effect=["Тестовая статья", "Test article"])
 
-    with patch("bot.scheduler.fetch_all", return_value=articles), \
+    with patch("bot.scheduler.fetch_all", new=stream(articles)), \
          patch("asyncio.sleep", new_callable=AsyncMock):
         await run_once(db, translator, poster_ru, poster_en)
 
@@ -205,9 +237,410 @@ async def test_english_channel_failure_does_not_block_ru_post():
 async def test_no_english_channel_by_default():
     db, translator, poster_ru, articles = make_deps()
 
-    with patch("bot.scheduler.fetch_all", return_value=articles), \
+    with patch("bot.scheduler.fetch_all", new=stream(articles)), \
          patch("asyncio.sleep", new_callable=AsyncMock):
         await run_once(db, translator, poster_ru)
 
     # Only one translate call (RU), no EN translation
     translator.translate.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_skips_source_title_duplicate_before_translation():
+    db, translator, poster_ru, articles = make_deps()
+    db.recent_source_titles = AsyncMock(return_value=["Teszt cikk"])
+
+    with patch("bot.scheduler.fetch_all", new=stream(articles)):
+        await run_once(db, translator, poster_ru)
+
+    translator.translate.assert_not_called()
+    poster_ru.post.assert_not_called()
+    db.mark_seen.assert_called_once_with(
+        articles[0].url, title="", source_title=articles[0].title,
+        guid=articles[0].guid, published_at=articles[0].published_at, source=articles[0].source,
+    )
+
+@pytest.mark.asyncio
+async def test_skips_source_title_batch_duplicate_before_translation():
+    # Same headline re-posted by Telex and G7 under different URLs
+    article1 = make_article(url="https://telex.hu/1", title="Emelkednek az adók")
+    article2 = make_article(url="https://telex.hu/g7/1", title="Emelkednek az adók", source="G7")
+    db, translator, poster_ru, _ = make_deps([article1, article2])
+
+    with patch("bot.scheduler.fetch_all", new=stream([article1, article2])), \
+         patch("asyncio.sleep", new_callable=AsyncMock):
+        await run_once(db, translator, poster_ru)
+
+    translator.translate.assert_called_once()
+    assert poster_ru.post.call_count == 1
+
+@pytest.mark.asyncio
+async def test_skips_semantic_duplicate_when_deduper_set():
+    db, translator, poster_ru, articles = make_deps()
+    deduper = MagicMock()
+    deduper.find_similar = AsyncMock(return_value="Похожая статья")
+
+    with patch("bot.scheduler.fetch_all", new=stream(articles)):
+        await run_once(db, translator, poster_ru, deduper=deduper)
+
+    poster_ru.post.assert_not_called()
+    deduper.add.assert_not_called()
+    deduper.save.assert_called_once()
+
+def make_clusterer(match=None, messages=None):
+    clusterer = MagicMock()
+    clusterer.load = AsyncMock()
+    clusterer.match = MagicMock(return_value=match)
+    clusterer.match_source = MagicMock(return_value=None)
+    clusterer.create = AsyncMock(return_value=1)
+    clusterer.attach = AsyncMock(return_value=[("https://telex.hu/0", "Telex"), ("https://telex.hu/1", "Telex")])
+    clusterer.messages = AsyncMock(return_value=messages or [])
+    clusterer.set_message = AsyncMock()
+    return clusterer
+
+@pytest.mark.asyncio
+async def test_cluster_match_edits_existing_post():
+    db, translator, poster_ru, articles = make_deps()
+    poster_ru.channel_id = "@ru"
+    poster_ru.edit = AsyncMock()
+    clusterer = make_clusterer(match=7, messages=[("@ru", 99, "Старая сводка", ["#политика"])])
+
+    with patch("bot.scheduler.fetch_all", new=stream(articles)):
+        await run_once(db, translator, poster_ru, clusterer=clusterer)
+
+    poster_ru.post.assert_not_called()
+    clusterer.attach.assert_awaited_once_with(7, articles[0].url, articles[0].source, articles[0].title)
+    # the edit re-renders the post, so the hashtags stored with it must be passed back
+    poster_ru.edit.assert_awaited_once_with(
+        99, "Старая сводка", clusterer.attach.return_value, ["#политика"]
+    )
+
+@pytest.mark.asyncio
+async def test_source_title_duplicate_joins_batch_cluster():
+    article1 = make_article(url="https://telex.hu/1", title="A kormány emelte az adókat")
+    article2 = make_article(url="https://g7.hu/1", title="A kormány emelte az adókat!", source="G7")
+    db, translator, poster_ru, _ = make_deps([article1, article2])
+    poster_ru.channel_id = "@ru"
+    clusterer = make_clusterer()
+    clusterer.match_source = MagicMock(side_effect=lambda title: 1 if title == article1.title else None)
+
+    with patch("bot.scheduler.fetch_all", new=stream([article1, article2])), \
+         patch("asyncio.sleep", new_callable=AsyncMock):
+        await run_once(db, translator, poster_ru, clusterer=clusterer)
+
+    # the copy is never translated, but its link still lands in the story's post
+    translator.translate.assert_awaited_once()
+    clusterer.attach.assert_awaited_once_with(1, article2.url, "G7", article2.title)
+    assert poster_ru.post.call_args.kwargs["extra_links"] == [(article2.url, "G7")]
+    assert db.mark_seen.call_args.args[0] == article2.url
+
+@pytest.mark.asyncio
+async def test_source_title_duplicate_edits_posted_cluster():
+    articles = [make_article(url="https://g7.hu/1", title="A kormány emelte az adókat", source="G7")]
+    db, translator, poster_ru, _ = make_deps(articles)
+    db.recent_source_titles = AsyncMock(return_value=["A kormány emelte az adókat"])
+    poster_ru.channel_id = "@ru"
+    poster_ru.edit = AsyncMock()
+    clusterer = make_clusterer(messages=[("@ru", 99, "Старая сводка", ["#экономика"])])
+    clusterer.match_source = MagicMock(return_value=7)
+
+    with patch("bot.scheduler.fetch_all", new=stream(articles)):
+        await run_once(db, translator, poster_ru, clusterer=clusterer)
+
+    translator.translate.assert_not_called()
+    poster_ru.post.assert_not_called()
+    clusterer.attach.assert_awaited_once_with(7, articles[0].url, "G7", articles[0].title)
+    poster_ru.edit.assert_awaited_once_with(
+        99, "Старая сводка", clusterer.attach.return_value, ["#экономика"]
+    )
+
+@pytest.mark.asyncio
+async def test_cluster_batch_sources_go_into_one_post():
+    article1 = make_article(url="https://telex.hu/1", title="Első")
+    article2 = make_article(url="https://hvg.hu/1", title="Második", source="HVG")
+    db, translator, poster_ru, _ = make_deps([article1, article2])
+    poster_ru.channel_id = "@ru"
+    poster_ru.post = AsyncMock(return_value=55)
+    translator.translate = AsyncMock(side_effect=["Налоги растут", "Налоги растут снова"])
+    clusterer = make_clusterer()
+    clusterer.match = MagicMock(side_effect=[None, 1])
+
+    with patch("bot.scheduler.fetch_all", new=stream([article1, article2])), \
+         patch("asyncio.sleep", new_callable=AsyncMock):
+        await run_once(db, translator, poster_ru, clusterer=clusterer)
+
+    poster_ru.post.assert_called_once()
+    assert poster_ru.post.call_args.kwargs["extra_links"] == [("https://hvg.hu/1", "HVG")]
+    clusterer.set_message.assert_awaited_once_with(1, "@ru", 55, "Налоги растут", [])
+
+@pytest.mark.asyncio
+async def test_tags_whole_batch_with_tagger():
+    articles = [
+        make_article(url="https://telex.hu/1", title="Első"),
+        make_article(url="https://telex.hu/2", title="Második"),
+    ]
+    db, translator, poster_ru, _ = make_deps(articles)
+    translator.translate = AsyncMock(side_effect=["Первая", "Вторая"])
+    tagger = MagicMock()
+    tagger.tag_many = AsyncMock(return_value=[["#спорт"], ["#культура"]])
+
+    with patch("bot.scheduler.fetch_all", new=stream(articles)), \
+         patch("asyncio.sleep", new_callable=AsyncMock):
+        await run_once(db, translator, poster_ru, tagger=tagger)
+
+    tagger.tag_many.assert_awaited_once_with(["Первая", "Вторая"])
+    assert [c.kwargs["tags"] for c in poster_ru.post.call_args_list] == [["#спорт"], ["#культура"]]
+
+@pytest.mark.asyncio
+async def test_newest_articles_processed_first():
+    old = make_article(url="https://telex.hu/old", title="Régi", published_at=100.0)
+    new = make_article(url="https://telex.hu/new", title="Friss", published_at=200.0)
+    db, translator, poster_ru, _ = make_deps([old, new])
+    translator.translate = AsyncMock(side_effect=["Свежая", "Старая"])
+
+    with patch("bot.scheduler.fetch_all", new=stream([old, new])), \
+         patch("asyncio.sleep", new_callable=AsyncMock):
+        await run_once(db, translator, poster_ru)
+
+    assert [c.kwargs["url"] for c in poster_ru.post.call_args_list] == [new.url, old.url]
+
+@pytest.mark.asyncio
+async def test_carries_unfinished_articles_when_budget_exhausted(monkeypatch):
+    monkeypatch.setattr(scheduler_mod, "_CYCLE_BUDGET", 0.0)
+    db, translator, poster_ru, articles = make_deps()
+
+    with patch("bot.scheduler.fetch_all", new=stream(articles)):
+        await run_once(db, translator, poster_ru)
+
+    translator.translate.assert_not_called()
+    a = articles[0]
+    db.replace_pending.assert_awaited_once_with(
+        [(a.title, a.url, a.source, a.published_at, a.guid, a.description)], None
+    )
+
+@pytest.mark.asyncio
+async def test_pending_articles_are_processed_and_queue_cleared():
+    db, translator, poster_ru, _ = make_deps([])
+    db.pending_articles = AsyncMock(return_value=[("Teszt", "https://hvg.hu/9", "HVG", 5.0, "", "")])
+
+    with patch("bot.scheduler.fetch_all", new=stream([])), \
+         patch("asyncio.sleep", new_callable=AsyncMock):
+        await run_once(db, translator, poster_ru)
+
+    assert poster_ru.post.call_args.kwargs["url"] == "https://hvg.hu/9"
+    db.replace_pending.assert_awaited_once_with([], None)
+
+@pytest.mark.asyncio
+async def test_seen_check_uses_guid():
+    db, translator, poster_ru, _ = make_deps()
+    article = make_article(guid="telex-123")
+
+    with patch("bot.scheduler.fetch_all", new=stream([article])), \
+         patch("asyncio.sleep", new_callable=AsyncMock):
+        await run_once(db, translator, poster_ru)
+
+    db.is_seen.assert_awaited_once_with(article.url, "telex-123", "Telex")
+    assert db.claim.call_args.kwargs["guid"] == "telex-123"
+    assert db.claim.call_args.kwargs["source"] == "Telex"
+
+@pytest.mark.asyncio
+async def test_posts_translated_description_when_enabled(monkeypatch):
+    monkeypatch.setattr(scheduler_mod, "_POST_DESCRIPTION", True)
+    db, translator, poster_ru, _ = make_deps()
+    article = make_article(description="Hosszabb leírás")
+    translator.translate = AsyncMock(side_effect=["Заголовок", "Подробное описание"])
+
+    with patch("bot.scheduler.fetch_all", new=stream([article])), \
+         patch("asyncio.sleep", new_callable=AsyncMock):
+        await run_once(db, translator, poster_ru)
+
+    assert poster_ru.post.call_args.kwargs["summary"] == "Заголовок\n\nПодробное описание"
+
+@pytest.mark.asyncio
+async def test_does_not_post_article_claimed_by_another_worker():
+    db, translator, poster_ru, articles = make_deps()
+    db.claim = AsyncMock(return_value=False)
+
+    with patch("bot.scheduler.fetch_all", new=stream(articles)):
+        await run_once(db, translator, poster_ru)
+
+    poster_ru.post.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_backlog_is_posted_as_digest(monkeypatch):
+    monkeypatch.setattr(scheduler_mod, "_DIGEST_THRESHOLD", 3)
+    monkeypatch.setattr(scheduler_mod, "_POST_DELAY", 0)
+    articles = [make_article(url=f"https://telex.hu/{i}", title=f"Cikk {i}") for i in range(4)]
+    db, translator, poster_ru, _ = make_deps(articles)
+    translator.translate = AsyncMock(side_effect=[
+        "Правительство повысило налоги", "Дождь в Будапеште", "Новый мост через Дунай", "Футбол: победа сборной",
+    ])
+    db.claim = AsyncMock(side_effect=[True, False, True, True])
+    poster_ru.post_digest = AsyncMock(return_value=[1])
+
+    with patch("bot.scheduler.fetch_all", new=stream(articles)):
+        await run_once(db, translator, poster_ru)
+
+    poster_ru.post.assert_not_called()
+    [items] = poster_ru.post_digest.call_args.args
+    assert [links[0][0] for _, links, _ in items] == [
+        "https://telex.hu/0", "https://telex.hu/2", "https://telex.hu/3",
+    ]
+
+@pytest.mark.asyncio
+async def test_digest_batch_reserves_budget_per_message(monkeypatch):
+    monkeypatch.setattr(scheduler_mod, "_DIGEST_THRESHOLD", 5)
+    monkeypatch.setattr(scheduler_mod, "_POST_DELAY", 0)
+    # room to post 3 single messages, but all 12 stories fit in 3 digest messages
+    monkeypatch.setattr(scheduler_mod, "_POST_COST_ESTIMATE", 10.0)
+    monkeypatch.setattr(scheduler_mod, "_CYCLE_BUDGET", 35.0)
+    words = ["налоги", "погода", "футбол", "выборы", "мост", "метро",
+             "инфляция", "забастовка", "пожар", "концерт", "больница", "школа"]
+    articles = [make_article(url=f"https://telex.hu/{i}", title=f"Hír {w}") for i, w in enumerate(words)]
+    db, translator, poster_ru, _ = make_deps(articles)
+    translator.translate = AsyncMock(side_effect=words)
+    poster_ru.post_digest = AsyncMock(return_value=[1, 2, 3])
+
+    with patch("bot.scheduler.fetch_all", new=stream(articles)):
+        await run_once(db, translator, poster_ru)
+
+    [items] = poster_ru.post_digest.call_args.args
+    assert len(items) == 12
+    db.replace_pending.assert_awaited_with([], None)
+
+@pytest.mark.asyncio
+async def test_small_batch_is_posted_one_by_one(monkeypatch):
+    monkeypatch.setattr(scheduler_mod, "_DIGEST_THRESHOLD", 3)
+    monkeypatch.setattr(scheduler_mod, "_POST_DELAY", 0)
+    articles = [make_article(url=f"https://telex.hu/{i}", title=f"Cikk {i}") for i in range(2)]
+    db, translator, poster_ru, _ = make_deps(articles)
+    translator.translate = AsyncMock(side_effect=["Первая новость дня", "Совсем другая тема"])
+    poster_ru.post_digest = AsyncMock()
+
+    with patch("bot.scheduler.fetch_all", new=stream(articles)):
+        await run_once(db, translator, poster_ru)
+
+    assert poster_ru.post.call_count == 2
+    poster_ru.post_digest.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_cycle_outcome_reported_to_health_status(monkeypatch):
+    from bot.health import status
+    monkeypatch.setattr(scheduler_mod, "_POST_DELAY", 0)
+    db, translator, poster_ru, articles = make_deps()
+
+    with patch("bot.scheduler.fetch_all", new=stream(articles)):
+        await run_once(db, translator, poster_ru)
+    assert status.snapshot()["since_last_success"] is not None
+    assert status.stages["fetched"] == 1
+    assert status.stages["to_post"] == 0
+
+    async def broken_fetch():
+        raise OSError("network down")
+        yield
+    succeeded_at = status.last_success_at
+    await run_once(db, translator, poster_ru, fetch=broken_fetch)
+    assert status.last_success_at == succeeded_at
+    assert "network down" in status.last_error
+
+def test_admit_applies_caps_and_age_cutoff(monkeypatch):
+    monkeypatch.setattr(scheduler_mod, "_MAX_ARTICLE_AGE", 1.0)
+    monkeypatch.setattr(scheduler_mod, "_MAX_PER_CYCLE", 3)
+    monkeypatch.setattr(scheduler_mod, "_MAX_PER_SOURCE", 2)
+    monkeypatch.setattr(scheduler_mod, "_MAX_BACKLOG", 1)
+    now = 100_000.0
+    fresh = [
+        make_article(url="https://telex.hu/1", source="Telex", published_at=now - 10),
+        make_article(url="https://telex.hu/2", source="Telex", published_at=now - 20),
+        make_article(url="https://telex.hu/3", source="Telex", published_at=now - 30),
+        make_article(url="https://hvg.hu/1", source="HVG", published_at=now - 40),
+        make_article(url="https://hvg.hu/old", source="HVG", published_at=now - 7200),
+    ]
+    backlog = [make_article(url="https://444.hu/1", source="444", published_at=now - 50)]
+    admitted, deferred, shed = scheduler_mod._admit(fresh, backlog, now)
+    assert [a.url for a in admitted] == ["https://telex.hu/1", "https://telex.hu/2", "https://hvg.hu/1"]
+    # telex.hu/3 is over the source cap, 444.hu/1 over the cycle cap; the backlog keeps the newest
+    assert [a.url for a in deferred] == ["https://telex.hu/3"]
+    assert [a.url for a in shed] == ["https://hvg.hu/old", "https://444.hu/1"]
+
+@pytest.mark.asyncio
+async def test_overflow_spills_to_backlog_and_stale_articles_are_shed(monkeypatch):
+    monkeypatch.setattr(scheduler_mod, "_MAX_PER_CYCLE", 1)
+    monkeypatch.setattr(scheduler_mod, "_MAX_ARTICLE_AGE", 1.0)
+    now = scheduler_mod.time.time()
+    fresh = make_article(url="https://telex.hu/new", title="Friss", published_at=now)
+    spill = make_article(url="https://hvg.hu/next", title="Következő", published_at=now - 60)
+    stale = make_article(url="https://444.hu/old", title="Régi", published_at=now - 7200)
+    db, translator, poster_ru, _ = make_deps()
+
+    with patch("bot.scheduler.fetch_all", new=stream([stale, spill, fresh])), \
+         patch("asyncio.sleep", new_callable=AsyncMock):
+        await run_once(db, translator, poster_ru)
+
+    assert [c.kwargs["url"] for c in poster_ru.post.call_args_list] == [fresh.url]
+    db.replace_backlog.assert_awaited_once_with(
+        [(spill.title, spill.url, spill.source, spill.published_at, spill.guid, spill.description)], None
+    )
+    assert db.mark_seen.call_args.args[0] == stale.url
+    assert translator.translate.await_count == 1
+    assert scheduler_mod.status.stages["shed"] == 1
+    assert scheduler_mod.status.stages["backlog"] == 1
+
+@pytest.mark.asyncio
+async def test_backlog_drains_after_fresh_articles():
+    fresh = make_article(url="https://telex.hu/new", title="Friss hír", published_at=200.0)
+    db, translator, poster_ru, _ = make_deps()
+    db.backlog_articles = AsyncMock(return_value=[("Halasztott", "https://hvg.hu/9", "HVG", 300.0, "", "")])
+    translator.translate = AsyncMock(side_effect=["Свежая новость", "Отложенная статья"])
+
+    with patch("bot.scheduler.fetch_all", new=stream([fresh])), \
+         patch("asyncio.sleep", new_callable=AsyncMock):
+        await run_once(db, translator, poster_ru)
+
+    # the backlog goes after fresh news even when it is newer
+    assert [c.kwargs["url"] for c in poster_ru.post.call_args_list] == [fresh.url, "https://hvg.hu/9"]
+    db.replace_backlog.assert_awaited_once_with([], None)
+
+@pytest.mark.asyncio
+async def test_queues_are_scoped_to_leased_sources():
+    db, translator, poster_ru, articles = make_deps()
+
+    with patch("bot.scheduler.fetch_all", new=stream(articles)), \
+         patch("asyncio.sleep", new_callable=AsyncMock):
+        await run_once(db, translator, poster_ru, sources=lambda: ["Telex"])
+
+    db.pending_articles.assert_awaited_once_with(["Telex"])
+    db.backlog_articles.assert_awaited_once_with(["Telex"])
+    assert db.replace_backlog.call_args.args[1] == ["Telex"]
+    assert db.replace_pending.call_args.args[1] == ["Telex"]
+
+@pytest.mark.asyncio
+async def test_titles_are_translated_concurrently_across_endpoints(monkeypatch):
+    monkeypatch.setattr(scheduler_mod, "_POST_DELAY", 0)
+    titles = ["Adóemelés", "Árvíz", "Választás", "Metró", "Infláció", "Sztrájk"]
+    articles = [make_article(url=f"https://telex.hu/{i}", title=t) for i, t in enumerate(titles)]
+    db, _, poster_ru, _ = make_deps(articles)
+    in_flight, peak, hosts = 0, 0, []
+
+    async def post(url, json, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        hosts.append(url.split("/")[2])
+        response = MagicMock()
+        response.json.return_value = {"response": f"перевод: {json['prompt']}"}
+        return response
+
+    translator = GemmaTranslator(
+        model="m", endpoints=["http://a/api/generate", "http://b/api/generate"], http=MagicMock(),
+        strategy="compact",
+    )
+    translator._client.post = post
+    with patch("bot.scheduler.fetch_all", new=stream(articles)):
+        await run_once(db, translator, poster_ru)
+
+    assert peak == 2
+    assert sorted(hosts) == ["a"] * 3 + ["b"] * 3
+    # results are consumed in order
+    assert [c.kwargs["url"] for c in poster_ru.post.call_args_list] == [a.url for a in articles]
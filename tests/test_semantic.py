@@ -0,0 +1,81 @@
+# tests/test_semantic.py
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import numpy as np
+import pytest
+
+from bot import net
+from bot.semantic import OllamaEmbedder, SemanticDeduper, VectorIndex
+from bot.translator.gemma import EndpointPool
+
+
+def test_index_finds_nearest_title():
+    index = VectorIndex()
+    index.add("налоги", np.array([1.0, 0.0, 0.0]))
+    index.add("погода", np.array([0.0, 1.0, 0.0]))
+    assert index.find_similar(np.array([0.9, 0.1, 0.0]), threshold=0.9) == "налоги"
+    assert index.find_similar(np.array([0.0, 0.0, 1.0]), threshold=0.5) is None
+
+def test_index_batched_search():
+    index = VectorIndex()
+    index.add("a", np.array([1.0, 0.0]))
+    index.add("b", np.array([0.0, 1.0]))
+    best, scores = index.search(np.array([[0.0, 2.0], [3.0, 0.0]]))
+    assert best.tolist() == [1, 0]
+    assert scores == pytest.approx([1.0, 1.0])
+
+def test_index_grows_past_initial_capacity():
+    index = VectorIndex()
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(3000, 8))
+    for i, v in enumerate(vectors):
+        index.add(str(i), v)
+    assert len(index) == 3000
+    assert index.find_similar(vectors[2500], threshold=0.999) == "2500"
+
+def test_index_prune_drops_old_entries():
+    index = VectorIndex(hours=24)
+    index.add("old", np.array([1.0, 0.0]), ts=0.0)
+    index.add("new", np.array([0.0, 1.0]), ts=100 * 3600.0)
+    index.prune(now=101 * 3600.0)
+    assert len(index) == 1
+    assert index.find_similar(np.array([0.0, 1.0]), threshold=0.9) == "new"
+
+def test_index_save_and_load_roundtrip(tmp_path):
+    path = str(tmp_path / "emb.npz")
+    index = VectorIndex()
+    index.add("Венгрия", np.array([0.6, 0.8]))
+    index.save(path)
+    loaded = VectorIndex.load(path)
+    assert len(loaded) == 1
+    assert loaded.find_similar(np.array([0.6, 0.8]), threshold=0.99) == "Венгрия"
+
+def test_index_load_missing_file_is_empty(tmp_path):
+    assert len(VectorIndex.load(str(tmp_path / "missing.npz"))) == 0
+
+@pytest.mark.asyncio
+async def test_deduper_adds_only_accepted_titles(tmp_path):
+    embedder = MagicMock()
+    embedder.embed = AsyncMock(return_value=np.array([1.0, 0.0]))
+    deduper = SemanticDeduper(embedder, path=str(tmp_path / "emb.npz"), threshold=0.9)
+    assert await deduper.find_similar("первый") is None
+    deduper.add("первый")
+    assert await deduper.find_similar("перефразированный") == "первый"
+    deduper.save()
+    assert len(VectorIndex.load(str(tmp_path / "emb.npz"))) == 1
+
+async def test_embedder_fails_over_to_another_endpoint():
+    hosts = []
+
+    def handler(request):
+        hosts.append(request.url.host)
+        if request.url.host == "a":
+            raise httpx.ConnectError("refused")
+        return httpx.Response(200, json={"embedding": [0.6, 0.8]})
+
+    pool = EndpointPool(["http://a/api/generate", "http://b/api/generate"])
+    embedder = OllamaEmbedder(pool=pool, http=net.Http(transport=httpx.MockTransport(handler)))
+    assert (await embedder.embed("Венгрия")).tolist() == pytest.approx([0.6, 0.8])
+    assert hosts == ["a", "b"]
+    assert pool.stats()["http://a/api/generate"]["circuit"] == "open"
@@ -0,0 +1,46 @@
+# tests/test_simulation.py
+import asyncio
+import time
+
+import bot.scheduler as scheduler_mod
+from benchmarks.bench_simulation import Scenario, VirtualLoop, format_report, simulate
+
+
+def test_virtual_loop_skips_idle_time():
+    async def nap():
+        await asyncio.sleep(3600)
+        return asyncio.get_running_loop().time()
+
+    start = time.perf_counter()
+    with asyncio.Runner(loop_factory=VirtualLoop) as runner:
+        assert runner.run(nap()) == 3600
+    assert time.perf_counter() - start < 1
+
+
+def _without_host(report: dict) -> dict:
+    return {k: v for k, v in report.items() if k != "host"}
+
+
+def test_simulation_is_deterministic():
+    scenario = Scenario(hours=1, bursts=[(60.0, 150)], flood_probability=0.2, seed=7)
+    first = simulate(scenario)
+    assert _without_host(simulate(scenario)) == _without_host(first)
+    assert first["resources"]["telegram_429s"] > 0
+    assert "time to post" in format_report(first)
+
+
+def test_burst_drains_through_the_backlog(monkeypatch):
+    monkeypatch.setattr(scheduler_mod, "_MAX_PER_CYCLE", 20)
+    monkeypatch.setattr(scheduler_mod, "_POST_DELAY", 3.0)
+    report = simulate(Scenario(hours=2, rate_per_hour=0, bursts=[(60.0, 100)], sources=2))
+
+    articles = report["articles"]
+    assert articles["arrived"] == articles["posted"] == 100
+    assert report["articles"]["totals"]["deferred"] == 80
+    # APScheduler ran the interval job on the virtual clock: one cycle per 5 minutes
+    assert report["resources"]["cycles"] == 24
+    peak = max(waiting for _, waiting, _ in report["backlog"])
+    assert 0 < peak <= 100
+    assert report["backlog"][-1][1] == 0
+    # five cycles of 20; the last of the burst is posted about 20 minutes after it arrived
+    assert 15 < report["time_to_post_minutes"]["max"] < 30
@@ -33,3 +33,12 @@ def test_trim_uses_space_even_if_early():
     assert result.endswith("…")
     # Result should not cut mid-char in the filler (just verifying it doesn't crash)
     assert result  # non-empty
+
+def test_description_appended_below_title():
+    assert summarize("Заголовок", "Описание.") == "Заголовок\n\nОписание."
+
+def test_description_trimmed_within_limit():
+    result = summarize("Заголовок", " ".join(["слово"] * 200))
+    assert len(result) <= 500
+    assert result.startswith("Заголовок\n\n")
+    assert result.endswith("…")
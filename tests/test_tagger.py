@@ -3,7 +3,7 @@ from unittest.mock import AsyncMock
 
 import pytest
 
-from bot.tagger import CATEGORIES, get_tags
+from bot.tagger import CATEGORIES, KEYWORDS, Tagger, classify_keywords, get_tags, get_tags_batch
 
 
 def test_categories_is_nonempty_frozenset():
@@ -53,3 +53,48 @@ async def test_returns_empty_when_no_valid_tags():
     mock_translator.generate = AsyncMock(return_value="nonsense garbage invalid")
     tags = await get_tags("Заголовок", mock_translator)
     assert tags == []
+
+def test_keyword_map_covers_only_known_categories():
+    assert set(KEYWORDS) <= CATEGORIES
+
+def test_keyword_classifier_confident_on_topical_match():
+    tags, confident = classify_keywords("Венгрия повысила налоги на доходы")
+    assert tags == ["#экономика", "#венгрия"]
+    assert confident
+
+def test_keyword_classifier_unsure_with_only_place_tag():
+    tags, confident = classify_keywords("Погода в Будапеште на выходные")
+    assert tags == ["#будапешт"]
+    assert not confident
+
+@pytest.mark.asyncio
+async def test_get_tags_batch_parses_numbered_lines():
+    mock_translator = AsyncMock()
+    mock_translator.generate = AsyncMock(return_value="1: спорт\n2. культура nonsense")
+    tags = await get_tags_batch(["Заголовок 1", "Заголовок 2"], mock_translator)
+    assert tags == [["#спорт"], ["#культура"]]
+
+@pytest.mark.asyncio
+async def test_tagger_skips_llm_when_keywords_confident():
+    mock_translator = AsyncMock()
+    tagger = Tagger(mock_translator)
+    tags = await tagger.tag_many(["Суд приговорил бывшего министра"])
+    assert tags == [["#право", "#правительство"]]
+    mock_translator.generate.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_tagger_batches_unsure_titles_into_one_call_and_caches():
+    mock_translator = AsyncMock()
+    mock_translator.generate = AsyncMock(return_value="1: общество\n2: культура")
+    tagger = Tagger(mock_translator)
+    titles = ["Погода в Будапеште на выходные", "Новый сезон в опере"]
+    assert await tagger.tag_many(titles) == [["#общество"], ["#культура"]]
+    assert await tagger.tag_many(["погода в Будапеште на выходные!"]) == [["#общество"]]
+    mock_translator.generate.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_tagger_falls_back_to_keywords_on_llm_error():
+    mock_translator = AsyncMock()
+    mock_translator.generate = AsyncMock(side_effect=Exception("timeout"))
+    tagger = Tagger(mock_translator)
+    assert await tagger.tag_many(["Погода в Будапеште на выходные"]) == [["#будапешт"]]